@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+🔢 Exact token amount parsing, scaling and formatting
+======================================================
+
+Replaces ``int(result, 16) / 10**decimals`` float division throughout the
+scripts. Raw amounts stay Python ints (exact for all of uint256), single
+values convert to ``Decimal``, and large result sets go through
+``AmountArray``: every amount is split once into a whole part and a
+fractional part, both of which fit in int64 for any token with up to 18
+decimals, so scaling, comparison and formatting of hundreds of thousands of
+rows run as NumPy array operations without losing a single wei.
+
+Allowances at or above 2**255 are treated as unlimited. That covers
+MAX_UINT256 approvals and tokens that decrement an "infinite" allowance on
+every ``transferFrom`` (USDC does).
+
+NumPy is optional; without it ``AmountArray`` falls back to plain lists with
+the same results.
+
+Requirements:
+    pip install numpy   # optional, vectorized AmountArray
+"""
+
+from decimal import Context, Decimal
+from typing import Any, Iterable, List, Optional, Sequence
+
+from evm import optional_numpy
+
+MAX_UINT256 = 2**256 - 1
+# Anything this large was approved as "unlimited" and at most partly spent
+UNLIMITED_THRESHOLD = 2**255
+
+# 78 digits hold any uint256, plus headroom for the scale
+_DECIMAL_CONTEXT = Context(prec=100)
+# Largest whole part that still fits in an int64 column
+_INT64_MAX = 2**63 - 1
+
+
+def parse_quantity(value: Any) -> Optional[int]:
+    """🔢 Hex quantity / eth_call word → int (None for missing or empty results)"""
+    if value is None or isinstance(value, Exception):
+        return None
+    if isinstance(value, int):
+        return value
+    if value in ("0x", ""):
+        return None
+    return int(value, 16)
+
+
+def parse_quantities(values: Iterable[Any]) -> List[Optional[int]]:
+    """🔢 Bulk ``parse_quantity``"""
+    return [parse_quantity(value) for value in values]
+
+
+def is_unlimited(raw: Optional[int]) -> bool:
+    """♾️ True for MAX_UINT256-style approvals"""
+    return raw is not None and raw >= UNLIMITED_THRESHOLD
+
+
+def to_decimal(raw: Optional[int], decimals: int) -> Optional[Decimal]:
+    """🎯 Exact display-unit value of a raw base-unit amount"""
+    if raw is None:
+        return None
+    # Exact division keeps the shortest exponent: 3 WMATIC, not 3.000000000000000000
+    return _DECIMAL_CONTEXT.divide(Decimal(raw), Decimal(10 ** decimals))
+
+
+def format_units(raw: Optional[int], decimals: int, places: int = 6) -> Optional[str]:
+    """🖨️ Raw amount → fixed-point string, truncated (never rounded up) to ``places``"""
+    if raw is None:
+        return None
+    sign = "-" if raw < 0 else ""
+    whole, frac = divmod(abs(raw), 10 ** decimals)
+    if places <= 0 or decimals == 0:
+        return f"{sign}{whole}"
+    digits = str(frac).zfill(decimals)[:places].ljust(places, "0")
+    return f"{sign}{whole}.{digits}"
+
+
+class AmountArray:
+    """📊 Exact fixed-point column of raw amounts sharing one ``decimals``
+
+    ``whole``/``frac`` hold ``raw // 10**decimals`` and ``raw % 10**decimals``
+    as int64 arrays (lists without NumPy). Rows that are missing, unlimited
+    or too large for int64 are masked out of the arrays and handled exactly
+    from ``raw``.
+    """
+
+    def __init__(self, raw: Sequence[Optional[int]], decimals: int):
+        if decimals > 18:
+            raise ValueError("AmountArray supports at most 18 decimals (int64 fractional part)")
+        self.raw = list(raw)
+        self.decimals = decimals
+        self.scale = 10 ** decimals
+        self.missing = [value is None for value in self.raw]
+        self.unlimited = [is_unlimited(value) for value in self.raw]
+
+        whole: List[int] = []
+        frac: List[int] = []
+        self.exact_only: List[bool] = []
+        for value in self.raw:
+            if value is None or value < 0 or value // self.scale > _INT64_MAX:
+                whole.append(0)
+                frac.append(0)
+                self.exact_only.append(value is not None)
+            else:
+                w, f = divmod(value, self.scale)
+                whole.append(w)
+                frac.append(f)
+                self.exact_only.append(False)
+
+        np = optional_numpy()
+        if np is not None:
+            self.whole = np.array(whole, dtype=np.int64)
+            self.frac = np.array(frac, dtype=np.int64)
+        else:
+            self.whole, self.frac = whole, frac
+
+    @classmethod
+    def from_hex(cls, values: Iterable[Any], decimals: int) -> "AmountArray":
+        """🔢 Build from raw JSON-RPC hex results"""
+        return cls(parse_quantities(values), decimals)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def total(self) -> int:
+        """➕ Exact sum of every present, limited amount in base units"""
+        np = optional_numpy()
+        if np is not None and not any(self.exact_only) and len(self.raw) > 0:
+            # Sum whole and fractional parts separately, then recombine as Python ints
+            limited = ~np.array(self.unlimited, dtype=bool)
+            whole = int(self.whole[limited].astype(object).sum())
+            frac = int(self.frac[limited].astype(object).sum())
+            return whole * self.scale + frac
+        return sum(value for value, unlimited in zip(self.raw, self.unlimited)
+                   if value is not None and not unlimited)
+
+    def to_float(self):
+        """📉 Approximate float64 values (NaN for missing) for plotting and stats"""
+        np = optional_numpy()
+        if np is None:
+            return [float("nan") if value is None else value / self.scale for value in self.raw]
+        values = self.whole.astype(np.float64) + self.frac.astype(np.float64) / self.scale
+        for i, (value, exact_only) in enumerate(zip(self.raw, self.exact_only)):
+            if value is None:
+                values[i] = np.nan
+            elif exact_only:
+                values[i] = float(to_decimal(value, self.decimals))
+        return values
+
+    def at_least(self, other: "AmountArray") -> List[Optional[bool]]:
+        """⚖️ Row-wise ``self >= other`` on exact amounts (None where either is missing)"""
+        if other.decimals != self.decimals or len(other) != len(self):
+            raise ValueError("AmountArray comparison needs equal length and decimals")
+        np = optional_numpy()
+        if np is not None and not any(self.exact_only) and not any(other.exact_only):
+            result = (self.whole > other.whole) | ((self.whole == other.whole) & (self.frac >= other.frac))
+            return [None if a or b else bool(r)
+                    for r, a, b in zip(result.tolist(), self.missing, other.missing)]
+        return [None if a is None or b is None else a >= b for a, b in zip(self.raw, other.raw)]
+
+    def format(self, places: int = 6, unlimited: Optional[str] = "unlimited",
+               missing: Optional[str] = None) -> List[Optional[str]]:
+        """🖨️ Fixed-point strings truncated to ``places`` decimals"""
+        places = min(places, self.decimals)
+        np = optional_numpy()
+        if np is not None and places > 0:
+            whole = self.whole.astype(str)
+            # Zero-pad the fractional part to full width, then keep the first ``places`` digits
+            frac = np.char.zfill(self.frac.astype(str), self.decimals).astype(f"U{places}")
+            text = np.char.add(np.char.add(whole, "."), frac).tolist()
+        else:
+            text = [format_units(value, self.decimals, places) if value is not None and value >= 0 else None
+                    for value in self.raw]
+
+        out: List[Optional[str]] = []
+        for i, value in enumerate(self.raw):
+            if value is None:
+                out.append(missing)
+            elif unlimited is not None and self.unlimited[i]:
+                out.append(unlimited)
+            elif self.exact_only[i]:
+                out.append(format_units(value, self.decimals, places))
+            else:
+                out.append(text[i])
+        return out
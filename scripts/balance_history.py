@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+📈 Historical balance/allowance time series with change-point bisection
+========================================================================
+
+Answers "when did the allowance drop?" without a manual run per block.
+One Multicall3 ``aggregate3`` (encoded once, replayed at any block through
+archive ``eth_call``) reads the wallet's MATIC balance plus every token's
+balance and Router V6 allowance. The range is sampled at a fixed stride,
+many blocks per batched JSON-RPC request; every stride interval whose
+endpoints differ is then bisected, all open intervals at once, until each
+change is pinned to the exact block. A change costs O(log stride) samples
+instead of one per block.
+
+A value that changes and changes back within one stride is invisible to
+the sampler - lower the stride (or use balance_ledger.py) when that
+matters. Multicall3 exists on Polygon from block 25,770,160; earlier blocks
+cannot be sampled.
+
+Results are written to a compact columnar directory (block, field, ok,
+value columns plus ``series.json``), using the same fixed-width store as
+the wallet index. Every sample goes through the on-disk RPC cache, so
+re-running or widening a range only pays for new blocks.
+
+Usage:
+    python3 scripts/balance_history.py 0xWALLET --from-block 60000000 --to-block 60500000
+    python3 scripts/balance_history.py 0xWALLET --from-block 60000000 --stride 5000 --token 0xTOKEN
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from amounts import format_units, is_unlimited
+from evm import ROUTER_V6
+from multicall import (MULTICALL3_ADDRESS, decode_aggregate3, decode_uint, encode_aggregate3,
+                       encode_allowance, encode_balance_of, encode_get_eth_balance)
+from rpc_cache import BlockPinnedCache
+from rpc_client import RpcClient, RpcError, make_client
+from token_registry import KNOWN_TOKENS, TokenInfo, TokenRegistry
+from transport import TransportError
+from wallet_indexer import ColumnarStore
+
+DEFAULT_HISTORY_DIR = os.environ.get(
+    "ONELIMIT_HISTORY_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "1limit", "history"),
+)
+
+DEFAULT_STRIDE = 10_000
+# Archive eth_calls per JSON-RPC batch
+SAMPLES_PER_BATCH = 50
+
+HISTORY_COLUMNS = [
+    ("block", "Q"),
+    ("field", "B"),
+    ("ok", "B"),       # 0 = the sub-call failed at this block
+    ("value", 32),
+]
+
+# Everything write_history puts in a history directory (column files, checkpoint, metadata)
+HISTORY_FILES = {"block.u64", "field.u8", "ok.u8", "value.b32", "checkpoint.json", "checkpoint.json.tmp",
+                 "series.json"}
+
+Sample = Tuple[Optional[int], ...]
+
+
+class Change(NamedTuple):
+    """🔀 One field changing value at ``block`` (``old`` is the value at block - 1)"""
+    block: int
+    field: str
+    old: Optional[int]
+    new: Optional[int]
+
+
+class BalanceHistory:
+    """📈 Sample one wallet's balances/allowances across blocks and bisect every change"""
+
+    def __init__(self, rpc: RpcClient, wallet: str, tokens: Iterable[TokenInfo], spender: str = ROUTER_V6):
+        self.rpc = rpc
+        self.wallet = wallet
+        self.tokens = list(tokens)
+        self.fields: List[str] = ["MATIC"]
+        self.decimals: List[int] = [18]
+        calls = [(MULTICALL3_ADDRESS, encode_get_eth_balance(wallet))]
+        for token in self.tokens:
+            self.fields += [f"{token.symbol}:balance", f"{token.symbol}:allowance"]
+            self.decimals += [token.decimals, token.decimals]
+            calls.append((token.address, encode_balance_of(wallet)))
+            calls.append((token.address, encode_allowance(wallet, spender)))
+        # The calldata does not depend on the block, so it is encoded once
+        self.calldata = "0x" + encode_aggregate3(calls).hex()
+        self.call_count = len(calls)
+        self.samples: Dict[int, Sample] = {}
+
+    def sample_many(self, blocks: Iterable[int]) -> None:
+        """📦 Read every field at each block not sampled yet, many blocks per batch"""
+        todo = sorted(set(block for block in blocks if block not in self.samples))
+        for start in range(0, len(todo), SAMPLES_PER_BATCH):
+            chunk = todo[start:start + SAMPLES_PER_BATCH]
+            results = self.rpc.batch([
+                ("eth_call", [{"to": MULTICALL3_ADDRESS, "data": self.calldata}, hex(block)])
+                for block in chunk
+            ])
+            for block, result in zip(chunk, results):
+                if isinstance(result, RpcError):
+                    raise ValueError(f"Sampling block {block:,} failed: {result.message}")
+                decoded = decode_aggregate3(bytes.fromhex(result[2:]))
+                if len(decoded) != self.call_count:
+                    # "0x" comes back when Multicall3 has no code at this block yet
+                    raise ValueError(f"Sampling block {block:,} failed: {len(decoded)} results "
+                                     f"for {self.call_count} calls")
+                self.samples[block] = tuple(decode_uint(data) if ok else None for ok, data in decoded)
+
+    def changes(self, start: int, end: int, stride: int = DEFAULT_STRIDE) -> List[Change]:
+        """🔍 Every change in ``start..end``, each pinned to its exact block"""
+        grid = list(range(start, end, stride)) + [end]
+        self.sample_many(grid)
+
+        intervals = [(a, b) for a, b in zip(grid, grid[1:]) if self.samples[a] != self.samples[b]]
+        change_blocks = []
+        while intervals:
+            # Bisect every open interval in the same round so midpoints share batches
+            self.sample_many((a + b) // 2 for a, b in intervals if b - a > 1)
+            narrowed = []
+            for a, b in intervals:
+                if b - a == 1:
+                    change_blocks.append(b)
+                    continue
+                middle = (a + b) // 2
+                if self.samples[a] != self.samples[middle]:
+                    narrowed.append((a, middle))
+                if self.samples[middle] != self.samples[b]:
+                    narrowed.append((middle, b))
+            intervals = narrowed
+
+        changes = []
+        for block in sorted(change_blocks):
+            before, after = self.samples[block - 1], self.samples[block]
+            for field, old, new in zip(self.fields, before, after):
+                if old != new:
+                    changes.append(Change(block, field, old, new))
+        return changes
+
+    def format_value(self, field: str, value: Optional[int]) -> str:
+        if value is None:
+            return "call failed"
+        if field.endswith(":allowance") and is_unlimited(value):
+            return "unlimited"
+        return format_units(value, self.decimals[self.fields.index(field)])
+
+
+def write_history(directory: str, history: BalanceHistory, start: int, end: int, stride: int,
+                  changes: List[Change]) -> None:
+    """🧊 Initial values at ``start`` plus every change, as fixed-width columns
+
+    The store is built in a fresh sibling directory and renamed into place.
+    An existing ``directory`` is replaced only when it is empty or holds a
+    previous history store. Anything else raises ValueError.
+    """
+    if os.path.exists(directory):
+        existing = set(os.listdir(directory)) if os.path.isdir(directory) else None
+        if existing is None or (existing and ("series.json" not in existing or not existing <= HISTORY_FILES)):
+            raise ValueError(f"{directory} exists and is not a balance history store - refusing to overwrite it")
+
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".history-", dir=parent)
+    try:
+        store = ColumnarStore(staging, HISTORY_COLUMNS)
+
+        def row(block: int, field: str, value: Optional[int]) -> Dict[str, Any]:
+            return {"block": block, "field": history.fields.index(field), "ok": int(value is not None),
+                    "value": (value or 0).to_bytes(32, "big")}
+
+        rows = [row(start, field, value) for field, value in zip(history.fields, history.samples[start])]
+        rows += [row(change.block, change.field, change.new) for change in changes]
+        store.append(rows)
+        store.save_checkpoint(end)
+        with open(os.path.join(staging, "series.json"), "w") as f:
+            json.dump({
+                "wallet": history.wallet, "from_block": start, "to_block": end, "stride": stride,
+                "fields": history.fields, "decimals": history.decimals,
+                "samples": len(history.samples),
+            }, f, indent=1)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if os.path.exists(directory):
+        # Only our own store files (checked above) are ever deleted
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+    os.rename(staging, directory)
+
+
+def read_history(directory: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """📖 ``(series metadata, rows oldest first)`` from a history directory"""
+    with open(os.path.join(directory, "series.json"), "r") as f:
+        meta = json.load(f)
+    store = ColumnarStore(directory, HISTORY_COLUMNS)
+    rows = store.tail(store.row_count())
+    rows.reverse()
+    for row in rows:
+        row["field"] = meta["fields"][row["field"]]
+        row["value"] = int.from_bytes(row["value"], "big") if row["ok"] else None
+    return meta, rows
+
+
+def main():
+    """🚀 Main execution function"""
+    parser = argparse.ArgumentParser(description="📈 1Limit historical balance/allowance time series")
+    parser.add_argument("wallet", help="👛 Wallet address")
+    parser.add_argument("--from-block", type=int, required=True, help="🧱 First block of the range")
+    parser.add_argument("--to-block", type=int, help="🧱 Last block of the range (default: latest)")
+    parser.add_argument("--stride", type=int, default=DEFAULT_STRIDE, help="📏 Blocks between samples")
+    parser.add_argument("--token", action="append", default=[], dest="extra_tokens",
+                        help="🪙 Extra ERC-20 address to track, repeatable")
+    parser.add_argument("--output", help="📁 Output directory (default: under ~/.cache/1limit/history)")
+    parser.add_argument("--rpc-url", action="append", dest="rpc_urls",
+                        help="🌐 Archive RPC endpoint, repeatable (default: routed endpoint pool)")
+    args = parser.parse_args()
+    if args.stride < 1:
+        parser.error("--stride must be at least 1")
+
+    rpc = make_client(args.rpc_urls, cache=BlockPinnedCache())
+    registry = TokenRegistry(rpc)
+    try:
+        tokens = list(KNOWN_TOKENS) + [token for token in registry.resolve(args.extra_tokens).values()
+                                       if token.address.lower() not in {t.address.lower() for t in KNOWN_TOKENS}]
+        end = args.to_block if args.to_block is not None else int(rpc.call("eth_blockNumber", []), 16)
+    except (TransportError, RpcError, ValueError) as e:
+        print(f"❌ RPC request failed: {e}")
+        sys.exit(1)
+    if end <= args.from_block:
+        parser.error("--to-block must be after --from-block")
+
+    print("📈 1Limit Balance History")
+    print("=========================")
+    print(f"👛 Wallet: {args.wallet}")
+    print(f"🧱 Blocks {args.from_block:,} → {end:,} (stride {args.stride:,})")
+    print()
+
+    history = BalanceHistory(rpc, args.wallet, tokens)
+    try:
+        changes = history.changes(args.from_block, end, args.stride)
+    except ValueError as e:
+        print(f"❌ {e}")
+        print("💡 The endpoint must serve archive state, and Multicall3 must exist at the first block")
+        sys.exit(1)
+    except (TransportError, RpcError) as e:
+        print(f"❌ RPC request failed: {e}")
+        sys.exit(1)
+
+    print("📋 Starting values:")
+    for field, value in zip(history.fields, history.samples[args.from_block]):
+        print(f"   {field}: {history.format_value(field, value)}")
+    print()
+    print(f"🔀 {len(changes)} change(s):")
+    for change in changes:
+        print(f"   🧱 {change.block:,}  {change.field}: "
+              f"{history.format_value(change.field, change.old)} → {history.format_value(change.field, change.new)}")
+    print()
+
+    directory = args.output or os.path.join(
+        DEFAULT_HISTORY_DIR, f"{args.wallet.lower()}_{args.from_block}_{end}")
+    try:
+        write_history(directory, history, args.from_block, end, args.stride, changes)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    span = end - args.from_block + 1
+    print(f"📊 {len(history.samples):,} blocks sampled out of {span:,}")
+    print(f"💾 Saved to {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+📒 Event-log balance and allowance ledger for a tracked wallet
+===============================================================
+
+Rebuilds the full token history of a wallet from logs instead of sampling
+``balanceOf`` block by block. ERC-20 ``Transfer`` logs in and out of the
+wallet and ``Approval`` logs for Router V6 are pulled with chunked
+``eth_getLogs`` for every tracked token at once. The range is split
+adaptively when the node answers "too many results". The logs are then
+folded into an exact running balance and allowance per token.
+
+The ledger is anchored with the same Multicall3 ``TokenSweep`` that
+check_wallet_balances.py uses: balances and allowances are read at the
+block before the range (the opening entry) and at the last block (the
+check). A token whose folded balance does not land exactly on the swept
+one is flagged. That happens with rebasing tokens, or when a node dropped
+logs. Allowances are verified the same way. Tokens that lower an allowance
+in ``transferFrom`` without emitting ``Approval`` (USDC does this) show up
+as "spent without Approval" rather than as a mismatch.
+
+Native MATIC moves emit no logs and are not covered; see
+balance_history.py for sampled MATIC balances.
+
+Usage:
+    python3 scripts/balance_ledger.py 0xWALLET --from-block 60000000
+    python3 scripts/balance_ledger.py 0xWALLET --from-block 60000000 --ndjson ledger.ndjson
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from amounts import format_units, is_unlimited
+from evm import ROUTER_V6, address_topic, topic_address
+from multicall import Multicall3, TokenSweep
+from rpc_cache import BlockPinnedCache
+from rpc_client import RpcClient, make_client
+from rpc_types import Log
+from token_registry import KNOWN_TOKENS, TokenInfo, TokenRegistry
+from wallet_indexer import DEFAULT_LOOKBACK_BLOCKS, LOGS_CHUNK_SIZE, REORG_SAFETY_BLOCKS, TRANSFER_TOPIC
+
+APPROVAL_TOPIC = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"  # Approval(address,address,uint256)
+
+
+class LedgerEntry(NamedTuple):
+    """📝 One log folded into the ledger, with the running totals after it"""
+    block: int
+    log_index: int
+    tx_hash: str
+    token: str          # symbol
+    kind: str           # "in", "out", "self" or "approval"
+    counterparty: str
+    amount: int
+    balance: int
+    allowance: Optional[int]
+
+
+class TokenLedger:
+    """📒 Running balance/allowance of one token, anchored at both ends of the range"""
+
+    def __init__(self, token: TokenInfo, opening_balance: Optional[int], opening_allowance: Optional[int]):
+        self.token = token
+        self.opening_balance = opening_balance
+        self.opening_allowance = opening_allowance
+        self.balance = opening_balance or 0
+        self.allowance = opening_allowance
+        self.entries: List[LedgerEntry] = []
+        self.closing_balance: Optional[int] = None
+        self.closing_allowance: Optional[int] = None
+
+    def apply(self, log: Log, wallet: str) -> None:
+        block, log_index = int(log.block_number), int(log.log_index)
+        amount = int(log.data, 16) if log.data not in ("0x", "") else 0
+        topic0 = log.topics[0].lower()
+        if topic0 == APPROVAL_TOPIC:
+            kind, counterparty = "approval", topic_address(log.topics[2])
+            self.allowance = amount
+        else:
+            sender, recipient = topic_address(log.topics[1]), topic_address(log.topics[2])
+            if sender == wallet and recipient == wallet:
+                kind, counterparty = "self", wallet
+            elif sender == wallet:
+                kind, counterparty = "out", recipient
+                self.balance -= amount
+            else:
+                kind, counterparty = "in", sender
+                self.balance += amount
+        self.entries.append(LedgerEntry(block, log_index, log.transaction_hash, self.token.symbol,
+                                        kind, counterparty, amount, self.balance, self.allowance))
+
+    @property
+    def balance_verified(self) -> Optional[bool]:
+        if self.opening_balance is None or self.closing_balance is None:
+            return None
+        return self.balance == self.closing_balance
+
+    @property
+    def allowance_status(self) -> str:
+        if self.allowance is None or self.closing_allowance is None:
+            return "unknown"
+        if self.allowance == self.closing_allowance:
+            return "verified"
+        if self.closing_allowance < self.allowance:
+            return "spent without Approval"
+        return "mismatch"
+
+
+class BalanceLedger:
+    """📒 Fold Transfer/Approval logs of many tokens into anchored per-token ledgers"""
+
+    def __init__(self, rpc: RpcClient, wallet: str, tokens: Iterable[TokenInfo], spender: str = ROUTER_V6,
+                 chunk_size: int = LOGS_CHUNK_SIZE):
+        self.rpc = rpc
+        self.wallet = wallet.lower()
+        self.tokens = {token.address.lower(): token for token in tokens}
+        self.spender = spender
+        self.chunk_size = chunk_size
+
+    def fetch_logs(self, from_block: int, to_block: int) -> List[Log]:
+        """📜 Every Transfer in/out and Router V6 Approval for the tracked tokens, in chain order"""
+        addresses = [token.address for token in self.tokens.values()]
+        wallet_topic = address_topic(self.wallet)
+        filters = [
+            {"address": addresses, "topics": [TRANSFER_TOPIC, wallet_topic]},
+            {"address": addresses, "topics": [TRANSFER_TOPIC, None, wallet_topic]},
+            {"address": addresses, "topics": [APPROVAL_TOPIC, wallet_topic, address_topic(self.spender)]},
+        ]
+        logs: Dict[tuple, Log] = {}
+        for log_filter in filters:
+            for log in self.rpc.get_logs(log_filter, from_block, to_block, self.chunk_size):
+                if len(log.topics) != 3 or log.removed:
+                    continue  # ERC-721 Transfer/Approval, or a log from a reorged block
+                # Self-transfers match both Transfer filters - keep one copy
+                logs[(log.block_number, log.log_index)] = log
+        return [logs[key] for key in sorted(logs)]
+
+    def _sweep(self, block: int) -> TokenSweep:
+        sweep = TokenSweep(Multicall3(self.rpc),
+                           {token.address.lower(): token._asdict() for token in self.tokens.values()},
+                           self.spender)
+        sweep.sweep([self.wallet], block)
+        return sweep
+
+    def build(self, from_block: int, to_block: int) -> Dict[str, TokenLedger]:
+        """🧮 Ledgers keyed by token symbol, anchored at ``from_block - 1`` and checked at ``to_block``"""
+        opening = self._sweep(from_block - 1)
+        ledgers: Dict[str, TokenLedger] = {}
+        for key, token in self.tokens.items():
+            ledgers[key] = TokenLedger(token, opening.balance(self.wallet, key),
+                                       opening.allowance(self.wallet, key))
+
+        for log in self.fetch_logs(from_block, to_block):
+            ledger = ledgers.get(log.address.lower())
+            if ledger is not None:
+                ledger.apply(log, self.wallet)
+
+        closing = self._sweep(to_block)
+        for key, ledger in ledgers.items():
+            ledger.closing_balance = closing.balance(self.wallet, key)
+            ledger.closing_allowance = closing.allowance(self.wallet, key)
+        return {ledger.token.symbol: ledger for ledger in ledgers.values()}
+
+
+def _amount(value: Optional[int], decimals: int) -> str:
+    if value is None:
+        return "unknown"
+    if is_unlimited(value):
+        return "unlimited"
+    return format_units(value, decimals)
+
+
+def main():
+    """🚀 Main execution function"""
+    parser = argparse.ArgumentParser(description="📒 1Limit event-log balance and allowance ledger")
+    parser.add_argument("wallet", help="👛 Wallet address")
+    parser.add_argument("--from-block", type=int, help="🧱 First block (default: 50,000 blocks back)")
+    parser.add_argument("--to-block", type=int, help="🧱 Last block (default: safe head)")
+    parser.add_argument("--token", action="append", default=[], dest="extra_tokens",
+                        help="🪙 Extra ERC-20 address to track, repeatable")
+    parser.add_argument("--chunk-size", type=int, default=LOGS_CHUNK_SIZE, help="📏 Blocks per eth_getLogs request")
+    parser.add_argument("--ndjson", help="💾 Write every ledger entry to this NDJSON file")
+    parser.add_argument("--rpc-url", action="append", dest="rpc_urls",
+                        help="🌐 Archive RPC endpoint, repeatable (default: routed endpoint pool)")
+    args = parser.parse_args()
+
+    rpc = make_client(args.rpc_urls, cache=BlockPinnedCache())
+    tokens = {token.address.lower(): token for token in KNOWN_TOKENS}
+    for token in TokenRegistry(rpc).resolve(args.extra_tokens).values():
+        tokens.setdefault(token.address.lower(), token)
+
+    to_block = args.to_block
+    if to_block is None:
+        to_block = int(rpc.call("eth_blockNumber", []), 16) - REORG_SAFETY_BLOCKS
+    from_block = args.from_block if args.from_block is not None else max(1, to_block - DEFAULT_LOOKBACK_BLOCKS)
+
+    print("📒 1Limit Balance Ledger")
+    print("========================")
+    print(f"👛 Wallet: {args.wallet}")
+    print(f"🧱 Blocks {from_block:,} → {to_block:,}")
+    print()
+
+    ledgers = BalanceLedger(rpc, args.wallet, tokens.values(), chunk_size=args.chunk_size).build(from_block, to_block)
+
+    mismatches = 0
+    for symbol, ledger in ledgers.items():
+        decimals = ledger.token.decimals
+        transfers = sum(1 for entry in ledger.entries if entry.kind != "approval")
+        approvals = len(ledger.entries) - transfers
+        verified = ledger.balance_verified
+        mismatches += verified is False
+        mark = {True: "✅", False: "❌", None: "❓"}[verified]
+        print(f"🪙 {symbol}: {transfers} transfer(s), {approvals} approval(s)")
+        print(f"   Balance: {_amount(ledger.opening_balance, decimals)} → {_amount(ledger.balance, decimals)} "
+              f"{mark} (swept {_amount(ledger.closing_balance, decimals)})")
+        print(f"   Router V6 allowance: {_amount(ledger.opening_allowance, decimals)} → "
+              f"{_amount(ledger.allowance, decimals)} ({ledger.allowance_status}, "
+              f"swept {_amount(ledger.closing_allowance, decimals)})")
+        print()
+
+    if args.ndjson:
+        with open(args.ndjson, "w") as out:
+            for ledger in ledgers.values():
+                for entry in ledger.entries:
+                    record = entry._asdict()
+                    for field in ("amount", "balance", "allowance"):
+                        record[field] = None if record[field] is None else str(record[field])
+                    out.write(json.dumps(record) + "\n")
+        print(f"💾 Ledger entries written to {args.ndjson}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
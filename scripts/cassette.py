@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+📼 Record/replay JSON-RPC cassettes for offline runs and benchmarks
+====================================================================
+
+``RecordingTransport`` wraps the real pooled transport and writes every
+JSON-RPC request/response pair to a cassette file, one line per call.
+``ReplayTransport`` serves a cassette back without touching the network,
+optionally sleeping the recorded latency. Both have the same
+``post(url, payload)`` shape as ``HttpTransport``, so the rate limiter,
+the endpoint router, the RPC cache and every script above them run exactly
+as they do live.
+
+Calls are keyed by method plus canonical params, never by endpoint URL or
+request id. A cassette recorded through the endpoint pool replays under
+any endpoint configuration and any batch grouping. When the same call was
+answered several times (``eth_blockNumber`` during a monitor run), the
+answers are replayed in recorded order and the last one repeats.
+HTTP-level failures (429, 5xx) are recorded as well, so throttling and
+failover paths replay deterministically.
+
+Any script runs against a cassette through the environment, because the
+process-wide transport (``transport.get_transport``) is swapped for it:
+
+    ONELIMIT_CASSETTE=wallet.ndjson.gz ONELIMIT_CASSETTE_MODE=record \\
+        python3 scripts/check_wallet_transactions.py --latest
+    ONELIMIT_CASSETTE=wallet.ndjson.gz python3 scripts/check_wallet_transactions.py --latest
+
+Web3 code paths (``make_web3``) and WebSocket subscriptions bypass the
+transport and are not captured.
+
+Configuration:
+    ONELIMIT_CASSETTE           cassette file (.ndjson, or .ndjson.gz for gzip)
+    ONELIMIT_CASSETTE_MODE      record or replay (default replay)
+    ONELIMIT_CASSETTE_LATENCY   replay latency as a multiple of the recorded one (default 0)
+"""
+
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from rpc_cache import cache_key
+from transport import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, HttpTransport, TransportError, loads
+
+CASSETTE_VERSION = 1
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _requests(payload: Any) -> List[Dict[str, Any]]:
+    return payload if isinstance(payload, list) else [payload]
+
+
+class RecordingTransport:
+    """⏺️ Pass requests through to ``transport`` and append every exchange to a cassette"""
+
+    def __init__(self, path: str, transport: Optional[HttpTransport] = None):
+        self.path = path
+        self.transport = transport or HttpTransport()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = _open(path, "w")
+        self._write({"cassette": CASSETTE_VERSION, "recorded_at": int(time.time())})
+        self.recorded = 0
+
+    # Web3 providers and timeouts are borrowed from the wrapped transport
+    @property
+    def session(self):
+        return self.transport.session
+
+    @property
+    def connect_timeout(self) -> float:
+        return self.transport.connect_timeout
+
+    @property
+    def read_timeout(self) -> float:
+        return self.transport.read_timeout
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def post(self, url: str, payload: Any, decode: Optional[Callable[[bytes], Any]] = None) -> Any:
+        started = time.perf_counter()
+        requests = _requests(payload)
+        try:
+            if decode is None:
+                data = decoded = self.transport.post(url, payload)
+            else:
+                # The cassette stores plain JSON whatever the caller asked the body to be decoded into
+                data, decoded = self.transport.post(url, payload, decode=lambda body: (loads(body), decode(body)))
+        except TransportError as e:
+            latency = round(time.perf_counter() - started, 4)
+            failure = {"status": e.status, "retry_after": e.retry_after, "message": str(e), "timed_out": e.timed_out}
+            with self._lock:
+                for request in requests:
+                    self._write({"k": cache_key(request["method"], request.get("params", [])),
+                                 "x": failure, "t": latency})
+                self.recorded += len(requests)
+            raise
+        latency = round(time.perf_counter() - started, 4)
+
+        by_id = {item.get("id"): item for item in _requests(data) if isinstance(item, dict)}
+        with self._lock:
+            for request in requests:
+                item = by_id.get(request.get("id"))
+                if item is None:
+                    continue  # dropped by the provider - the client retries it on its own
+                response = {field: value for field, value in item.items() if field not in ("id", "jsonrpc")}
+                self._write({"k": cache_key(request["method"], request.get("params", [])),
+                             "r": response, "t": latency})
+                self.recorded += 1
+            self._file.flush()
+        return decoded
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        self.transport.close()
+
+
+class ReplayTransport:
+    """▶️ Serve a recorded cassette with no network access"""
+
+    def __init__(self, path: str, latency_scale: float = 0.0):
+        self.path = path
+        self.latency_scale = latency_scale
+        self.connect_timeout = DEFAULT_CONNECT_TIMEOUT
+        self.read_timeout = DEFAULT_READ_TIMEOUT
+        self.session = None
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.served = 0
+        self.misses = 0
+        with _open(path, "r") as f:
+            for line in f:
+                entry = json.loads(line)
+                if "k" in entry:
+                    self._entries.setdefault(entry["k"], []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def _next(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = min(position + 1, len(entries) - 1)
+            self.served += 1
+            return entries[position]
+
+    def post(self, url: str, payload: Any, decode: Optional[Callable[[bytes], Any]] = None) -> Any:
+        responses = []
+        latency = 0.0
+        for request in _requests(payload):
+            method = request["method"]
+            entry = self._next(cache_key(method, request.get("params", [])))
+            if entry is None:
+                raise TransportError(f"{method} not recorded in cassette {self.path}", url=url)
+            latency = max(latency, entry.get("t", 0.0))
+            if "x" in entry:
+                failure = entry["x"]
+                raise TransportError(failure["message"], status=failure["status"],
+                                     retry_after=failure["retry_after"], url=url,
+                                     timed_out=failure.get("timed_out", False))
+            responses.append({"jsonrpc": "2.0", "id": request.get("id"), **entry["r"]})
+
+        if self.latency_scale > 0 and latency > 0:
+            time.sleep(latency * self.latency_scale)
+        data = responses if isinstance(payload, list) else responses[0]
+        return data if decode is None else decode(json.dumps(data).encode())
+
+    def close(self) -> None:
+        pass
+
+
+def from_env() -> Optional[Any]:
+    """🌍 Cassette transport configured by ``ONELIMIT_CASSETTE*``, or None for the live network"""
+    path = os.environ.get("ONELIMIT_CASSETTE")
+    if not path:
+        return None
+    mode = os.environ.get("ONELIMIT_CASSETTE_MODE", "replay")
+    if mode == "record":
+        recorder = RecordingTransport(path)
+        # gzip cassettes are only readable once their trailer is written
+        atexit.register(recorder.close)
+        return recorder
+    if mode != "replay":
+        raise ValueError(f"ONELIMIT_CASSETTE_MODE must be record or replay, not {mode!r}")
+    return ReplayTransport(path, float(os.environ.get("ONELIMIT_CASSETTE_LATENCY", "0")))
@@ -1,43 +1,20 @@
 #!/usr/bin/env python3
 
+import argparse
 import json
-import requests
-from web3 import Web3
+
+from amounts import format_units, is_unlimited
+from evm import ROUTER_V6
+from multicall import Multicall3, TokenSweep
+from rpc_client import make_client
+from rpc_router import DEFAULT_ENDPOINTS
+from token_registry import KNOWN_TOKENS, TokenRegistry
 
 # Configuration
 WALLET_FILE = "1Limit/wallet_0x3f847d.json"
-RPC_URL = "https://polygon-bor-rpc.publicnode.com"
-ROUTER_V6 = "0x111111125421cA6dc452d289314280a0f8842A65"
-
-# Token contracts on Polygon
-TOKENS = {
-    "WMATIC": {
-        "address": "0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270",
-        "decimals": 18,
-        "symbol": "WMATIC"
-    },
-    "USDC": {
-        "address": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359", 
-        "decimals": 6,
-        "symbol": "USDC"
-    },
-    "USDT": {
-        "address": "0xc2132D05D31c914a87C6611C10748AEb04B58e8F",
-        "decimals": 6, 
-        "symbol": "USDT"
-    },
-    "DAI": {
-        "address": "0x8f3Cf7ad23Cd3CaDbD9735AFf958023239c6A063",
-        "decimals": 18,
-        "symbol": "DAI"
-    }
-}
 
-print("💰 1Limit Wallet Balance & Approval Checker")
-print("==========================================")
-print(f"🔗 RPC: {RPC_URL}")
-print(f"🏗️  Router V6: {ROUTER_V6}")
-print()
+# Token contracts on Polygon (metadata lives in the shared token registry)
+TOKENS = {token.symbol: token._asdict() for token in KNOWN_TOKENS}
 
 def load_wallet():
     """Load wallet from JSON file"""
@@ -49,147 +26,88 @@ def load_wallet():
         print(f"❌ Error loading wallet: {e}")
         return None
 
-def check_balance(w3, token_address, wallet_address, decimals):
-    """Check token balance"""
-    try:
-        # balanceOf(address) - function signature: 0x70a08231
-        data = "0x70a08231" + wallet_address[2:].zfill(64)
-        
-        response = requests.post(RPC_URL, json={
-            "jsonrpc": "2.0",
-            "method": "eth_call", 
-            "params": [{"to": token_address, "data": data}, "latest"],
-            "id": 1
-        })
-        
-        if response.status_code == 200:
-            result = response.json()
-            if 'result' in result and result['result'] != '0x':
-                balance = int(result['result'], 16) / (10 ** decimals)
-                return balance
-        return 0.0
-    except Exception as e:
-        print(f"❌ Error checking balance: {e}")
-        return 0.0
-
-def check_allowance(w3, token_address, wallet_address, spender_address, decimals):
-    """Check token allowance for spender"""
-    try:
-        # allowance(owner, spender) - function signature: 0xdd62ed3e  
-        data = "0xdd62ed3e" + wallet_address[2:].zfill(64) + spender_address[2:].zfill(64)
-        
-        response = requests.post(RPC_URL, json={
-            "jsonrpc": "2.0",
-            "method": "eth_call",
-            "params": [{"to": token_address, "data": data}, "latest"], 
-            "id": 1
-        })
-        
-        if response.status_code == 200:
-            result = response.json()
-            if 'result' in result and result['result'] != '0x':
-                allowance = int(result['result'], 16) / (10 ** decimals)
-                return allowance
-        return 0.0
-    except Exception as e:
-        print(f"❌ Error checking allowance: {e}")
-        return 0.0
-
-def check_matic_balance(w3, wallet_address):
-    """Check native MATIC balance"""
-    try:
-        balance_wei = w3.eth.get_balance(wallet_address)
-        return w3.from_wei(balance_wei, 'ether')
-    except Exception as e:
-        print(f"❌ Error checking MATIC balance: {e}")
-        return 0.0
-
-def format_balance(balance, symbol):
-    """Format balance for display"""
-    if balance == 0:
+def format_balance(raw_balance, decimals, symbol):
+    """Format a raw base-unit balance for display (exact, never rounded up)"""
+    one = 10 ** decimals
+    if raw_balance == 0:
         return f"❌ 0 {symbol}"
-    elif balance < 0.000001:
-        return f"⚠️  {balance:.8f} {symbol}"
-    elif balance < 1:
-        return f"⚠️  {balance:.6f} {symbol}"
+    elif raw_balance * 10**6 < one:
+        return f"⚠️  {format_units(raw_balance, decimals, 8)} {symbol}"
+    elif raw_balance < one:
+        return f"⚠️  {format_units(raw_balance, decimals)} {symbol}"
     else:
-        return f"✅ {balance:.6f} {symbol}"
+        return f"✅ {format_units(raw_balance, decimals)} {symbol}"
 
-def format_allowance(allowance, symbol):
-    """Format allowance for display"""
-    if allowance == 0:
+def format_allowance(raw_allowance, decimals, symbol):
+    """Format a raw base-unit allowance for display"""
+    if raw_allowance == 0:
         return f"❌ No approval"
-    elif allowance > 1e15:  # Very large number (likely MAX_UINT256)
+    elif is_unlimited(raw_allowance):  # MAX_UINT256 approval, possibly partly spent
         return f"✅ Unlimited approval"
     else:
-        return f"✅ {allowance:.6f} {symbol} approved"
+        return f"✅ {format_units(raw_allowance, decimals)} {symbol} approved"
 
-def main():
-    # Load wallet
-    wallet_address = load_wallet()
-    if not wallet_address:
-        return
-    
+def is_ready(sweep, wallet_address, token_name):
+    """Token has a balance and Router V6 may spend all of it"""
+    balance = sweep.balance(wallet_address, token_name) or 0
+    allowance = sweep.allowance(wallet_address, token_name) or 0
+    return balance > 0 and allowance >= balance
+
+def print_wallet_report(sweep, wallet_address, tokens=TOKENS):
+    """Print balances, approvals and readiness for one wallet from the sweep cache"""
     print(f"👛 Wallet: {wallet_address}")
     print()
     
-    # Initialize Web3
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    
-    if not w3.is_connected():
-        print("❌ Failed to connect to RPC")
-        return
-    
-    print("✅ Connected to Polygon RPC")
-    print()
-    
-    # Check native MATIC balance
+    # Native MATIC balance
     print("🔵 Native MATIC Balance:")
-    matic_balance = check_matic_balance(w3, wallet_address)
-    print(f"   {format_balance(matic_balance, 'MATIC')}")
+    matic_balance = sweep.native_balance(wallet_address)
+    if matic_balance is None:
+        print("   ❌ Error checking MATIC balance")
+    else:
+        print(f"   {format_balance(matic_balance, 18, 'MATIC')}")
     print()
     
-    # Check token balances and approvals
+    # Token balances and approvals
     print("💰 Token Balances & Router V6 Approvals:")
     print("=" * 50)
     
-    for token_name, token_info in TOKENS.items():
+    for token_name, token_info in tokens.items():
         print(f"🪙 {token_name} ({token_info['address'][:10]}...):")
         
-        # Check balance
-        balance = check_balance(w3, token_info['address'], wallet_address, token_info['decimals'])
-        print(f"   Balance: {format_balance(balance, token_name)}")
+        raw_balance = sweep.balance(wallet_address, token_name)
+        raw_allowance = sweep.allowance(wallet_address, token_name)
+        if raw_balance is None or raw_allowance is None:
+            print(f"   ❌ Error checking {token_name} balance/allowance")
+            print()
+            continue
         
-        # Check Router V6 allowance
-        allowance = check_allowance(w3, token_info['address'], wallet_address, ROUTER_V6, token_info['decimals'])
-        print(f"   Router V6: {format_allowance(allowance, token_name)}")
+        decimals = token_info['decimals']
+        print(f"   Balance: {format_balance(raw_balance, decimals, token_name)}")
+        print(f"   Router V6: {format_allowance(raw_allowance, decimals, token_name)}")
         
-        # Trading readiness check
-        if balance > 0 and allowance >= balance:
+        # Trading readiness check (on raw amounts, so no float rounding)
+        if raw_balance > 0 and raw_allowance >= raw_balance:
             print(f"   Status: ✅ Ready for trading")
-        elif balance > 0 and allowance == 0:
+        elif raw_balance > 0 and raw_allowance == 0:
             print(f"   Status: ⚠️  Has balance but needs approval")
-        elif balance == 0:
+        elif raw_balance == 0:
             print(f"   Status: ❌ No balance - acquire {token_name} first")
         else:
             print(f"   Status: ⚠️  Insufficient approval")
         
         print()
     
-    # Summary and recommendations
+    # Summary and recommendations (served from the sweep cache, no re-query)
     print("📊 Trading Readiness Summary:")
     print("=" * 30)
     
-    # Check WMATIC
-    wmatic_balance = check_balance(w3, TOKENS['WMATIC']['address'], wallet_address, TOKENS['WMATIC']['decimals'])
-    wmatic_allowance = check_allowance(w3, TOKENS['WMATIC']['address'], wallet_address, ROUTER_V6, TOKENS['WMATIC']['decimals'])
-    
-    # Check USDC  
-    usdc_balance = check_balance(w3, TOKENS['USDC']['address'], wallet_address, TOKENS['USDC']['decimals'])
-    usdc_allowance = check_allowance(w3, TOKENS['USDC']['address'], wallet_address, ROUTER_V6, TOKENS['USDC']['decimals'])
+    wmatic_balance = sweep.balance(wallet_address, 'WMATIC') or 0
+    wmatic_allowance = sweep.allowance(wallet_address, 'WMATIC') or 0
+    usdc_balance = sweep.balance(wallet_address, 'USDC') or 0
+    usdc_allowance = sweep.allowance(wallet_address, 'USDC') or 0
     
-    print(f"🔄 WMATIC → USDC: {'✅ Ready' if wmatic_balance > 0 and wmatic_allowance >= wmatic_balance else '❌ Not Ready'}")
-    print(f"🔄 USDC → WMATIC: {'✅ Ready' if usdc_balance > 0 and usdc_allowance >= usdc_balance else '❌ Not Ready'}")
+    print(f"🔄 WMATIC → USDC: {'✅ Ready' if is_ready(sweep, wallet_address, 'WMATIC') else '❌ Not Ready'}")
+    print(f"🔄 USDC → WMATIC: {'✅ Ready' if is_ready(sweep, wallet_address, 'USDC') else '❌ Not Ready'}")
     
     print()
     print("💡 Next Steps:")
@@ -199,8 +117,48 @@ def main():
         print("   2. 🔐 Approve Router V6 for USDC spending")
     if wmatic_allowance == 0 and wmatic_balance > 0:
         print("   3. 🔐 Approve Router V6 for WMATIC spending")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description="💰 1Limit Wallet Balance & Approval Checker")
+    parser.add_argument("wallets", nargs="*", help="👛 Wallet addresses to sweep (default: wallet file)")
+    parser.add_argument("--token", action="append", default=[], dest="extra_tokens",
+                        help="🪙 Extra ERC-20 address to include, repeatable (symbol/decimals looked up)")
+    args = parser.parse_args()
     
+    print("💰 1Limit Wallet Balance & Approval Checker")
+    print("==========================================")
+    print(f"🔗 RPC pool: {', '.join(DEFAULT_ENDPOINTS)}")
+    print(f"🏗️  Router V6: {ROUTER_V6}")
     print()
+    
+    # Load wallet(s)
+    wallets = args.wallets
+    if not wallets:
+        wallet_address = load_wallet()
+        if not wallet_address:
+            return
+        wallets = [wallet_address]
+    
+    # One aggregate3 eth_call per chunk, every result pinned to the same block
+    rpc = make_client()
+    tokens = dict(TOKENS)
+    for token in TokenRegistry(rpc).resolve(args.extra_tokens).values():
+        tokens.setdefault(token.symbol, token._asdict())
+    multicall = Multicall3(rpc)
+    sweep = TokenSweep(multicall, tokens, ROUTER_V6)
+    try:
+        block = sweep.sweep(wallets)
+    except Exception as e:
+        print(f"❌ Failed to query Polygon RPC: {e}")
+        return
+    
+    print(f"✅ Connected to Polygon RPC (block {block:,})")
+    print()
+    
+    for wallet_address in wallets:
+        print_wallet_report(sweep, wallet_address, tokens)
+    
     print("🏗️  Router V6 Contract Address for approvals:")
     print(f"   {ROUTER_V6}")
 
@@ -13,20 +13,30 @@ Ported wallet verification logic to complement the Swift Router V6 implementatio
 Usage:
     python3 scripts/check_wallet_transactions.py                    # Check wallet activity
     python3 scripts/check_wallet_transactions.py --tx 0x123...     # Check specific transaction
-    python3 scripts/check_wallet_transactions.py --latest          # Check latest transactions
+    python3 scripts/check_wallet_transactions.py --latest          # Latest transactions from the local index
+    python3 scripts/check_wallet_transactions.py --latest --sync   # Sync the index first, then list
+    python3 scripts/check_wallet_transactions.py fleet wallets/    # Scan many wallets (NDJSON)
 
 Requirements:
     pip install requests
+    pip install "httpx[http2]"   # optional, HTTP/2 keep-alive (see transport.py)
 
 Author: Generated with Claude Code 🤖❤️🎉
 """
 
 import json
-import requests
 import sys
 import os
 import argparse
-from typing import Optional, Dict, Any
+import contextlib
+from decimal import Decimal
+from typing import Optional, Dict, Any, List, Tuple
+
+from amounts import format_units, to_decimal
+from rate_limit import THROTTLE_STATUSES
+from rpc_client import RpcClient, RpcError
+from rpc_types import Receipt, Transaction
+from transport import HttpTransport, TransportError
 
 # Polygon Mainnet RPC endpoint (matching iOS app configuration)
 POLYGON_RPC_URL = "https://polygon-bor-rpc.publicnode.com"
@@ -37,13 +47,10 @@ WALLET_FILE_PATH = "1Limit/wallet_0x3f847d.json"
 class PolygonWalletChecker:
     """🏦 Polygon wallet transaction checker (ported from Go/Swift concepts)"""
     
-    def __init__(self, rpc_url: str = POLYGON_RPC_URL):
+    def __init__(self, rpc_url: str = POLYGON_RPC_URL, transport: Optional[HttpTransport] = None):
         self.rpc_url = rpc_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'User-Agent': '1Limit-iOS-Wallet-Checker/1.0'
-        })
+        # Shared pooled keep-alive transport (see transport.py)
+        self.rpc = RpcClient(rpc_url, transport=transport)
     
     def load_wallet(self, wallet_path: str) -> Optional[Dict[str, str]]:
         """📁 Load wallet JSON file (matching Swift WalletLoader logic)"""
@@ -55,23 +62,14 @@ class PolygonWalletChecker:
             with open(wallet_path, 'r') as f:
                 wallet_data = json.load(f)
             
-            # Validate wallet structure (matching Swift validation)
-            if 'address' not in wallet_data or 'private_key' not in wallet_data:
-                print("❌ Invalid wallet structure - missing address or private_key")
+            error = self.validate_wallet_data(wallet_data)
+            if error:
+                print(f"❌ {error}")
                 return None
             
             address = wallet_data['address']
             private_key = wallet_data['private_key']
             
-            # Basic validation (matching Swift patterns)
-            if not address.startswith('0x') or len(address) != 42:
-                print(f"❌ Invalid address format: {address}")
-                return None
-            
-            if not private_key.startswith('0x') or len(private_key) != 66:
-                print(f"❌ Invalid private key format")
-                return None
-            
             print(f"✅ Wallet loaded: {self.mask_address(address)}")
             print(f"🔐 Private key: {self.mask_private_key(private_key)}")
             
@@ -84,6 +82,27 @@ class PolygonWalletChecker:
             print(f"❌ Failed to load wallet: {e}")
             return None
     
+    @staticmethod
+    def validate_wallet_data(wallet_data: Any) -> Optional[str]:
+        """🧪 Validate wallet JSON structure (matching Swift validation)
+
+        Returns an error message, or None when the wallet is valid.
+        """
+        if not isinstance(wallet_data, dict) or 'address' not in wallet_data or 'private_key' not in wallet_data:
+            return "Invalid wallet structure - missing address or private_key"
+        
+        address = wallet_data['address']
+        private_key = wallet_data['private_key']
+        
+        # Basic validation (matching Swift patterns)
+        if not isinstance(address, str) or not address.startswith('0x') or len(address) != 42:
+            return f"Invalid address format: {address}"
+        
+        if not isinstance(private_key, str) or not private_key.startswith('0x') or len(private_key) != 66:
+            return "Invalid private key format"
+        
+        return None
+    
     def mask_address(self, address: str) -> str:
         """🎭 Mask address for safe logging (matching Swift implementation)"""
         if len(address) < 10:
@@ -96,34 +115,46 @@ class PolygonWalletChecker:
             return private_key
         return f"{private_key[:6]}..." + "*" * 56 + "***"
     
-    def json_rpc_call(self, method: str, params: list) -> Optional[Dict[str, Any]]:
-        """🌐 Make JSON-RPC call to Polygon node"""
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params,
-            "id": 1
-        }
-        
+    def report_transport_error(self, error: TransportError) -> None:
+        """⏳ Print a transport failure, calling out throttling explicitly"""
+        if error.status in THROTTLE_STATUSES:
+            print(f"⏳ Throttled by RPC endpoint (HTTP {error.status}) - retry budget exhausted, result unknown")
+        else:
+            print(f"❌ {error}")
+    
+    def json_rpc_call(self, method: str, params: list, result_type: Any = None) -> Any:
+        """🌐 Make JSON-RPC call to Polygon node (decoded into ``result_type`` when given)"""
         try:
-            response = self.session.post(self.rpc_url, json=payload, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if 'error' in data:
-                print(f"❌ RPC Error: {data['error']}")
-                return None
-            
-            return data.get('result')
-        
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Network error: {e}")
+            return self.rpc.call(method, params, result_type)
+        except RpcError as e:
+            print(f"❌ RPC Error: {e.error}")
             return None
-        except json.JSONDecodeError as e:
-            print(f"❌ Failed to parse RPC response: {e}")
+        except TransportError as e:
+            self.report_transport_error(e)
             return None
     
+    def json_rpc_batch(self, calls: List[Tuple[str, list]]) -> List[Optional[Any]]:
+        """📦 Send several JSON-RPC calls in one HTTP round-trip
+
+        Results come back in the same order as ``calls``; a call that failed
+        yields None (its error is printed, matching ``json_rpc_call``). Falls
+        back to sequential calls when the endpoint does not accept batches.
+        """
+        if not calls:
+            return []
+        
+        try:
+            results = self.rpc.batch(calls)
+        except TransportError as e:
+            self.report_transport_error(e)
+            return [None] * len(calls)
+        
+        for i, ((method, _), result) in enumerate(zip(calls, results)):
+            if isinstance(result, RpcError):
+                print(f"❌ RPC Error ({method}): {result.error}")
+                results[i] = None
+        return results
+    
     def get_transaction_count(self, address: str) -> Optional[int]:
         """📊 Get transaction count (nonce) for address"""
         result = self.json_rpc_call("eth_getTransactionCount", [address, "latest"])
@@ -137,7 +168,7 @@ class PolygonWalletChecker:
             print(f"❌ Failed to parse transaction count: {e}")
             return None
     
-    def get_balance(self, address: str) -> Optional[float]:
+    def get_balance(self, address: str) -> Optional[Decimal]:
         """💰 Get MATIC balance for address"""
         result = self.json_rpc_call("eth_getBalance", [address, "latest"])
         if result is None:
@@ -146,7 +177,7 @@ class PolygonWalletChecker:
         try:
             # Convert hex wei to MATIC
             balance_wei = int(result, 16)
-            balance_matic = balance_wei / 10**18
+            balance_matic = to_decimal(balance_wei, 18)
             return balance_matic
         except ValueError as e:
             print(f"❌ Failed to parse balance: {e}")
@@ -164,6 +195,17 @@ class PolygonWalletChecker:
             print(f"❌ Failed to parse block number: {e}")
             return None
     
+    def parse_quantity(self, result: Optional[str], label: str) -> Optional[int]:
+        """🔢 Parse a hex quantity returned by the node"""
+        if result is None:
+            return None
+        
+        try:
+            return int(result, 16)
+        except (TypeError, ValueError) as e:
+            print(f"❌ Failed to parse {label}: {e}")
+            return None
+    
     def check_wallet_activity(self, wallet_data: Dict[str, str]) -> bool:
         """🔍 Check if wallet has any activity on Polygon"""
         address = wallet_data['address']
@@ -173,9 +215,16 @@ class PolygonWalletChecker:
         print(f"🏦 Address: {masked_address}")
         print(f"🌐 RPC: {self.rpc_url}")
         
+        # Fetch block, nonce and balance in a single round-trip
+        block_hex, nonce_hex, balance_hex = self.json_rpc_batch([
+            ("eth_blockNumber", []),
+            ("eth_getTransactionCount", [address, "latest"]),
+            ("eth_getBalance", [address, "latest"]),
+        ])
+        
         # Check latest block to verify RPC connection
         print(f"\n📋 Step 1: Verifying RPC connection...")
-        latest_block = self.get_latest_block()
+        latest_block = self.parse_quantity(block_hex, "block number")
         if latest_block is None:
             print("❌ Failed to connect to Polygon RPC")
             return False
@@ -184,7 +233,7 @@ class PolygonWalletChecker:
         
         # Check transaction count
         print(f"\n📋 Step 2: Checking transaction count...")
-        tx_count = self.get_transaction_count(address)
+        tx_count = self.parse_quantity(nonce_hex, "transaction count")
         if tx_count is None:
             print("❌ Failed to get transaction count")
             return False
@@ -193,11 +242,12 @@ class PolygonWalletChecker:
         
         # Check balance
         print(f"\n📋 Step 3: Checking MATIC balance...")
-        balance = self.get_balance(address)
-        if balance is None:
+        balance_wei = self.parse_quantity(balance_hex, "balance")
+        if balance_wei is None:
             print("❌ Failed to get balance")
             return False
         
+        balance = to_decimal(balance_wei, 18)
         print(f"💰 MATIC balance: {balance:.6f} MATIC")
         
         # Determine activity status
@@ -218,15 +268,13 @@ class PolygonWalletChecker:
         
         return has_activity
     
-    def get_transaction_receipt(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+    def get_transaction_receipt(self, tx_hash: str) -> Optional[Receipt]:
         """📋 Get transaction receipt for analysis"""
-        result = self.json_rpc_call("eth_getTransactionReceipt", [tx_hash])
-        return result
+        return self.json_rpc_call("eth_getTransactionReceipt", [tx_hash], Receipt)
     
-    def get_transaction_details(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+    def get_transaction_details(self, tx_hash: str) -> Optional[Transaction]:
         """📄 Get transaction details"""
-        result = self.json_rpc_call("eth_getTransactionByHash", [tx_hash])
-        return result
+        return self.json_rpc_call("eth_getTransactionByHash", [tx_hash], Transaction)
     
     def analyze_transaction(self, tx_hash: str) -> bool:
         """🔍 Analyze specific transaction for Router V6 debugging"""
@@ -241,11 +289,11 @@ class PolygonWalletChecker:
             return False
         
         print("✅ Transaction found!")
-        print(f"   📤 From: {self.mask_address(tx_details.get('from', 'unknown'))}")
-        print(f"   📥 To: {self.mask_address(tx_details.get('to', 'unknown'))}")
-        print(f"   💰 Value: {int(tx_details.get('value', '0x0'), 16) / 10**18:.6f} MATIC")
-        print(f"   ⛽ Gas Limit: {int(tx_details.get('gas', '0x0'), 16):,}")
-        print(f"   💸 Gas Price: {int(tx_details.get('gasPrice', '0x0'), 16) / 10**9:.1f} gwei")
+        print(f"   📤 From: {self.mask_address(tx_details.sender)}")
+        print(f"   📥 To: {self.mask_address(tx_details.to or 'contract creation')}")
+        print(f"   💰 Value: {format_units(tx_details.value, 18)} MATIC")
+        print(f"   ⛽ Gas Limit: {tx_details.gas:,}")
+        print(f"   💸 Gas Price: {format_units(tx_details.gas_price or 0, 9, 1)} gwei")
         
         # Get transaction receipt
         print("\n📋 Step 2: Getting transaction receipt...")
@@ -254,13 +302,12 @@ class PolygonWalletChecker:
             print("❌ Transaction receipt not found")
             return False
         
-        status = receipt.get('status', '0x0')
-        success = status == '0x1'
+        success = receipt.succeeded
         
         print(f"✅ Transaction receipt found!")
         print(f"   📊 Status: {'SUCCESS' if success else 'FAILED'}")
-        print(f"   🧱 Block: {int(receipt.get('blockNumber', '0x0'), 16):,}")
-        print(f"   ⛽ Gas Used: {int(receipt.get('gasUsed', '0x0'), 16):,}")
+        print(f"   🧱 Block: {receipt.block_number:,}")
+        print(f"   ⛽ Gas Used: {receipt.gas_used:,}")
         
         if not success:
             print(f"\n❌ Transaction failed on-chain!")
@@ -272,20 +319,123 @@ class PolygonWalletChecker:
         
         return success
     
-    def get_recent_transactions(self, address: str, count: int = 5) -> None:
-        """📋 Get recent transactions for debugging (simplified approach)"""
+    def get_recent_transactions(self, address: str, count: int = 5, sync: bool = False) -> None:
+        """📋 Get recent transactions from the local wallet index
+
+        Reads only the local index and token cache unless ``sync`` is set, in
+        which case the index is first brought up to the safe head and any
+        unknown token's metadata is fetched.
+        """
+        from token_registry import TokenRegistry
+        from wallet_indexer import WalletIndexer
+        
+        indexer = WalletIndexer(self.rpc, address)
+        registry = TokenRegistry(self.rpc)
+        
+        if sync:
+            print(f"🔄 Syncing local index for {self.mask_address(address)}...")
+            try:
+                added = indexer.sync()
+                print(f"✅ Index up to date (+{added} rows)\n")
+            except Exception as e:
+                print(f"⚠️  Index sync failed, showing cached data: {e}\n")
+        
+        rows = indexer.recent(count)
         print(f"📋 Recent transactions for {self.mask_address(address)}:")
-        print("💡 Note: This requires a more complex API or indexing service")
-        print("🔗 Check manually on Polygonscan: https://polygonscan.com/address/" + address)
+        if not rows:
+            print("😴 No token transfers or order fills indexed yet")
+            if not sync:
+                print("💡 Run with --sync to index recent blocks from the chain")
+            print("🔗 Check manually on Polygonscan: https://polygonscan.com/address/" + address)
+            return
+        
+        if sync:
+            registry.resolve(row['token'] for row in rows)
+        for row in rows:
+            token = registry.cached(row['token'])
+            if token is None:
+                amount, symbol = f"{row['amount']} units", self.mask_address(row['token'])
+            else:
+                amount, symbol = format_units(row['amount'], token.decimals), token.symbol
+            print(f"   {row['label']} | 🧱 {row['block']:,} | 🪙 {symbol} | "
+                  f"💰 {amount} | 👥 {self.mask_address(row['counterparty'])}")
+            print(f"      🔗 https://polygonscan.com/tx/{row['tx_hash']}")
 
 def main():
     """🚀 Main execution function"""
     parser = argparse.ArgumentParser(description="🔍 1Limit Wallet Transaction Checker")
     parser.add_argument("--tx", "--transaction", help="🔍 Check specific transaction hash")
     parser.add_argument("--latest", action="store_true", help="📋 Show latest transactions")
+    parser.add_argument("--count", type=int, default=5, help="🔢 Number of transactions for --latest")
+    parser.add_argument("--sync", action="store_true",
+                        help="🔄 Sync the local index from the chain before --latest (default: local index only)")
+    
+    subparsers = parser.add_subparsers(dest="command")
+    fleet_parser = subparsers.add_parser("fleet", help="🚢 Scan many wallet files concurrently (NDJSON output)")
+    fleet_parser.add_argument("target", help="📁 Directory or glob of wallet JSON files")
+    fleet_parser.add_argument("--rpc-url", action="append", dest="rpc_urls",
+                              help=f"🌐 RPC endpoint, repeatable (default: {POLYGON_RPC_URL})")
+    fleet_parser.add_argument("--concurrency", type=int, default=16, help="🔀 Max wallets in flight")
+    fleet_parser.add_argument("--rate", type=float, default=10.0, help="🪣 Max requests per second per endpoint")
+    
+    monitor_parser = subparsers.add_parser("monitor", help="📡 Stream wallet/receipt change events on every new block")
+    monitor_parser.add_argument("target", nargs="?", default=WALLET_FILE_PATH,
+                                help="📁 Wallet JSON file, directory or glob (default: the app wallet)")
+    monitor_parser.add_argument("--rpc-url", default=POLYGON_RPC_URL, help="🌐 HTTP RPC endpoint")
+    monitor_parser.add_argument("--ws-url", default=None,
+                                help="🔌 WebSocket endpoint for eth_subscribe (default: publicnode, '' = poll only)")
+    monitor_parser.add_argument("--interval", type=float, default=2.0, help="⏱️ Polling interval in seconds")
+    monitor_parser.add_argument("--watch-tx", action="append", default=[], help="🧾 Pending tx hash to watch, repeatable")
     
     args = parser.parse_args()
     
+    if args.command == "fleet":
+        import asyncio
+        from fleet_scanner import run_fleet_scan
+        
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        if args.rate <= 0:
+            parser.error("--rate must be positive")
+        
+        # NDJSON owns stdout; progress and RPC diagnostics go to stderr
+        out = sys.stdout
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                failures = asyncio.run(run_fleet_scan(
+                    args.target, args.rpc_urls or [POLYGON_RPC_URL], args.concurrency, args.rate, out
+                ))
+        except ConnectionError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0 if failures == 0 else 1)
+    
+    if args.command == "monitor":
+        import asyncio
+        from fleet_scanner import discover_wallet_files, read_wallet_file
+        from head_monitor import DEFAULT_WS_URL, run_monitor
+        
+        wallets = []
+        for path in discover_wallet_files(args.target):
+            address, error = read_wallet_file(path)
+            if error:
+                print(f"❌ {path}: {error}", file=sys.stderr)
+            else:
+                wallets.append(address)
+        if not wallets and not args.watch_tx:
+            print(f"❌ Nothing to monitor for: {args.target}", file=sys.stderr)
+            sys.exit(1)
+        
+        ws_url = DEFAULT_WS_URL if args.ws_url is None else args.ws_url
+        out = sys.stdout
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                asyncio.run(run_monitor(RpcClient(args.rpc_url), wallets, args.watch_tx,
+                                        ws_url or None, args.interval, out))
+        except KeyboardInterrupt:
+            print("\n👋 Monitor stopped", file=sys.stderr)
+        sys.exit(0)
+    
     print("🚀 1Limit Wallet Transaction Checker")
     print("=====================================")
     
@@ -313,7 +463,7 @@ def main():
             print("\n❌ Cannot proceed without valid wallet")
             sys.exit(1)
         
-        checker.get_recent_transactions(wallet_data['address'])
+        checker.get_recent_transactions(wallet_data['address'], args.count, sync=args.sync)
         print("💖 Generated with Claude Code 🤖❤️🎉")
         sys.exit(0)
     
@@ -1,193 +1,205 @@
 #!/usr/bin/env python3
 
-import requests
-import json
-from web3 import Web3
+from amounts import to_decimal
+from eip712 import verify_fill
+from evm import ROUTER_V6
+from maker_traits import MakerTraits, describe
+from rpc_cache import BlockPinnedCache
+from rpc_client import make_client
+from router_v6_decoder import DecodeError, decode_fill_call, is_fill_call
+from revert_replay import replay_transaction
+from token_registry import TokenRegistry
 
 # Transaction details
 FAILED_TX_HASH = "0x5939651d78b17fd8d1a0cfca79c47cbe58c7d14f620cf76738fa5980526e8f16"
-RPC_URL = "https://polygon-bor-rpc.publicnode.com"
-ROUTER_V6 = "0x111111125421cA6dc452d289314280a0f8842A65"
 USDC_CONTRACT = "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359"
-WMATIC_CONTRACT = "0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270"
 
-print("🔍 1Limit Contract-Level Transaction Debugger")
-print("============================================")
-print(f"🚨 Analyzing failed transaction: {FAILED_TX_HASH}")
-print(f"🏗️  Router V6 Contract: {ROUTER_V6}")
-print()
 
-# Initialize Web3
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
-
-try:
-    # Get transaction details
-    print("📋 Step 1: Analyzing transaction input data...")
-    tx = w3.eth.get_transaction(FAILED_TX_HASH)
-    receipt = w3.eth.get_transaction_receipt(FAILED_TX_HASH)
-    
-    input_data = tx['input'].hex()
-    print(f"📝 Full Input Data: {input_data}")
-    print(f"📏 Length: {len(input_data)} characters")
+def main():
+    """🔍 Decode a failed Router V6 fill and check the maker's state at its block"""
+    print("🔍 1Limit Contract-Level Transaction Debugger")
+    print("============================================")
+    print(f"🚨 Analyzing failed transaction: {FAILED_TX_HASH}")
+    print(f"🏗️  Router V6 Contract: {ROUTER_V6}")
     print()
+
+    # Initialize RPC client (endpoint pool with failover; block-pinned reads come from the on-disk cache)
+    rpc = make_client(cache=BlockPinnedCache())
+    tokens = TokenRegistry(rpc)
+
+    try:
+        # Get transaction details
+        print("📋 Step 1: Analyzing transaction input data...")
+        tx = rpc.call("eth_getTransactionByHash", [FAILED_TX_HASH])
+        receipt = rpc.call("eth_getTransactionReceipt", [FAILED_TX_HASH])
     
-    # Decode fillOrder parameters
-    if input_data.startswith("0x9fda64bd"):
-        print("✅ Method: fillOrder(tuple order, bytes32 r, bytes32 vs, uint256 amount, uint256 takerTraits)")
-        print()
-        
-        # Remove method ID and decode parameters
-        params_data = input_data[10:]  # Remove 0x9fda64bd
-        print(f"📊 Parameters data: {params_data}")
-        print(f"📏 Parameters length: {len(params_data)} characters")
+        input_data = tx['input']
+        print(f"📝 Full Input Data: {input_data}")
+        print(f"📏 Length: {len(input_data)} characters")
         print()
+    
+        # Decode Router V6 order-fill parameters
+        signature = None  # offline check result, when the fill decodes and a keccak backend exists
+        if is_fill_call(input_data):
+            try:
+                fill = decode_fill_call(input_data)
+            except DecodeError as e:
+                fill = None
+                print(f"❌ Malformed {input_data[:10]} calldata: {e}")
+                print()
+        else:
+            fill = None
+            print(f"❓ Not a Router V6 order fill: {input_data[:10]}")
+            print()
+    
+        if fill is not None:
+            print(f"✅ Method: {fill.method} ({fill.selector})")
+            print()
         
-        # Decode individual parameters (each is 64 characters / 32 bytes)
-        print("🔧 Decoding fillOrder parameters:")
-        
-        # Order tuple components (first 8 * 64 = 512 characters)
-        order_data = params_data[:512]
-        print(f"📦 Order tuple data: {order_data}")
+            order = fill.order
+            makerAsset = order.maker_asset
+            takerAsset = order.taker_asset
+            makingAmount = order.making_amount
+            takingAmount = order.taking_amount
         
-        # Extract order fields (32 bytes each)
-        salt = int(order_data[0:64], 16)
-        maker = "0x" + order_data[64:128][-40:]  # Last 40 chars (20 bytes)
-        receiver = "0x" + order_data[128:192][-40:]
-        makerAsset = "0x" + order_data[192:256][-40:]
-        takerAsset = "0x" + order_data[256:320][-40:]
-        makingAmount = int(order_data[320:384], 16)
-        takingAmount = int(order_data[384:448], 16)
-        makerAssetData = "0x" + order_data[448:512]
+            print("🔧 Decoding order parameters:")
+            print(f"  🧂 Salt: {order.salt}")
+            print(f"  👤 Maker: {order.maker}")
+            print(f"  📨 Receiver: {order.receiver}")
+            print(f"  💰 Maker Asset: {makerAsset}")
+            print(f"  💱 Taker Asset: {takerAsset}")
+            print(f"  📈 Making Amount: {makingAmount}")
+            print(f"  📉 Taking Amount: {takingAmount}")
+            # Expiry is judged against the timestamp of the block the fill landed in
+            header = rpc.call("eth_getBlockByNumber", [receipt['blockNumber'], False])
+            maker_traits = MakerTraits.from_int(order.maker_traits)
+            for line in describe(maker_traits, int(header['timestamp'], 16)):
+                print(f"  {line}")
+            print()
         
-        print(f"  🧂 Salt: {salt}")
-        print(f"  👤 Maker: {maker}")
-        print(f"  📨 Receiver: {receiver}")
-        print(f"  💰 Maker Asset: {makerAsset}")
-        print(f"  💱 Taker Asset: {takerAsset}")
-        print(f"  📈 Making Amount: {makingAmount}")
-        print(f"  📉 Taking Amount: {takingAmount}")
-        print()
+            # Label both assets from the token registry (one batched lookup for unknown tokens)
+            print("🔍 Token Analysis:")
+            assets = tokens.resolve([makerAsset, takerAsset])
+            maker_token = assets[makerAsset.lower()]
+            taker_token = assets[takerAsset.lower()]
+            for side, token in (("Maker", maker_token), ("Taker", taker_token)):
+                if token.verified:
+                    print(f"  ✅ {side} Asset: {token.symbol} ({token.address})")
+                else:
+                    print(f"  ❓ {side} Asset: {token.symbol} - not a standard ERC-20 ({token.address})")
+            print()
         
-        # Check token addresses
-        print("🔍 Token Analysis:")
-        if makerAsset.lower() == USDC_CONTRACT.lower():
-            print(f"  ✅ Maker Asset: USDC ({makerAsset})")
-        elif makerAsset.lower() == WMATIC_CONTRACT.lower():
-            print(f"  ✅ Maker Asset: WMATIC ({makerAsset})")
-        else:
-            print(f"  ❓ Unknown Maker Asset: {makerAsset}")
-            
-        if takerAsset.lower() == USDC_CONTRACT.lower():
-            print(f"  ✅ Taker Asset: USDC ({takerAsset})")
-        elif takerAsset.lower() == WMATIC_CONTRACT.lower():
-            print(f"  ✅ Taker Asset: WMATIC ({takerAsset})")
-        else:
-            print(f"  ❓ Unknown Taker Asset: {takerAsset}")
-        print()
+            # Calculate exchange rate (decimals come from the registry)
+            if makingAmount > 0 and takingAmount > 0:
+                making = to_decimal(makingAmount, maker_token.decimals)
+                taking = to_decimal(takingAmount, taker_token.decimals)
+                rate = taking / making
+                print(f"💱 Exchange Rate: {making} {maker_token.symbol} → {taking} {taker_token.symbol}")
+                print(f"🎯 Rate: {rate:.6f} {taker_token.symbol} per {maker_token.symbol}")
+            print()
         
-        # Calculate exchange rate
-        if makingAmount > 0 and takingAmount > 0:
-            if makerAsset.lower() == USDC_CONTRACT.lower():
-                # USDC has 6 decimals, WMATIC has 18 decimals
-                usdc_amount = makingAmount / 10**6
-                wmatic_amount = takingAmount / 10**18
-                rate = wmatic_amount / usdc_amount
-                print(f"💱 Exchange Rate: {usdc_amount} USDC → {wmatic_amount} WMATIC")
-                print(f"🎯 Rate: {rate:.6f} WMATIC per USDC")
+            # Signature, amount and taker traits
+            if fill.r is not None:
+                print(f"✍️  Signature r: 0x{fill.r.hex()}")
+                print(f"✍️  Signature vs: 0x{fill.vs.hex()}")
             else:
-                # WMATIC → USDC
-                wmatic_amount = makingAmount / 10**18
-                usdc_amount = takingAmount / 10**6
-                rate = usdc_amount / wmatic_amount
-                print(f"💱 Exchange Rate: {wmatic_amount} WMATIC → {usdc_amount} USDC")
-                print(f"🎯 Rate: {rate:.6f} USDC per WMATIC")
-        print()
-        
-        # Get signature and amount parameters
-        remaining_data = params_data[512:]
-        
-        # Parse r, vs, amount, takerTraits
-        if len(remaining_data) >= 256:  # 4 params * 64 chars each
-            r = "0x" + remaining_data[0:64]
-            vs = "0x" + remaining_data[64:128]
-            amount = int(remaining_data[128:192], 16)
-            takerTraits = int(remaining_data[192:256], 16)
-            
-            print(f"✍️  Signature r: {r}")
-            print(f"✍️  Signature vs: {vs}")
-            print(f"💰 Fill Amount: {amount}")
-            print(f"🏷️  Taker Traits: {takerTraits}")
+                print(f"✍️  Contract signature: 0x{fill.signature.hex()}")
+            try:
+                signature = verify_fill(fill)
+            except ImportError:
+                signature = None  # no keccak backend installed
+            if signature is None:
+                print("❓ Signature: verification unavailable")
+            else:
+                print(f"🔑 Order Hash: {signature.order_hash}")
+                if signature.valid is None:
+                    print(f"❓ Signature: {signature.reason}")
+                elif signature.valid:
+                    print(f"✅ Signature: {signature.reason} ({signature.signer})")
+                else:
+                    print(f"❌ Signature: {signature.reason} (signer {signature.signer}, maker {signature.maker})")
+            print(f"💰 Fill Amount: {fill.amount}")
+            traits = fill.taker_traits
+            print(f"🏷️  Taker Traits: {hex(traits.raw)}")
+            print(f"   📐 Amount is {'making' if traits.maker_amount else 'taking'} amount, threshold {traits.threshold}")
+            if traits.extension_length or traits.interaction_length:
+                print(f"   🧩 Args: extension {traits.extension_length} bytes, interaction {traits.interaction_length} bytes")
             print()
     
-    # Check wallet state at the time of transaction
-    print("📋 Step 2: Checking wallet state at transaction block...")
-    block_number = receipt['blockNumber']
-    wallet = tx['from']
+        # Check wallet state at the time of transaction
+        print("📋 Step 2: Checking wallet state at transaction block...")
+        block_number = int(receipt['blockNumber'], 16)
+        wallet = tx['from']
     
-    # Check USDC balance
-    usdc_balance_data = {
-        "jsonrpc": "2.0",
-        "method": "eth_call",
-        "params": [{
-            "to": USDC_CONTRACT,
-            "data": "0x70a08231" + wallet[2:].zfill(64)  # balanceOf(address)
-        }, hex(block_number)],
-        "id": 1
-    }
+        # Check balance of the token being sold (USDC if the fill did not decode)
+        token = tokens.get(fill.order.maker_asset if fill is not None else USDC_CONTRACT)
+        result = rpc.eth_call(token.address, "0x70a08231" + wallet[2:].zfill(64), hex(block_number))  # balanceOf(address)
+        if result != '0x':
+            print(f"💰 {token.symbol} Balance: {to_decimal(int(result, 16), token.decimals)} {token.symbol}")
+        else:
+            print(f"💰 {token.symbol} Balance: 0 {token.symbol}")
     
-    response = requests.post(RPC_URL, json=usdc_balance_data)
-    if response.status_code == 200:
-        result = response.json()
-        if 'result' in result and result['result'] != '0x':
-            usdc_balance = int(result['result'], 16) / 10**6  # USDC has 6 decimals
-            print(f"💰 USDC Balance: {usdc_balance} USDC")
+        # Check its allowance for Router V6
+        result = rpc.eth_call(
+            token.address,
+            "0xdd62ed3e" + wallet[2:].zfill(64) + ROUTER_V6[2:].zfill(64),  # allowance(owner, spender)
+            hex(block_number)
+        )
+        if result != '0x':
+            print(f"🔐 {token.symbol} Allowance: {to_decimal(int(result, 16), token.decimals)} {token.symbol}")
         else:
-            print("💰 USDC Balance: 0 USDC")
+            print(f"🔐 {token.symbol} Allowance: 0 {token.symbol}")
+        print()
     
-    # Check USDC allowance for Router V6
-    allowance_data = {
-        "jsonrpc": "2.0",
-        "method": "eth_call",
-        "params": [{
-            "to": USDC_CONTRACT,
-            "data": "0xdd62ed3e" + wallet[2:].zfill(64) + ROUTER_V6[2:].zfill(64)  # allowance(owner, spender)
-        }, hex(block_number)],
-        "id": 2
-    }
+        # Analyze failure reasons
+        print("🔧 Contract-Level Failure Analysis:")
+        print("===================================")
+        print("🚨 Transaction failed during Router V6 execution")
+        gas_used = int(receipt['gasUsed'], 16)
+        print(f"⛽ Gas used: {gas_used:,}{' (early revert)' if gas_used < 50_000 else ''}")
+        print()
     
-    response = requests.post(RPC_URL, json=allowance_data)
-    if response.status_code == 200:
-        result = response.json()
-        if 'result' in result and result['result'] != '0x':
-            usdc_allowance = int(result['result'], 16) / 10**6
-            print(f"🔐 USDC Allowance: {usdc_allowance} USDC")
+        # Exact revert reason from replaying the tx at the parent block
+        replay = replay_transaction(rpc, tx, block_number)
+        if replay.reason is not None:
+            print(f"🎯 Revert Reason: {replay.reason.name} ({replay.reason.selector})")
+            print(f"   💡 {replay.reason.message}")
+            print()
+        elif replay.error:
+            print(f"❌ Replay failed: {replay.error}")
+            print()
         else:
-            print("🔐 USDC Allowance: 0 USDC")
-    print()
-    
-    # Analyze failure reasons
-    print("🔧 Contract-Level Failure Analysis:")
-    print("===================================")
-    print("🚨 Transaction failed during Router V6 execution")
-    print("⛽ Low gas usage (33,462) indicates early revert")
-    print()
-    print("💡 Most likely contract-level failures:")
-    print("   1. 🔐 Insufficient USDC allowance for Router V6")
-    print("   2. 💰 Insufficient USDC balance")
-    print("   3. ✍️  Invalid order signature")
-    print("   4. ⏰ Order expired or already filled")
-    print("   5. 🚫 Order validation failed (invalid parameters)")
-    print("   6. 🎯 Order conditions not met (price/slippage)")
-    print()
+            print(f"❓ Replay at block {replay.block:,} succeeded - failure depends on same-block state")
+            print()
+        print("💡 Most likely contract-level failures:")
+        print(f"   1. 🔐 Insufficient {token.symbol} allowance for Router V6")
+        print(f"   2. 💰 Insufficient {token.symbol} balance")
+        if signature is not None and signature.valid is False:
+            print(f"   3. ✍️  Invalid order signature ({signature.reason}) - confirmed offline")
+        elif signature is not None and signature.valid:
+            print("   3. ✍️  Order signature verified offline - not the cause")
+        else:
+            print("   3. ✍️  Invalid order signature")
+        if fill is not None and maker_traits.is_expired(int(header['timestamp'], 16)):
+            print("   4. ⏰ Order expired before this block - confirmed from MakerTraits")
+        else:
+            print("   4. ⏰ Order expired or already filled")
+        print("   5. 🚫 Order validation failed (invalid parameters)")
+        print("   6. 🎯 Order conditions not met (price/slippage)")
+        print()
     
-    # Check current market conditions
-    print("📊 Current market conditions check recommended:")
-    print("   - Verify order parameters match intended swap")
-    print("   - Check if limit price is achievable")
-    print("   - Ensure proper token approvals")
+        # Check current market conditions
+        print("📊 Current market conditions check recommended:")
+        print("   - Verify order parameters match intended swap")
+        print("   - Check if limit price is achievable")
+        print("   - Ensure proper token approvals")
     
-except Exception as e:
-    print(f"❌ Error during contract analysis: {e}")
+    except Exception as e:
+        print(f"❌ Error during contract analysis: {e}")
+
+    print()
+    print("💖 Generated with Claude Code 🤖❤️🎉")
+
 
-print()
-print("💖 Generated with Claude Code 🤖❤️🎉")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,124 +1,134 @@
 #!/usr/bin/env python3
 
-import requests
-import json
-from web3 import Web3
+from amounts import to_decimal
+from rpc_cache import BlockPinnedCache
+from rpc_client import make_client
+from router_v6_decoder import FILL_METHODS
+from revert_replay import replay_transaction
 
 # Transaction details
 FAILED_TX_HASH = "0x14a0cda5e295672191e9538d00cb54de934c247b22cee5ab63f3b8775e284d5e"
-RPC_URL = "https://polygon-bor-rpc.publicnode.com"
 
-print("🔍 1Limit Failed Transaction Debugger")
-print("====================================")
-print(f"🚨 Analyzing failed transaction: {FAILED_TX_HASH}")
-print(f"📊 Direction: USDC → WMATIC (reverse direction)")
-print(f"💰 Amount: 1 USDC")
-print(f"🎯 Limit Price: 3 WMATIC per USDC")
-print()
 
-# Initialize Web3
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+def main():
+    """🔍 Receipt, logs, trace and replay of one failed transaction"""
+    print("🔍 1Limit Failed Transaction Debugger")
+    print("====================================")
+    print(f"🚨 Analyzing failed transaction: {FAILED_TX_HASH}")
+    print(f"📊 Direction: USDC → WMATIC (reverse direction)")
+    print(f"💰 Amount: 1 USDC")
+    print(f"🎯 Limit Price: 3 WMATIC per USDC")
+    print()
+
+    # Initialize RPC client (endpoint pool with failover; mined transactions come from the on-disk cache)
+    rpc = make_client(cache=BlockPinnedCache())
 
-try:
-    # Get transaction receipt
-    print("📋 Step 1: Getting transaction receipt...")
-    receipt = w3.eth.get_transaction_receipt(FAILED_TX_HASH)
+    try:
+        # Get transaction receipt
+        print("📋 Step 1: Getting transaction receipt...")
+        receipt = rpc.call("eth_getTransactionReceipt", [FAILED_TX_HASH])
     
-    print(f"✅ Transaction found!")
-    print(f"📦 Block Number: {receipt['blockNumber']}")
-    print(f"⛽ Gas Used: {receipt['gasUsed']:,}")
-    print(f"💸 Gas Price: {receipt['effectiveGasPrice']:,} wei")
-    print(f"❌ Status: {'Success' if receipt['status'] == 1 else 'Failed'}")
-    print(f"📍 Contract: {receipt['to']}")
-    print()
+        print(f"✅ Transaction found!")
+        print(f"📦 Block Number: {int(receipt['blockNumber'], 16)}")
+        print(f"⛽ Gas Used: {int(receipt['gasUsed'], 16):,}")
+        print(f"💸 Gas Price: {int(receipt['effectiveGasPrice'], 16):,} wei")
+        print(f"❌ Status: {'Success' if int(receipt['status'], 16) == 1 else 'Failed'}")
+        print(f"📍 Contract: {receipt['to']}")
+        print()
     
-    # Get transaction details
-    print("📋 Step 2: Getting transaction details...")
-    tx = w3.eth.get_transaction(FAILED_TX_HASH)
+        # Get transaction details
+        print("📋 Step 2: Getting transaction details...")
+        tx = rpc.call("eth_getTransactionByHash", [FAILED_TX_HASH])
     
-    print(f"👤 From: {tx['from']}")
-    print(f"📍 To: {tx['to']}")
-    print(f"💰 Value: {w3.from_wei(tx['value'], 'ether')} ETH")
-    print(f"⛽ Gas Limit: {tx['gas']:,}")
-    print()
+        print(f"👤 From: {tx['from']}")
+        print(f"📍 To: {tx['to']}")
+        print(f"💰 Value: {to_decimal(int(tx['value'], 16), 18)} ETH")
+        print(f"⛽ Gas Limit: {int(tx['gas'], 16):,}")
+        print()
     
-    # Analyze transaction input data
-    print("📋 Step 3: Analyzing transaction input data...")
-    input_data = tx['input'].hex()
-    print(f"📝 Method ID: {input_data[:10]}")
+        # Analyze transaction input data
+        print("📋 Step 3: Analyzing transaction input data...")
+        input_data = tx['input']
+        print(f"📝 Method ID: {input_data[:10]}")
     
-    # Check if it's fillOrder method (0x9fda64bd)
-    if input_data[:10] == "0x9fda64bd":
-        print("✅ Method: fillOrder - Router V6 limit order execution")
-    else:
-        print(f"❓ Unknown method: {input_data[:10]}")
+        # Check if it's one of the Router V6 order-fill methods
+        fill_method = FILL_METHODS.get(bytes.fromhex(input_data[2:10]))
+        if fill_method:
+            print(f"✅ Method: {fill_method[0]} - Router V6 limit order execution")
+        else:
+            print(f"❓ Unknown method: {input_data[:10]}")
     
-    print(f"📏 Input Data Length: {len(input_data)} characters")
-    print()
+        print(f"📏 Input Data Length: {len(input_data)} characters")
+        print()
     
-    # Analyze logs for failure reasons
-    print("📋 Step 4: Analyzing event logs...")
-    if len(receipt['logs']) > 0:
-        print(f"📊 Found {len(receipt['logs'])} event logs:")
+        # Analyze logs for failure reasons
+        print("📋 Step 4: Analyzing event logs...")
+        if len(receipt['logs']) > 0:
+            print(f"📊 Found {len(receipt['logs'])} event logs:")
         
-        for i, log in enumerate(receipt['logs']):
-            print(f"  📝 Log {i+1}:")
-            print(f"    📍 Address: {log['address']}")
-            print(f"    📋 Topics: {len(log['topics'])} topics")
-            if len(log['topics']) > 0:
-                print(f"    🏷️  Event Signature: {log['topics'][0].hex()}")
-            print()
-    else:
-        print("❌ No event logs found")
+            for i, log in enumerate(receipt['logs']):
+                print(f"  📝 Log {i+1}:")
+                print(f"    📍 Address: {log['address']}")
+                print(f"    📋 Topics: {len(log['topics'])} topics")
+                if len(log['topics']) > 0:
+                    print(f"    🏷️  Event Signature: {log['topics'][0]}")
+                print()
+        else:
+            print("❌ No event logs found")
     
-    # Check for revert reason
-    print("📋 Step 5: Checking for revert reason...")
+        # Check for revert reason
+        print("📋 Step 5: Checking for revert reason...")
     
-    # Try to get transaction trace (may not work on all RPC providers)
-    try:
-        trace_response = requests.post(RPC_URL, json={
-            "jsonrpc": "2.0",
-            "method": "debug_traceTransaction",
-            "params": [FAILED_TX_HASH, {"tracer": "callTracer"}],
-            "id": 1
-        })
-        
-        if trace_response.status_code == 200:
-            trace_data = trace_response.json()
-            if 'result' in trace_data:
+        # Try to get transaction trace (may not work on all RPC providers)
+        try:
+            trace = rpc.call("debug_traceTransaction", [FAILED_TX_HASH, {"tracer": "callTracer"}])
+            if trace:
                 print("✅ Transaction trace available")
                 # Analyze trace for revert reason
-                if 'revertReason' in trace_data['result']:
-                    print(f"🚨 Revert Reason: {trace_data['result']['revertReason']}")
+                if 'revertReason' in trace:
+                    print(f"🚨 Revert Reason: {trace['revertReason']}")
                 else:
                     print("❓ No specific revert reason in trace")
             else:
                 print("❌ No trace result available")
+        except Exception as e:
+            print(f"❌ Could not get transaction trace: {e}")
+    
+        # Replay the tx as eth_call at the parent block (works without a trace-enabled node)
+        print("⏪ Replaying transaction at parent block...")
+        replay = replay_transaction(rpc, tx, int(receipt['blockNumber'], 16))
+        if replay.reason is not None:
+            print(f"🚨 Revert Reason: {replay.reason.name} ({replay.reason.selector})")
+            print(f"   💡 {replay.reason.message}")
+        elif replay.error:
+            print(f"❌ Replay failed: {replay.error}")
         else:
-            print("❌ Trace request failed")
-    except Exception as e:
-        print(f"❌ Could not get transaction trace: {e}")
+            print(f"❓ Replay at block {replay.block:,} succeeded - failure depends on same-block state")
     
-    print()
-    print("🔧 Analysis Summary:")
-    print("==================")
-    print("🚨 Transaction FAILED during execution")
-    print("💡 Possible reasons for USDC → WMATIC swap failure:")
-    print("   1. 🎯 Limit price too high (3 WMATIC per USDC)")
-    print("   2. 💰 Insufficient USDC balance or allowance")
-    print("   3. 📊 Market conditions - price didn't reach limit")
-    print("   4. ⛽ Gas limit too low for complex swap")
-    print("   5. 🔒 Token approval issues")
-    print("   6. 🏗️  Router V6 contract state issues")
-    print()
-    print("🔍 Next steps:")
-    print("   1. Check USDC balance and allowance")
-    print("   2. Verify limit price is reasonable")
-    print("   3. Check current USDC/WMATIC market price")
-    print("   4. Review Router V6 order parameters")
+        print()
+        print("🔧 Analysis Summary:")
+        print("==================")
+        print("🚨 Transaction FAILED during execution")
+        print("💡 Possible reasons for USDC → WMATIC swap failure:")
+        print("   1. 🎯 Limit price too high (3 WMATIC per USDC)")
+        print("   2. 💰 Insufficient USDC balance or allowance")
+        print("   3. 📊 Market conditions - price didn't reach limit")
+        print("   4. ⛽ Gas limit too low for complex swap")
+        print("   5. 🔒 Token approval issues")
+        print("   6. 🏗️  Router V6 contract state issues")
+        print()
+        print("🔍 Next steps:")
+        print("   1. Check USDC balance and allowance")
+        print("   2. Verify limit price is reasonable")
+        print("   3. Check current USDC/WMATIC market price")
+        print("   4. Review Router V6 order parameters")
     
-except Exception as e:
-    print(f"❌ Error analyzing transaction: {e}")
+    except Exception as e:
+        print(f"❌ Error analyzing transaction: {e}")
+
+    print()
+    print("💖 Generated with Claude Code 🤖❤️🎉")
+
 
-print()
-print("💖 Generated with Claude Code 🤖❤️🎉")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+🧰 Shared EVM constants and ABI word helpers
+=============================================
+
+The Router V6 address, 32-byte ABI words, log topics and the optional NumPy
+import used across the indexers, decoders and verifiers. Everything here is
+stdlib-only and imports nothing else from the scripts.
+"""
+
+from typing import Any
+
+# 1inch Aggregation Router V6, same address on every chain
+ROUTER_V6 = "0x111111125421cA6dc452d289314280a0f8842A65"
+
+
+def word(value: int) -> bytes:
+    """🧱 uint256 → 32-byte big-endian ABI word"""
+    return value.to_bytes(32, "big")
+
+
+def address_word(address: str) -> bytes:
+    """🧱 Address → left-padded 32-byte ABI word"""
+    return bytes(12) + bytes.fromhex(address[2:] if address.startswith("0x") else address)
+
+
+def read_word(data: bytes, index: int) -> int:
+    """🔢 ``index``-th 32-byte word of ``data`` as a uint256"""
+    return int.from_bytes(data[32 * index:32 * index + 32], "big")
+
+
+def address_topic(address: str) -> str:
+    """🏷️ Address → indexed log topic (lowercase, left-padded)"""
+    return "0x" + address[2:].lower().rjust(64, "0")
+
+
+def topic_address(topic: str) -> str:
+    """🏷️ Indexed log topic → lowercase address"""
+    return "0x" + topic[-40:].lower()
+
+
+def hex_bytes(value: str, width: int) -> bytes:
+    """📏 Hex string → exactly ``width`` bytes (keeps the low bytes, left-pads with zeros)"""
+    raw = bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    return raw[-width:].rjust(width, b"\0")
+
+
+def optional_numpy() -> Any:
+    """🧮 The ``numpy`` module, or None when it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+🚢 Async multi-wallet fleet scanner
+====================================
+
+Scans many maker wallets concurrently on top of ``PolygonWalletChecker``.
+Wallet files are validated with the same rules as ``load_wallet``, every
+wallet is queried with one batched JSON-RPC round-trip pinned to the head
+block of its endpoint (pinned once per endpoint, so a lagging node is never
+asked for a block it does not have yet), and results stream out as NDJSON
+(one JSON object per line) as soon as each wallet finishes. Endpoints that
+cannot report a head are left out of the rotation.
+
+Concurrency is bounded by a semaphore, and the blocking RPC calls run on a
+thread pool of the same size (the default executor behind
+``asyncio.to_thread`` stops at min(32, cpu + 4) threads, which would quietly
+cap ``--concurrency``). Every endpoint gets its own
+adaptive token-bucket rate limit (see rate_limit.py), so a large fleet does
+not get us banned; a wallet whose calls stay throttled after the retry
+budget is spent is reported as an error, never as an empty wallet.
+
+Usage:
+    python3 scripts/check_wallet_transactions.py fleet wallets/
+    python3 scripts/check_wallet_transactions.py fleet "wallets/*.json" --concurrency 32 --rate 20
+"""
+
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, TextIO, Tuple
+
+from amounts import format_units
+from check_wallet_transactions import PolygonWalletChecker
+from rate_limit import RateLimitedTransport
+from single_flight import get_single_flight
+
+
+def discover_wallet_files(target: str) -> List[str]:
+    """📁 Expand a directory or glob pattern into a sorted list of wallet JSON files"""
+    if os.path.isdir(target):
+        pattern = os.path.join(target, "*.json")
+    else:
+        pattern = target
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+
+def read_wallet_file(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """🔐 Load and validate one wallet file without logging key material
+
+    Returns ``(address, error)``; exactly one of them is set.
+    """
+    try:
+        with open(path, 'r') as f:
+            wallet_data = json.load(f)
+    except json.JSONDecodeError as e:
+        return None, f"Failed to parse wallet JSON: {e}"
+    except OSError as e:
+        return None, f"Failed to load wallet: {e}"
+
+    error = PolygonWalletChecker.validate_wallet_data(wallet_data)
+    if error:
+        return None, error
+    return wallet_data['address'], None
+
+
+class FleetScanner:
+    """🚢 Bounded-concurrency wallet sweep across one or more RPC endpoints"""
+
+    def __init__(self, rpc_urls: List[str], concurrency: int = 16, rate_per_endpoint: float = 10.0):
+        if not rpc_urls:
+            raise ValueError("At least one RPC endpoint is required")
+        # One limiter for the scan: a bucket per endpoint, a single retry budget
+        self.limiter = RateLimitedTransport(rate=rate_per_endpoint)
+        self.checkers = [PolygonWalletChecker(url, transport=self.limiter) for url in rpc_urls]
+        self.concurrency = concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def _rpc_batch(self, endpoint_index: int, calls: List[Tuple[str, list]]) -> List[Optional[Any]]:
+        checker = self.checkers[endpoint_index]
+        # The pooled transport (and its rate limiter) blocks - keep the event loop free meanwhile
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, checker.json_rpc_batch, calls)
+
+    async def _pin_block(self, endpoint_index: int) -> Optional[int]:
+        checker = self.checkers[endpoint_index]
+        (block_hex,) = await self._rpc_batch(endpoint_index, [("eth_blockNumber", [])])
+        return checker.parse_quantity(block_hex, "block number")
+
+    async def _scan_wallet(self, path: str, endpoint_index: int, block_tag: str,
+                           semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"wallet_file": path, "address": None, "block": int(block_tag, 16)}
+        address, error = read_wallet_file(path)
+        if error:
+            record["error"] = error
+            return record
+        record["address"] = address
+
+        checker = self.checkers[endpoint_index]
+        started = time.perf_counter()
+        async with semaphore:
+            nonce_hex, balance_hex = await self._rpc_batch(endpoint_index, [
+                ("eth_getTransactionCount", [address, block_tag]),
+                ("eth_getBalance", [address, block_tag]),
+            ])
+        record["rpc"] = checker.rpc_url
+        record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        nonce = checker.parse_quantity(nonce_hex, "transaction count")
+        balance_wei = checker.parse_quantity(balance_hex, "balance")
+        if nonce is None or balance_wei is None:
+            record["error"] = "RPC call failed"
+            return record
+
+        record.update({
+            "nonce": nonce,
+            "balance_wei": str(balance_wei),
+            "balance_matic": format_units(balance_wei, 18, 18),
+            "active": nonce > 0 or balance_wei > 0,
+        })
+        return record
+
+    async def scan(self, paths: List[str]) -> AsyncIterator[Dict[str, Any]]:
+        """🔍 Yield one record per wallet file, in completion order"""
+        # One worker per semaphore slot, so every admitted wallet gets a thread
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="fleet-rpc")
+        tasks: List[asyncio.Task] = []
+        try:
+            blocks = await asyncio.gather(*(self._pin_block(i) for i in range(len(self.checkers))))
+            pinned = [(i, hex(block)) for i, block in enumerate(blocks) if block is not None]
+            if not pinned:
+                raise ConnectionError("Failed to fetch latest block from any Polygon RPC endpoint")
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            tasks = [
+                asyncio.create_task(self._scan_wallet(path, *pinned[i % len(pinned)], semaphore))
+                for i, path in enumerate(paths)
+            ]
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_fleet_scan(target: str, rpc_urls: List[str], concurrency: int,
+                         rate: float, out: TextIO) -> int:
+    """🚀 Scan every wallet under ``target`` and write NDJSON records to ``out``
+
+    Returns the number of wallets that could not be scanned.
+    """
+    paths = discover_wallet_files(target)
+    if not paths:
+        print(f"❌ No wallet files found for: {target}", file=sys.stderr)
+        return 1
+
+    print(f"🚢 Scanning {len(paths)} wallets across {len(rpc_urls)} endpoint(s)...", file=sys.stderr)
+    scanner = FleetScanner(rpc_urls, concurrency=concurrency, rate_per_endpoint=rate)
+    started = time.perf_counter()
+    failures = 0
+    async for record in scanner.scan(paths):
+        if "error" in record:
+            failures += 1
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Scanned {len(paths)} wallets in {elapsed:.2f}s ({failures} failed)", file=sys.stderr)
+    if scanner.limiter.budget.used:
+        print(f"⏳ Throttled: {scanner.limiter.budget.used} retries used", file=sys.stderr)
+    shared = get_single_flight().stats()
+    if shared["coalesced"] or shared["ttl_hits"]:
+        print(f"🛬 Shared reads: {shared['coalesced']} coalesced, {shared['ttl_hits']} from the latest cache "
+              f"({shared['requests']} sent)", file=sys.stderr)
+    return failures
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+📡 Streaming new-head monitor for maker wallets and pending fills
+==================================================================
+
+Long-running counterpart to ``check_wallet_activity``. Subscribes to new
+heads over WebSocket (``eth_subscribe`` ``newHeads``) and falls back to
+HTTP polling when no WebSocket endpoint is reachable (or the
+``websockets`` package is not installed).
+
+For every new block the monitor works out which tracked wallets the block
+touched - as sender or recipient of a transaction, or as either side of an
+ERC-20 ``Transfer`` - and refreshes the nonce and MATIC balance of those
+wallets only. Watched transaction hashes get their receipt fetched in the
+block that mines them (those already mined before start-up are reported
+from a receipt check against the starting head). The output is a stream of
+change events, so watching many wallets costs work per change, not per
+wallet per block.
+
+The monitor remembers the hash of recent heights. When a new block does
+not build on the remembered parent - or the same height comes back with a
+different hash - it walks back by ``parentHash`` to the fork point,
+returns watched transactions mined on the abandoned branch to pending,
+rescans the replaced blocks and re-reads every wallet.
+
+Events (one dict each):
+    nonce / balance   {"event", "block", "address", "old", "new"}
+    token_transfer    {"event", "block", "address", "direction", "token", "counterparty", "amount", "tx_hash"}
+    receipt           {"event", "block", "tx_hash", "status", "gas_used"}
+    receipt_reorged   {"event", "block", "tx_hash", "old_block"}
+    reorg             {"event", "block", "fork", "expected_parent", "parent"}
+
+Native MATIC received through internal calls emits no log and is not seen
+until the wallet's next transaction or transfer.
+
+Usage:
+    python3 scripts/check_wallet_transactions.py monitor wallets/
+    python3 scripts/check_wallet_transactions.py monitor wallet.json --watch-tx 0xabc... --interval 2
+
+Requirements:
+    pip install requests
+    pip install websockets   # optional, enables eth_subscribe
+"""
+
+import asyncio
+import json
+import os
+import sys
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from evm import address_topic, topic_address
+from rpc_client import RpcClient, RpcError
+from rpc_types import Block, FullBlock, Log, Receipt, decode_result
+from transport import TransportError
+
+DEFAULT_WS_URL = os.environ.get("ONELIMIT_WS_URL", "wss://polygon-bor-rpc.publicnode.com")
+
+# Polygon produces a block roughly every two seconds
+DEFAULT_POLL_INTERVAL = 2.0
+# Never replay more than this many missed blocks after a stall
+MAX_CATCH_UP_BLOCKS = 100
+# Canonical hashes kept for reorg detection
+REORG_MEMORY_BLOCKS = 64
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"  # Transfer(address,address,uint256)
+
+
+async def websocket_heads(ws_url: str) -> AsyncIterator[Block]:
+    """🔌 Yield block headers pushed by ``eth_subscribe("newHeads")``"""
+    import websockets
+
+    async with websockets.connect(ws_url, ping_interval=20, max_size=None) as ws:
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}))
+        reply = json.loads(await ws.recv())
+        if "error" in reply:
+            raise ConnectionError(f"eth_subscribe rejected: {reply['error']}")
+        async for message in ws:
+            header = json.loads(message).get("params", {}).get("result")
+            if header:
+                yield decode_result(header, Block)
+
+
+async def polling_heads(rpc: RpcClient, interval: float = DEFAULT_POLL_INTERVAL) -> AsyncIterator[Block]:
+    """🔁 Yield the latest block header whenever it changes"""
+    last_hash = None
+    while True:
+        try:
+            header = await asyncio.to_thread(rpc.call, "eth_getBlockByNumber", ["latest", False], Block)
+        except (RpcError, TransportError) as e:
+            print(f"⚠️ Head poll failed: {e}", file=sys.stderr)
+            header = None
+        if header is not None and header.hash != last_hash:
+            last_hash = header.hash
+            yield header
+        await asyncio.sleep(interval)
+
+
+async def head_stream(rpc: RpcClient, ws_url: Optional[str] = DEFAULT_WS_URL,
+                      interval: float = DEFAULT_POLL_INTERVAL) -> AsyncIterator[Block]:
+    """📡 New heads over WebSocket, falling back to HTTP polling"""
+    if ws_url:
+        try:
+            async for header in websocket_heads(ws_url):
+                yield header
+        except ImportError:
+            print("⚠️ websockets not installed - polling for new heads", file=sys.stderr)
+        except (OSError, ConnectionError, ValueError, asyncio.TimeoutError) as e:
+            print(f"⚠️ WebSocket unavailable ({e}) - polling for new heads", file=sys.stderr)
+        except Exception as e:  # websockets' own ConnectionClosed etc.
+            print(f"⚠️ WebSocket closed ({type(e).__name__}: {e}) - polling for new heads", file=sys.stderr)
+    async for header in polling_heads(rpc, interval):
+        yield header
+
+
+class HeadMonitor:
+    """📡 Turn new blocks into per-wallet change events"""
+
+    def __init__(self, rpc: RpcClient, wallets: Iterable[str], watch_txs: Iterable[str] = ()):
+        self.rpc = rpc
+        self.wallets: Dict[str, str] = {wallet.lower(): wallet for wallet in wallets}
+        self.watched: Dict[str, str] = {tx_hash.lower(): tx_hash for tx_hash in watch_txs}
+        self.pending: Set[str] = set(self.watched)
+        self.mined: Dict[str, int] = {}  # watched tx hash -> block its receipt came from
+        self.state: Dict[str, Dict[str, int]] = {}
+        self.canonical: Dict[int, str] = {}
+        self.last_block: Optional[int] = None
+
+    def _refresh(self, addresses: Iterable[str], block: int) -> List[Dict[str, Any]]:
+        """🔄 Re-read nonce and balance for ``addresses`` and diff against known state"""
+        addresses = sorted(addresses)
+        if not addresses:
+            return []
+        tag = hex(block)
+        calls = []
+        for address in addresses:
+            calls.append(("eth_getTransactionCount", [address, tag]))
+            calls.append(("eth_getBalance", [address, tag]))
+        results = self.rpc.batch(calls)
+
+        events = []
+        for i, address in enumerate(addresses):
+            for field, raw in (("nonce", results[2 * i]), ("balance", results[2 * i + 1])):
+                if raw is None or isinstance(raw, RpcError):
+                    continue  # unknown is not zero - keep the last known value
+                value = int(raw, 16)
+                known = self.state.setdefault(address, {})
+                old = known.get(field)
+                known[field] = value
+                if old is not None and old != value:
+                    events.append({"event": field, "block": block, "address": self.wallets[address],
+                                   "old": str(old), "new": str(value)})
+        return events
+
+    def _receipts(self, tx_hashes: List[str]) -> List[Dict[str, Any]]:
+        """🧾 Receipt events for the watched ``tx_hashes`` that have one; the rest stay pending"""
+        if not tx_hashes:
+            return []
+        receipts = self.rpc.batch([("eth_getTransactionReceipt", [tx_hash], Receipt) for tx_hash in tx_hashes])
+        events = []
+        for tx_hash, receipt in zip(tx_hashes, receipts):
+            if receipt is None or isinstance(receipt, RpcError):
+                continue  # try again on the next block
+            self.pending.discard(tx_hash.lower())
+            self.mined[tx_hash.lower()] = int(receipt.block_number)
+            events.append({"event": "receipt", "block": int(receipt.block_number), "tx_hash": tx_hash,
+                           "status": "success" if receipt.succeeded else "failed",
+                           "gas_used": int(receipt.gas_used)})
+        return events
+
+    def baseline(self, block: int, block_hash: str) -> List[Dict[str, Any]]:
+        """📸 Record the starting nonce/balance of every wallet
+
+        Emits only the receipts of watched transactions mined before start-up.
+        """
+        self._refresh(self.wallets, block)
+        events = self._receipts([self.watched[tx_hash] for tx_hash in sorted(self.pending)])
+        self.canonical[block] = block_hash
+        self.last_block = block
+        return events
+
+    def _transfer_logs(self, block_hash: str) -> List[Log]:
+        topics = [address_topic(wallet) for wallet in self.wallets]
+        outgoing, incoming = self.rpc.batch([
+            ("eth_getLogs", [{"blockHash": block_hash, "topics": [TRANSFER_TOPIC, topics]}], List[Log]),
+            ("eth_getLogs", [{"blockHash": block_hash, "topics": [TRANSFER_TOPIC, None, topics]}], List[Log]),
+        ])
+        logs = {}
+        for result in (outgoing, incoming):
+            if isinstance(result, RpcError):
+                raise result
+            for log in result or []:
+                logs[(log.transaction_hash, log.log_index)] = log
+        return list(logs.values())
+
+    def _block(self, number: int) -> FullBlock:
+        block = self.rpc.call("eth_getBlockByNumber", [hex(number), True], FullBlock)
+        if block is None:
+            raise ValueError(f"Block {number} not available yet")
+        return block
+
+    def _scan(self, block: FullBlock, touched: Set[str]) -> List[Dict[str, Any]]:
+        """🔍 Transfer and receipt events of one canonical block, adding the wallets it touched to ``touched``"""
+        number = block.number
+        events: List[Dict[str, Any]] = []
+        mined = []
+        for tx in block.transactions:
+            for party in (tx.sender, tx.to):
+                if party and party.lower() in self.wallets:
+                    touched.add(party.lower())
+            if tx.hash.lower() in self.pending:
+                mined.append(tx.hash)
+
+        for log in self._transfer_logs(block.hash) if self.wallets else []:
+            if len(log.topics) != 3:
+                continue  # ERC-721 Transfer
+            sender, recipient = topic_address(log.topics[1]), topic_address(log.topics[2])
+            for address, direction, counterparty in ((sender, "out", recipient), (recipient, "in", sender)):
+                if address in self.wallets:
+                    touched.add(address)
+                    events.append({
+                        "event": "token_transfer", "block": number, "address": self.wallets[address],
+                        "direction": direction, "token": log.address, "counterparty": counterparty,
+                        "amount": str(int(log.data, 16) if log.data not in ("0x", "") else 0),
+                        "tx_hash": log.transaction_hash,
+                    })
+
+        events.extend(self._receipts(mined))
+        self.canonical[number] = block.hash
+        return events
+
+    def _find_fork(self, block: FullBlock) -> int:
+        """🔀 Lowest height the new branch replaced, following ``parentHash`` back to a remembered hash"""
+        height, parent_hash = block.number - 1, block.parent_hash
+        while height in self.canonical and self.canonical[height] != parent_hash:
+            parent = self.rpc.call("eth_getBlockByNumber", [hex(height), False], Block)
+            if parent is None or parent.hash != parent_hash:
+                raise ValueError(f"Block {height} changed again while walking back the reorg")
+            parent_hash = parent.parent_hash
+            height -= 1
+        return height + 1
+
+    def _rollback(self, fork: int, number: int) -> List[Dict[str, Any]]:
+        """⏪ Forget heights from ``fork`` up and return watched txs mined there to pending"""
+        for height in [h for h in self.canonical if h >= fork]:
+            del self.canonical[height]
+        events = []
+        for tx_hash, block in list(self.mined.items()):
+            if block >= fork:
+                del self.mined[tx_hash]
+                self.pending.add(tx_hash)
+                events.append({"event": "receipt_reorged", "block": number, "tx_hash": self.watched[tx_hash],
+                               "old_block": block})
+        return events
+
+    def process_block(self, number: int) -> List[Dict[str, Any]]:
+        """🧱 Events caused by block ``number`` (and by the blocks it replaced, after a reorg)"""
+        block = self._block(number)
+        events: List[Dict[str, Any]] = []
+        touched: Set[str] = set()
+        known, parent = self.canonical.get(number), self.canonical.get(number - 1)
+        if (known is not None and known != block.hash) or (parent is not None and block.parent_hash != parent):
+            # The chain we followed was replaced - rescan the new branch and re-read every wallet
+            fork = self._find_fork(block)
+            events.append({"event": "reorg", "block": number, "fork": fork,
+                           "expected_parent": parent, "parent": block.parent_hash})
+            events.extend(self._rollback(fork, number))
+            touched.update(self.wallets)
+            for height in range(fork, number):
+                events.extend(self._scan(self._block(height), touched))
+            # Txs returned to pending may sit in this block too
+            block = self._block(number)
+
+        events.extend(self._scan(block, touched))
+        events.extend(self._refresh(touched, number))
+        self.last_block = number
+
+        keep_from = number - REORG_MEMORY_BLOCKS
+        for height in [h for h in self.canonical if h < keep_from]:
+            del self.canonical[height]
+        for tx_hash in [h for h, mined_in in self.mined.items() if mined_in < keep_from]:
+            del self.mined[tx_hash]
+        return events
+
+    async def run(self, heads: AsyncIterator[Block]) -> AsyncIterator[Dict[str, Any]]:
+        """🚀 Consume headers and yield change events, catching up on missed blocks"""
+        async for header in heads:
+            head = header.number
+            if self.last_block is None:
+                try:
+                    events = await asyncio.to_thread(self.baseline, head, header.hash)
+                except (RpcError, TransportError, ValueError) as e:
+                    print(f"⚠️ Baseline at block {head}: {e} - will retry with the next head", file=sys.stderr)
+                    continue
+                for event in events:
+                    yield event
+                continue
+            if head <= self.last_block and self.canonical.get(head) == header.hash:
+                continue
+            # Reorg to an equal or lower height re-processes the new head itself
+            start = max(self.last_block + 1, head - MAX_CATCH_UP_BLOCKS + 1) if head > self.last_block else head
+            for number in range(start, head + 1):
+                try:
+                    events = await asyncio.to_thread(self.process_block, number)
+                except (RpcError, TransportError, ValueError) as e:
+                    print(f"⚠️ Block {number}: {e} - will retry with the next head", file=sys.stderr)
+                    break
+                for event in events:
+                    yield event
+
+
+async def run_monitor(rpc: RpcClient, wallets: List[str], watch_txs: List[str], ws_url: Optional[str],
+                      interval: float, out) -> None:
+    """🖨️ Stream change events for ``wallets`` to ``out`` as NDJSON until interrupted"""
+    monitor = HeadMonitor(rpc, wallets, watch_txs)
+    print(f"📡 Monitoring {len(wallets)} wallet(s) and {len(watch_txs)} pending tx(s)...", file=sys.stderr)
+    async for event in monitor.run(head_stream(rpc, ws_url, interval)):
+        out.write(json.dumps(event) + "\n")
+        out.flush()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+🏷️ MakerTraits / TakerTraits codec with bulk expiry and nonce audits
+=====================================================================
+
+Decodes and encodes the Router V6 (1inch Limit Order Protocol v4) traits
+words, one at a time or over whole arrays of orders.
+
+The router reads MakerTraits with this layout:
+
+    bits   0-79   low 10 bytes of the allowed sender (0 = anyone)
+    bits  80-119  expiration timestamp (0 = never expires)
+    bits 120-159  nonce, or epoch when the epoch manager is used
+    bits 160-199  series (epoch manager only)
+    bit  247 UNWRAP_WETH       bit 248 USE_PERMIT2
+    bit  249 HAS_EXTENSION     bit 250 NEED_CHECK_EPOCH_MANAGER
+    bit  251 POST_INTERACTION  bit 252 PRE_INTERACTION
+    bit  254 ALLOW_MULTIPLE_FILLS   bit 255 NO_PARTIAL_FILLS
+
+MakerTraitsCalculator.swift packs its expiry into bits 160-192, which is the
+series field. The router therefore never sees the app's expiry. Its
+"partial fills" and "multiple fills" flags (bits 80/81) land in the low bits
+of the expiration, so an order built with them expires at timestamp 1-3 and
+reverts immediately. ``app_expiry`` exposes the app's field so audits can
+flag both problems.
+
+``TraitsArray`` splits every word into four uint64 limbs once and extracts
+every field with NumPy shifts and masks. Expiry and nonce checks over
+thousands of failed orders then run as array operations. Without NumPy it
+falls back to per-row decoding with the same results.
+
+Usage:
+    python3 scripts/maker_traits.py 0x4000...0000 --at 1753598416
+    python3 scripts/maker_traits.py --report postmortem.ndjson
+
+Requirements:
+    pip install numpy   # optional, vectorized TraitsArray
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from evm import optional_numpy
+from router_v6_decoder import (AMOUNT_MASK, ARGS_EXTENSION_LENGTH_OFFSET, ARGS_HAS_TARGET,
+                               ARGS_INTERACTION_LENGTH_OFFSET, ARGS_LENGTH_MASK, MAKER_AMOUNT_FLAG,
+                               SKIP_ORDER_PERMIT_FLAG, UNWRAP_WETH_FLAG, USE_PERMIT2_FLAG, TakerTraits)
+
+# MakerTraits flag bits (LOP v4)
+NO_PARTIAL_FILLS_BIT = 255
+ALLOW_MULTIPLE_FILLS_BIT = 254
+PRE_INTERACTION_BIT = 252
+POST_INTERACTION_BIT = 251
+NEED_CHECK_EPOCH_MANAGER_BIT = 250
+HAS_EXTENSION_BIT = 249
+USE_PERMIT2_BIT = 248
+UNWRAP_WETH_BIT = 247
+
+ALLOWED_SENDER_MASK = (1 << 80) - 1
+EXPIRATION_OFFSET = 80
+NONCE_OFFSET = 120
+SERIES_OFFSET = 160
+UINT40_MASK = (1 << 40) - 1
+
+# Where MakerTraitsCalculator.swift writes its expiry (inside the series field)
+APP_EXPIRY_OFFSET = 160
+APP_EXPIRY_MASK = (1 << 32) - 1
+
+MAKER_FLAGS = {
+    "no_partial_fills": NO_PARTIAL_FILLS_BIT,
+    "allow_multiple_fills": ALLOW_MULTIPLE_FILLS_BIT,
+    "pre_interaction": PRE_INTERACTION_BIT,
+    "post_interaction": POST_INTERACTION_BIT,
+    "need_check_epoch_manager": NEED_CHECK_EPOCH_MANAGER_BIT,
+    "has_extension": HAS_EXTENSION_BIT,
+    "use_permit2": USE_PERMIT2_BIT,
+    "unwrap_weth": UNWRAP_WETH_BIT,
+}
+
+# Audit findings
+EXPIRED = "order_expired"
+APP_EXPIRY_IGNORED = "app_expiry_ignored"
+APP_EXPIRY_PASSED = "app_expiry_passed"
+FLAG_IN_EXPIRATION = "flag_bits_in_expiration"
+EPOCH_WITHOUT_MULTIPLE_FILLS = "epoch_manager_needs_multiple_fills"
+DUPLICATE_NONCE = "duplicate_nonce"
+AUDIT_ORDER = [EXPIRED, FLAG_IN_EXPIRATION, APP_EXPIRY_IGNORED, APP_EXPIRY_PASSED, EPOCH_WITHOUT_MULTIPLE_FILLS]
+
+
+class MakerTraits(NamedTuple):
+    """🏷️ Decoded MakerTraits word"""
+    raw: int
+    allowed_sender: int         # low 80 bits of the address, 0 = any taker
+    expiration: int             # unix seconds, 0 = never
+    nonce_or_epoch: int
+    series: int
+    no_partial_fills: bool
+    allow_multiple_fills: bool
+    pre_interaction: bool
+    post_interaction: bool
+    need_check_epoch_manager: bool
+    has_extension: bool
+    use_permit2: bool
+    unwrap_weth: bool
+
+    @classmethod
+    def from_int(cls, value: int) -> "MakerTraits":
+        return cls(
+            raw=value,
+            allowed_sender=value & ALLOWED_SENDER_MASK,
+            expiration=(value >> EXPIRATION_OFFSET) & UINT40_MASK,
+            nonce_or_epoch=(value >> NONCE_OFFSET) & UINT40_MASK,
+            series=(value >> SERIES_OFFSET) & UINT40_MASK,
+            **{name: bool(value >> bit & 1) for name, bit in MAKER_FLAGS.items()},
+        )
+
+    @property
+    def app_expiry(self) -> int:
+        """📱 Expiry as MakerTraitsCalculator.swift wrote it (bits 160-192)"""
+        return (self.raw >> APP_EXPIRY_OFFSET) & APP_EXPIRY_MASK
+
+    @property
+    def uses_bit_invalidator(self) -> bool:
+        """🧮 Single-fill orders are invalidated through the maker's nonce bitmap"""
+        return not self.allow_multiple_fills
+
+    def is_expired(self, timestamp: int) -> bool:
+        """⏰ Router rule: a non-zero expiration strictly before the block timestamp"""
+        return self.expiration != 0 and self.expiration < timestamp
+
+    def audit(self, timestamp: Optional[int] = None) -> List[str]:
+        """🔍 Findings for this order at ``timestamp`` (layout problems only when None)"""
+        findings = []
+        if timestamp is not None and self.is_expired(timestamp):
+            findings.append(EXPIRED)
+        if 0 < self.expiration < 4:
+            findings.append(FLAG_IN_EXPIRATION)
+        if self.expiration == 0 and self.app_expiry and not self.need_check_epoch_manager:
+            findings.append(APP_EXPIRY_IGNORED)
+            if timestamp is not None and self.app_expiry < timestamp:
+                findings.append(APP_EXPIRY_PASSED)
+        if self.need_check_epoch_manager and not self.allow_multiple_fills:
+            findings.append(EPOCH_WITHOUT_MULTIPLE_FILLS)
+        return findings
+
+
+def encode_maker_traits(expiration: int = 0, nonce_or_epoch: int = 0, series: int = 0,
+                        allowed_sender: Optional[str] = None, **flags: bool) -> int:
+    """🧱 Build a MakerTraits word the router understands (flags by ``MAKER_FLAGS`` name)"""
+    for name, value in (("expiration", expiration), ("nonce_or_epoch", nonce_or_epoch), ("series", series)):
+        if not 0 <= value <= UINT40_MASK:
+            raise ValueError(f"{name} {value} does not fit in 40 bits")
+    traits = (expiration << EXPIRATION_OFFSET) | (nonce_or_epoch << NONCE_OFFSET) | (series << SERIES_OFFSET)
+    if allowed_sender:
+        traits |= int(allowed_sender, 16) & ALLOWED_SENDER_MASK
+    for name, enabled in flags.items():
+        if name not in MAKER_FLAGS:
+            raise ValueError(f"unknown MakerTraits flag {name}")
+        if enabled:
+            traits |= 1 << MAKER_FLAGS[name]
+    return traits
+
+
+def encode_app_maker_traits(nonce: int, expiry: int, allow_partial_fills: bool = False,
+                            allow_multiple_fills: bool = False, has_extension: bool = False,
+                            has_post_interaction: bool = False, use_alternative_partial_fills_bit: bool = False) -> int:
+    """📱 Reproduce MakerTraitsCalculator.calculateMakerTraitsV6 bit for bit"""
+    traits = (nonce << NONCE_OFFSET) | ((expiry & APP_EXPIRY_MASK) << APP_EXPIRY_OFFSET)
+    if allow_partial_fills:
+        traits |= 1 << (253 if use_alternative_partial_fills_bit else 80)
+    if allow_multiple_fills:
+        traits |= 1 << 81
+    if has_extension:
+        traits |= 1 << HAS_EXTENSION_BIT
+    if has_post_interaction:
+        traits |= 1 << POST_INTERACTION_BIT
+    return traits
+
+
+def encode_taker_traits(threshold: int = 0, maker_amount: bool = False, unwrap_weth: bool = False,
+                        skip_order_permit: bool = False, use_permit2: bool = False, args_has_target: bool = False,
+                        extension_length: int = 0, interaction_length: int = 0) -> int:
+    """🧱 Inverse of ``TakerTraits.from_int``"""
+    if not 0 <= threshold <= AMOUNT_MASK:
+        raise ValueError("threshold does not fit in 185 bits")
+    if not (0 <= extension_length <= ARGS_LENGTH_MASK and 0 <= interaction_length <= ARGS_LENGTH_MASK):
+        raise ValueError("args lengths must fit in 24 bits")
+    traits = threshold
+    traits |= extension_length << ARGS_EXTENSION_LENGTH_OFFSET
+    traits |= interaction_length << ARGS_INTERACTION_LENGTH_OFFSET
+    for enabled, flag in ((maker_amount, MAKER_AMOUNT_FLAG), (unwrap_weth, UNWRAP_WETH_FLAG),
+                          (skip_order_permit, SKIP_ORDER_PERMIT_FLAG), (use_permit2, USE_PERMIT2_FLAG),
+                          (args_has_target, ARGS_HAS_TARGET)):
+        if enabled:
+            traits |= flag
+    return traits
+
+
+def decode_taker_traits(value: int) -> TakerTraits:
+    """🏷️ Decoded TakerTraits word (same structure the calldata decoder returns)"""
+    return TakerTraits.from_int(value)
+
+
+class TraitsArray:
+    """📊 Column-wise MakerTraits fields for many orders at once
+
+    Every field is an int64 array (lists without NumPy). Flags are bool
+    arrays keyed by ``MAKER_FLAGS`` name in ``flags``.
+    """
+
+    def __init__(self, traits: Sequence[int]):
+        self.raw = list(traits)
+        np = optional_numpy()
+        if np is None or not self.raw:
+            decoded = [MakerTraits.from_int(value) for value in self.raw]
+            self.expiration = [t.expiration for t in decoded]
+            self.nonce_or_epoch = [t.nonce_or_epoch for t in decoded]
+            self.series = [t.series for t in decoded]
+            self.app_expiry = [t.app_expiry for t in decoded]
+            self.has_allowed_sender = [t.allowed_sender != 0 for t in decoded]
+            self.flags = {name: [getattr(t, name) for t in decoded] for name in MAKER_FLAGS}
+            return
+
+        # limbs[:, 0] holds bits 192-255, limbs[:, 3] bits 0-63
+        limbs = np.frombuffer(b"".join(value.to_bytes(32, "big") for value in self.raw),
+                              dtype=">u8").reshape(-1, 4).astype(np.uint64)
+        high, upper, lower, low = limbs[:, 0], limbs[:, 1], limbs[:, 2], limbs[:, 3]
+        mask40 = np.uint64(UINT40_MASK)
+        self.expiration = ((lower >> np.uint64(16)) & mask40).astype(np.int64)
+        self.nonce_or_epoch = ((lower >> np.uint64(56)) | ((upper & np.uint64(0xFFFFFFFF)) << np.uint64(8))) \
+            .astype(np.int64)
+        self.series = ((upper >> np.uint64(32)) | ((high & np.uint64(0xFF)) << np.uint64(32))).astype(np.int64)
+        self.app_expiry = (upper >> np.uint64(32)).astype(np.int64)
+        self.has_allowed_sender = (low != 0) | ((lower & np.uint64(0xFFFF)) != 0)
+        self.flags = {name: ((high >> np.uint64(bit - 192)) & np.uint64(1)).astype(bool)
+                      for name, bit in MAKER_FLAGS.items()}
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def expired(self, timestamps) -> List[bool]:
+        """⏰ Row-wise ``is_expired`` against one timestamp or one per row"""
+        np = optional_numpy()
+        if np is not None and self.raw:
+            expiration = self.expiration
+            return ((expiration != 0) & (expiration < np.asarray(timestamps, dtype=np.int64))).tolist()
+        if isinstance(timestamps, int):
+            timestamps = [timestamps] * len(self.raw)
+        return [e != 0 and e < ts for e, ts in zip(self.expiration, timestamps)]
+
+    def masks(self, timestamps=None) -> Dict[str, List[bool]]:
+        """🎭 One boolean column per audit finding (``EXPIRED`` needs ``timestamps``)"""
+        np = optional_numpy()
+        if np is not None and self.raw:
+            expiration, app_expiry = self.expiration, self.app_expiry
+            epoch, multiple = self.flags["need_check_epoch_manager"], self.flags["allow_multiple_fills"]
+            ignored = (expiration == 0) & (app_expiry != 0) & ~epoch
+            masks = {
+                FLAG_IN_EXPIRATION: (expiration > 0) & (expiration < 4),
+                APP_EXPIRY_IGNORED: ignored,
+                EPOCH_WITHOUT_MULTIPLE_FILLS: epoch & ~multiple,
+            }
+            if timestamps is not None:
+                masks[EXPIRED] = np.asarray(self.expired(timestamps))
+                masks[APP_EXPIRY_PASSED] = ignored & (app_expiry < np.asarray(timestamps, dtype=np.int64))
+            return {name: mask.tolist() for name, mask in masks.items()}
+
+        decoded = [MakerTraits.from_int(value) for value in self.raw]
+        if timestamps is None:
+            findings = [t.audit() for t in decoded]
+            names = [FLAG_IN_EXPIRATION, APP_EXPIRY_IGNORED, EPOCH_WITHOUT_MULTIPLE_FILLS]
+        else:
+            if isinstance(timestamps, int):
+                timestamps = [timestamps] * len(decoded)
+            findings = [t.audit(ts) for t, ts in zip(decoded, timestamps)]
+            names = [EXPIRED, FLAG_IN_EXPIRATION, APP_EXPIRY_IGNORED, APP_EXPIRY_PASSED, EPOCH_WITHOUT_MULTIPLE_FILLS]
+        return {name: [name in row for row in findings] for name in names}
+
+    def audit(self, timestamps=None, makers: Optional[Sequence[str]] = None) -> List[List[str]]:
+        """🔍 Findings per row; ``makers`` enables the duplicate-nonce check"""
+        masks = self.masks(timestamps)
+        findings = [[name for name in AUDIT_ORDER if name in masks and masks[name][i]] for i in range(len(self.raw))]
+
+        if makers is not None:
+            # Single-fill orders share the maker's bit invalidator: a reused nonce cancels the second order
+            multiple = list(self.flags["allow_multiple_fills"])
+            keys = [(maker.lower(), int(nonce)) if not multi else None
+                    for maker, nonce, multi in zip(makers, self.nonce_or_epoch, multiple)]
+            counts = Counter(key for key in keys if key is not None)
+            for row, key in zip(findings, keys):
+                if key is not None and counts[key] > 1:
+                    row.append(DUPLICATE_NONCE)
+        return findings
+
+
+def describe(traits: MakerTraits, timestamp: Optional[int] = None) -> List[str]:
+    """🖨️ Human-readable lines for one MakerTraits word"""
+    def when(ts: int) -> str:
+        return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(ts))
+
+    lines = [f"🏷️  Maker Traits: {hex(traits.raw)}"]
+    lines.append(f"   ⏰ Expiration: {when(traits.expiration) if traits.expiration else 'never'}")
+    lines.append(f"   🔢 {'Epoch' if traits.need_check_epoch_manager else 'Nonce'}: {traits.nonce_or_epoch}"
+                 f"{f', series {traits.series}' if traits.need_check_epoch_manager else ''}")
+    if traits.allowed_sender:
+        lines.append(f"   🔒 Allowed sender (low 10 bytes): 0x{traits.allowed_sender:020x}")
+    enabled = [name for name in MAKER_FLAGS if getattr(traits, name)]
+    lines.append(f"   🚩 Flags: {', '.join(enabled) if enabled else 'none'}")
+    if traits.app_expiry and not traits.need_check_epoch_manager:
+        lines.append(f"   📱 App expiry in series bits: {when(traits.app_expiry)} (not enforced by the router)")
+    for finding in traits.audit(timestamp):
+        lines.append(f"   ⚠️  {finding}")
+    return lines
+
+
+def _parse_int(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    return int(value, 16) if str(value).startswith("0x") else int(value)
+
+
+def audit_report(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """📋 Audit every decoded order in a postmortem report in one vectorized pass"""
+    rows = [record for record in records if record.get("maker_traits")]
+    traits = TraitsArray([_parse_int(record["maker_traits"]) for record in rows])
+    timestamps = [record.get("block_timestamp") or 0 for record in rows]
+    findings = traits.audit(timestamps, makers=[record.get("maker") or "" for record in rows])
+    return [{"tx_hash": record.get("tx_hash"), "maker": record.get("maker"), "findings": row}
+            for record, row in zip(rows, findings)]
+
+
+def main():
+    """🚀 Main execution function"""
+    parser = argparse.ArgumentParser(description="🏷️ 1Limit MakerTraits decoder and audit")
+    parser.add_argument("traits", nargs="*", help="🏷️ MakerTraits words (hex or decimal)")
+    parser.add_argument("--at", type=int, help="⏰ Unix timestamp to check expiry against (default: now)")
+    parser.add_argument("--report", help="📄 Audit a postmortem.py NDJSON report (- for stdin)")
+    args = parser.parse_args()
+
+    if args.report:
+        source = sys.stdin if args.report == "-" else open(args.report, "r")
+        with source:
+            results = audit_report(json.loads(line) for line in source if line.strip())
+        counts = Counter(finding for result in results for finding in result["findings"])
+        for result in results:
+            print(json.dumps(result))
+        print(f"📊 {len(results)} orders audited: "
+              + (", ".join(f"{name} ×{count}" for name, count in counts.most_common()) or "no findings"),
+              file=sys.stderr)
+        return
+
+    if not args.traits:
+        parser.error("give MakerTraits words or --report")
+    timestamp = args.at if args.at is not None else int(time.time())
+    for value in args.traits:
+        for line in describe(MakerTraits.from_int(_parse_int(value)), timestamp):
+            print(line)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+🧪 Local mock Polygon JSON-RPC node for load testing
+=====================================================
+
+A self-contained asyncio HTTP/1.1 server that answers the subset of
+JSON-RPC the scripts use from synthetic, deterministic chain state:
+
+    eth_blockNumber, eth_chainId, eth_getBalance, eth_getTransactionCount,
+    eth_getBlockByNumber, eth_getTransactionByHash, eth_getTransactionReceipt,
+    eth_getLogs, debug_traceTransaction and eth_call for ERC-20
+    balanceOf / allowance / decimals / symbol / name plus Multicall3
+    aggregate3 / getEthBalance (the balance sweep).
+
+Every value is derived from a hash of the seed and the query, so any
+address or transaction hash has an answer and thousands of wallets need no
+setup. Balances, nonces and logs are generated independently, so the state
+is plausible but not a consistent ledger. ``eth_getLogs`` only synthesizes
+Transfer/Approval events for wallets named in the filter topics. It enforces
+a block-range cap with the same -32005 error public nodes use, so the
+adaptive range splitting in ``RpcClient.get_logs`` is exercised too. The
+head advances one block every ``--block-time`` seconds.
+
+Batches are supported. Latency and jitter apply per HTTP request. Errors
+can be injected per call (JSON-RPC -32603) and per request (HTTP 503). An
+optional token bucket answers HTTP 429 with Retry-After once the call rate
+is exceeded, so the rate limiter and failover paths see realistic pushback.
+
+Usage:
+    python3 scripts/mock_node.py --port 8545 --latency 0.05 --jitter 0.02 --rate 500
+    python3 scripts/mock_node.py bench --wallets 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from evm import ROUTER_V6
+from token_registry import KNOWN_TOKENS
+
+POLYGON_CHAIN_ID = 137
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+APPROVAL_TOPIC = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
+
+# eth_call selectors
+BALANCE_OF = "70a08231"
+ALLOWANCE = "dd62ed3e"
+DECIMALS = "313ce567"
+SYMBOL = "95d89b41"
+NAME = "06fdde03"
+TRANSFER = "a9059cbb"
+AGGREGATE3 = "82ad56cb"
+GET_ETH_BALANCE = "4d2301cc"
+
+UNLIMITED = 2**256 - 1
+DEFAULT_HEAD = 60_000_000
+DEFAULT_MAX_LOG_RANGE = 2_000
+DEFAULT_MAX_LOGS = 10_000
+
+JsonDict = Dict[str, Any]
+
+
+class CallError(Exception):
+    """❌ Becomes the JSON-RPC error object of one call"""
+
+    def __init__(self, code: int, message: str, data: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+    def to_json(self) -> JsonDict:
+        error = {"code": self.code, "message": str(self)}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+def _word(value: int) -> str:
+    return format(value, "064x")
+
+
+def _abi_string(value: str) -> str:
+    data = value.encode()
+    return _word(0x20) + _word(len(data)) + (data + bytes(-len(data) % 32)).hex()
+
+
+def _topic_address(topic: str) -> str:
+    return "0x" + topic[-40:]
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+class ChainState:
+    """🎲 Deterministic synthetic Polygon state derived from a seed"""
+
+    def __init__(self, seed: int = 1, head: int = DEFAULT_HEAD, block_time: float = 2.0,
+                 max_log_range: int = DEFAULT_MAX_LOG_RANGE, max_logs: int = DEFAULT_MAX_LOGS):
+        self.seed = seed
+        self.start_head = head
+        self.block_time = block_time
+        self.max_log_range = max_log_range
+        self.max_logs = max_logs
+        self.started = time.monotonic()
+        self.genesis_time = int(time.time()) - int(head * block_time)
+        self.tokens = {token.address.lower(): token for token in KNOWN_TOKENS}
+
+    def _rand(self, *parts: Any) -> int:
+        material = "|".join(str(part).lower() for part in (self.seed,) + parts)
+        return int.from_bytes(hashlib.sha256(material.encode()).digest()[:16], "big")
+
+    def _hash(self, *parts: Any) -> str:
+        return "0x" + format(self._rand("hash", *parts), "032x") * 2
+
+    def _address(self, *parts: Any) -> str:
+        return "0x" + format(self._rand("address", *parts), "032x") + format(self._rand("tail", *parts), "032x")[:8]
+
+    def head(self) -> int:
+        if self.block_time <= 0:
+            return self.start_head
+        return self.start_head + int((time.monotonic() - self.started) / self.block_time)
+
+    def _block_number(self, tag: Any) -> int:
+        if tag in (None, "latest", "pending", "safe", "finalized"):
+            return self.head()
+        if tag == "earliest":
+            return 0
+        return int(tag, 16)
+
+    def timestamp(self, block: int) -> int:
+        return self.genesis_time + int(block * self.block_time)
+
+    # Accounts
+
+    def balance(self, address: str) -> int:
+        r = self._rand("balance", address)
+        return 0 if r % 4 == 0 else r % (500 * 10**18)
+
+    def nonce(self, address: str) -> int:
+        r = self._rand("nonce", address)
+        return 0 if r % 4 == 0 else r % 2_000
+
+    def token_balance(self, token: str, owner: str) -> int:
+        r = self._rand("erc20", token, owner)
+        return 0 if r % 3 == 0 else r % 10**(self.decimals(token) + 5)
+
+    def allowance(self, token: str, owner: str, spender: str) -> int:
+        r = self._rand("allowance", token, owner, spender) % 3
+        if r == 0:
+            return 0
+        return UNLIMITED if r == 1 else self.token_balance(token, owner) // 2
+
+    def decimals(self, token: str) -> int:
+        known = self.tokens.get(token.lower())
+        return known.decimals if known else 18
+
+    def symbol(self, token: str) -> str:
+        known = self.tokens.get(token.lower())
+        return known.symbol if known else f"MOCK{self._rand('symbol', token) % 1000}"
+
+    # Blocks and transactions
+
+    def block(self, tag: Any) -> Optional[JsonDict]:
+        number = self._block_number(tag)
+        if number > self.head():
+            return None
+        return {
+            "number": hex(number),
+            "hash": self._hash("block", number),
+            "parentHash": self._hash("block", number - 1),
+            "timestamp": hex(self.timestamp(number)),
+            "gasLimit": hex(30_000_000),
+            "gasUsed": hex(self._rand("gas", number) % 30_000_000),
+            "baseFeePerGas": hex(30 * 10**9 + self._rand("basefee", number) % (10 * 10**9)),
+            "miner": self._address("miner", number % 100),
+            "transactions": [],
+        }
+
+    def transaction(self, tx_hash: str) -> JsonDict:
+        r = self._rand("tx", tx_hash)
+        block = self.start_head - r % 100_000
+        token = KNOWN_TOKENS[r % len(KNOWN_TOKENS)].address
+        recipient = self._address("recipient", tx_hash)
+        amount = r % 10**(self.decimals(token) + 3)
+        return {
+            "hash": tx_hash,
+            "blockNumber": hex(block),
+            "blockHash": self._hash("block", block),
+            "transactionIndex": hex(r % 150),
+            "from": self._address("sender", tx_hash),
+            "to": token,
+            "nonce": hex(r % 2_000),
+            "value": "0x0",
+            "gas": hex(100_000),
+            "gasPrice": hex(35 * 10**9),
+            "input": "0x" + TRANSFER + _word(int(recipient, 16)) + _word(amount),
+            "type": "0x2",
+            "chainId": hex(POLYGON_CHAIN_ID),
+        }
+
+    def failed(self, tx_hash: str) -> bool:
+        return self._rand("status", tx_hash) % 10 == 0
+
+    def receipt(self, tx_hash: str) -> JsonDict:
+        tx = self.transaction(tx_hash)
+        failed = self.failed(tx_hash)
+        logs = []
+        if not failed:
+            calldata = tx["input"][10:]
+            logs.append(self._log(tx["to"], [TRANSFER_TOPIC, "0x" + _word(int(tx["from"], 16)), "0x" + calldata[:64]],
+                                  int(calldata[64:128], 16), int(tx["blockNumber"], 16), 0, tx_hash,
+                                  int(tx["transactionIndex"], 16)))
+        return {
+            "transactionHash": tx_hash,
+            "blockNumber": tx["blockNumber"],
+            "blockHash": tx["blockHash"],
+            "transactionIndex": tx["transactionIndex"],
+            "from": tx["from"],
+            "to": tx["to"],
+            "status": "0x0" if failed else "0x1",
+            "gasUsed": hex(24_000 if failed else 51_000 + self._rand("gasused", tx_hash) % 20_000),
+            "cumulativeGasUsed": hex(5_000_000),
+            "effectiveGasPrice": tx["gasPrice"],
+            "contractAddress": None,
+            "logs": logs,
+            "type": tx["type"],
+        }
+
+    def trace(self, tx_hash: str) -> JsonDict:
+        """🪜 ``callTracer``-shaped trace of the synthetic transfer"""
+        tx = self.transaction(tx_hash)
+        receipt = self.receipt(tx_hash)
+        trace = {
+            "type": "CALL",
+            "from": tx["from"],
+            "to": tx["to"],
+            "value": "0x0",
+            "gas": tx["gas"],
+            "gasUsed": receipt["gasUsed"],
+            "input": tx["input"],
+            "output": "0x" + _word(1),
+        }
+        if self.failed(tx_hash):
+            reason = "ERC20: transfer amount exceeds balance"
+            trace.update(output="0x08c379a0" + _abi_string(reason), error="execution reverted",
+                         revertReason=reason)
+        return trace
+
+    # Logs
+
+    def _log(self, address: str, topics: List[str], amount: int, block: int, log_index: int,
+             tx_hash: str, tx_index: int = 0) -> JsonDict:
+        return {
+            "address": address,
+            "topics": topics,
+            "data": "0x" + _word(amount),
+            "blockNumber": hex(block),
+            "blockHash": self._hash("block", block),
+            "transactionHash": tx_hash,
+            "transactionIndex": hex(tx_index),
+            "logIndex": hex(log_index),
+            "removed": False,
+        }
+
+    def _active_blocks(self, wallet: str, kind: str, from_block: int, to_block: int) -> range:
+        # Each wallet/kind is active every `period` blocks at a fixed offset
+        r = self._rand("activity", wallet, kind)
+        period = 200 + r % 800
+        first = from_block + (r % period - from_block) % period
+        return range(first, to_block + 1, period)
+
+    def logs(self, log_filter: JsonDict) -> List[JsonDict]:
+        """📜 Transfer/Approval events for the wallets named in the filter topics"""
+        from_block = self._block_number(log_filter.get("fromBlock"))
+        to_block = min(self._block_number(log_filter.get("toBlock")), self.head())
+        if to_block - from_block + 1 > self.max_log_range:
+            raise CallError(-32005, f"block range is too large, max {self.max_log_range} blocks")
+        if to_block < from_block:
+            return []
+
+        topics = list(log_filter.get("topics") or []) + [None, None, None]
+        event_topics = _as_list(topics[0]) or [TRANSFER_TOPIC, APPROVAL_TOPIC]
+        tokens = _as_list(log_filter.get("address")) or [token.address for token in KNOWN_TOKENS]
+        senders = [_topic_address(topic) for topic in _as_list(topics[1])]
+        recipients = [_topic_address(topic) for topic in _as_list(topics[2])]
+
+        wanted: List[Tuple[str, str, str]] = []  # (event topic, kind, wallet)
+        for event in event_topics:
+            if event == TRANSFER_TOPIC:
+                wanted += [(event, "out", wallet) for wallet in senders]
+                wanted += [(event, "in", wallet) for wallet in recipients]
+            elif event == APPROVAL_TOPIC:
+                wanted += [(event, "approve", wallet) for wallet in senders]
+
+        logs = []
+        for event, kind, wallet in wanted:
+            for block in self._active_blocks(wallet, kind, from_block, to_block):
+                r = self._rand("log", wallet, kind, block)
+                token = tokens[r % len(tokens)]
+                counterparty = ROUTER_V6 if kind == "approve" else self._address("counterparty", wallet, block)
+                owner, other = (counterparty, wallet) if kind == "in" else (wallet, counterparty)
+                if recipients and kind != "in" and other.lower() not in recipients:
+                    continue  # the filter pins the counterparty too
+                amount = UNLIMITED if kind == "approve" and r % 2 else r % 10**(self.decimals(token) + 3)
+                logs.append(self._log(token, [event, "0x" + _word(int(owner, 16)), "0x" + _word(int(other, 16))],
+                                      amount, block, r % 64, self._hash("logtx", wallet, kind, block), r % 150))
+                if len(logs) > self.max_logs:
+                    raise CallError(-32005, f"query returned more than {self.max_logs} results")
+        logs.sort(key=lambda log: (int(log["blockNumber"], 16), int(log["logIndex"], 16)))
+        return logs
+
+    # eth_call
+
+    def call(self, to: str, data: str) -> str:
+        data = data[2:] if data.startswith("0x") else data
+        return "0x" + self._execute(to, data[:8], data[8:])
+
+    def _execute(self, to: str, selector: str, args: str) -> str:
+        def arg_address(i: int) -> str:
+            return "0x" + args[64 * i + 24:64 * (i + 1)]
+
+        if selector == BALANCE_OF:
+            return _word(self.token_balance(to, arg_address(0)))
+        if selector == ALLOWANCE:
+            return _word(self.allowance(to, arg_address(0), arg_address(1)))
+        if selector == DECIMALS:
+            return _word(self.decimals(to))
+        if selector == SYMBOL:
+            return _abi_string(self.symbol(to))
+        if selector == NAME:
+            return _abi_string(f"{self.symbol(to)} Token")
+        if to.lower() == MULTICALL3_ADDRESS.lower():
+            if selector == GET_ETH_BALANCE:
+                return _word(self.balance(arg_address(0)))
+            if selector == AGGREGATE3:
+                return self._aggregate3(bytes.fromhex(args))
+        raise CallError(3, "execution reverted", "0x")
+
+    def _aggregate3(self, data: bytes) -> str:
+        def read_word(offset: int) -> int:
+            return int.from_bytes(data[offset:offset + 32], "big")
+
+        array_start = read_word(0)
+        count = read_word(array_start)
+        heads = array_start + 32
+        results = []
+        for i in range(count):
+            start = heads + read_word(heads + 32 * i)
+            target = "0x" + data[start + 12:start + 32].hex()
+            allow_failure = read_word(start + 32) != 0
+            bytes_start = start + read_word(start + 64)
+            calldata = data[bytes_start + 32:bytes_start + 32 + read_word(bytes_start)].hex()
+            try:
+                results.append((True, self._execute(target, calldata[:8], calldata[8:])))
+            except CallError:
+                if not allow_failure:
+                    raise
+                results.append((False, ""))
+
+        # Result[] where Result = (bool success, bytes returnData)
+        encoded = []
+        for success, output in results:
+            padded = output + "00" * (-len(output) // 2 % 32)
+            encoded.append(_word(int(success)) + _word(0x40) + _word(len(output) // 2) + padded)
+        offsets = []
+        position = 32 * len(encoded)
+        for item in encoded:
+            offsets.append(_word(position))
+            position += len(item) // 2
+        return _word(0x20) + _word(len(encoded)) + "".join(offsets) + "".join(encoded)
+
+
+class MockNode:
+    """🧪 asyncio JSON-RPC server over ``ChainState`` with latency, errors and throttling"""
+
+    def __init__(self, state: Optional[ChainState] = None, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, http_error_rate: float = 0.0, rate: Optional[float] = None):
+        self.state = state or ChainState()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.http_error_rate = http_error_rate
+        self.rate = rate
+        self._tokens = rate or 0.0
+        self._refilled = time.monotonic()
+        self._random = random.Random(self.state.seed)
+        self.stats: Counter = Counter()
+        self.methods: Counter = Counter()
+        self.handlers = {
+            "eth_chainId": lambda p: hex(POLYGON_CHAIN_ID),
+            "net_version": lambda p: str(POLYGON_CHAIN_ID),
+            "eth_blockNumber": lambda p: hex(self.state.head()),
+            "eth_getBalance": lambda p: hex(self.state.balance(p[0])),
+            "eth_getTransactionCount": lambda p: hex(self.state.nonce(p[0])),
+            "eth_getBlockByNumber": lambda p: self.state.block(p[0]),
+            "eth_getTransactionByHash": lambda p: self.state.transaction(p[0]),
+            "eth_getTransactionReceipt": lambda p: self.state.receipt(p[0]),
+            "eth_getLogs": lambda p: self.state.logs(p[0]),
+            "eth_call": lambda p: self.state.call(p[0]["to"], p[0].get("data") or p[0].get("input", "0x")),
+            "debug_traceTransaction": lambda p: self.state.trace(p[0]),
+        }
+
+    def _throttled(self, cost: int) -> Optional[float]:
+        """🪣 Seconds until ``cost`` calls fit the bucket, or None when they are admitted"""
+        if self.rate is None:
+            return None
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens >= cost:
+            self._tokens -= cost
+            return None
+        return (cost - self._tokens) / self.rate
+
+    def answer(self, request: Any) -> JsonDict:
+        """📨 Response object for one JSON-RPC request"""
+        if not isinstance(request, dict) or "method" not in request:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "invalid request"}}
+        method = request["method"]
+        self.methods[method] += 1
+        response: JsonDict = {"jsonrpc": "2.0", "id": request.get("id")}
+        handler = self.handlers.get(method)
+        if handler is None:
+            response["error"] = {"code": -32601, "message": f"the method {method} does not exist/is not available"}
+        elif self.error_rate and self._random.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            response["error"] = {"code": -32603, "message": "internal error (injected)"}
+        else:
+            try:
+                response["result"] = handler(request.get("params") or [])
+            except CallError as e:
+                response["error"] = e.to_json()
+            except (IndexError, KeyError, TypeError, ValueError) as e:
+                response["error"] = {"code": -32602, "message": f"invalid params: {e}"}
+        return response
+
+    async def _respond(self, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        self.stats["http_requests"] += 1
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 200, {}, json.dumps({"jsonrpc": "2.0", "id": None,
+                                        "error": {"code": -32700, "message": "parse error"}}).encode()
+        requests = payload if isinstance(payload, list) else [payload]
+        self.stats["calls"] += len(requests)
+        if isinstance(payload, list):
+            self.stats["batches"] += 1
+
+        wait = self._throttled(len(requests))
+        if wait is not None:
+            self.stats["throttled"] += 1
+            return 429, {"Retry-After": str(max(1, round(wait)))}, b'{"error": "rate limit exceeded"}'
+
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.http_error_rate and self._random.random() < self.http_error_rate:
+            self.stats["http_errors"] += 1
+            return 503, {}, b"service unavailable (injected)"
+
+        responses = [self.answer(request) for request in requests]
+        return 200, {}, json.dumps(responses if isinstance(payload, list) else responses[0]).encode()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Minimal HTTP/1.1 with keep-alive - enough for requests/httpx connection pools
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                if request_line.split(b" ", 1)[0] != b"POST":
+                    status, extra, content = 405, {"Allow": "POST"}, b""
+                else:
+                    status, extra, content = await self._respond(body)
+                reason = {200: "OK", 405: "Method Not Allowed", 429: "Too Many Requests",
+                          503: "Service Unavailable"}[status]
+                head = [f"HTTP/1.1 {status} {reason}", "Content-Type: application/json",
+                        f"Content-Length: {len(content)}"]
+                head += [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + content)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8545) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """🧵 Serve from a daemon thread with its own event loop; returns the URL"""
+        ready = threading.Event()
+        bound: List[int] = []
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            server = loop.run_until_complete(self.serve(host, port))
+            bound.append(server.sockets[0].getsockname()[1])
+            ready.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, name="mock-node", daemon=True).start()
+        ready.wait()
+        return f"http://{host}:{bound[0]}"
+
+    def report(self, file=sys.stderr) -> None:
+        stats = self.stats
+        print(f"🧪 Mock node: {stats['http_requests']} HTTP requests, {stats['calls']} calls "
+              f"({stats['batches']} batches), {stats['throttled']} throttled, "
+              f"{stats['injected_errors']} call errors, {stats['http_errors']} HTTP errors injected", file=file)
+        for method, count in self.methods.most_common():
+            print(f"   {method}: {count}", file=file)
+
+
+def _write_wallet_files(directory: str, state: ChainState, count: int) -> List[str]:
+    addresses = []
+    for i in range(count):
+        address = state._address("wallet", i)
+        key = "0x" + format(state._rand("key", i), "032x") * 2
+        with open(os.path.join(directory, f"wallet_{i:06d}.json"), "w") as f:
+            json.dump({"address": address, "private_key": key}, f)
+        addresses.append(address)
+    return addresses
+
+
+def run_bench(node: MockNode, wallets: int, concurrency: int, rate: float) -> None:
+    """⏱️ Fleet scan and Multicall3 balance sweep over ``wallets`` synthetic wallets"""
+    from fleet_scanner import run_fleet_scan
+    from multicall import Multicall3, TokenSweep
+    from rpc_client import make_client
+
+    url = node.start_in_thread()
+    print(f"🧪 Mock node at {url}")
+    tokens = {token.symbol: token._asdict() for token in KNOWN_TOKENS}
+
+    with tempfile.TemporaryDirectory() as directory:
+        addresses = _write_wallet_files(directory, node.state, wallets)
+
+        before = node.stats["calls"]
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            failures = asyncio.run(run_fleet_scan(directory, [url], concurrency, rate, io.StringIO()))
+        elapsed = time.perf_counter() - started
+        print(f"🚢 Fleet scan: {wallets} wallets in {elapsed:.2f}s ({wallets / elapsed:,.0f} wallets/s, "
+              f"{(node.stats['calls'] - before) / elapsed:,.0f} calls/s, {failures} failed)")
+
+    before = node.stats["calls"]
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sweep = TokenSweep(Multicall3(make_client(rpc_urls=[url])), tokens, ROUTER_V6)
+        sweep.sweep(addresses)
+    elapsed = time.perf_counter() - started
+    print(f"💰 Balance sweep: {wallets} wallets × {len(tokens)} tokens in {elapsed:.2f}s "
+          f"({wallets / elapsed:,.0f} wallets/s, {node.stats['calls'] - before} eth_calls)")
+    node.report(sys.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🧪 Local mock Polygon JSON-RPC node")
+    parser.add_argument("--host", default="127.0.0.1", help="🏠 Bind address")
+    parser.add_argument("--port", type=int, default=8545, help="🔌 Port (0 = any free port)")
+    parser.add_argument("--seed", type=int, default=1, help="🎲 Seed for the synthetic state")
+    parser.add_argument("--head", type=int, default=DEFAULT_HEAD, help="🧱 Starting block number")
+    parser.add_argument("--block-time", type=float, default=2.0, help="⏱️ Seconds per block (0 = frozen head)")
+    parser.add_argument("--latency", type=float, default=0.0, help="🐢 Seconds added to every HTTP request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="🎲 ± seconds of uniform latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="💥 Fraction of calls answered with -32603")
+    parser.add_argument("--http-error-rate", type=float, default=0.0, help="💥 Fraction of requests answered 503")
+    parser.add_argument("--rate", type=float, default=None, help="🪣 Calls per second before HTTP 429")
+    parser.add_argument("--max-log-range", type=int, default=DEFAULT_MAX_LOG_RANGE,
+                        help="📏 eth_getLogs block range cap")
+
+    subparsers = parser.add_subparsers(dest="command")
+    bench_parser = subparsers.add_parser("bench", help="⏱️ Time the fleet scan and balance sweep against the mock")
+    bench_parser.add_argument("--wallets", type=int, default=1000, help="👛 Synthetic wallets")
+    bench_parser.add_argument("--concurrency", type=int, default=32, help="🔀 Fleet scan wallets in flight")
+    bench_parser.add_argument("--scan-rate", type=float, default=1000.0,
+                              help="🪣 Fleet scan client-side requests per second")
+    args = parser.parse_args()
+
+    state = ChainState(args.seed, args.head, args.block_time, args.max_log_range)
+    node = MockNode(state, args.latency, args.jitter, args.error_rate, args.http_error_rate, args.rate)
+
+    if args.command == "bench":
+        run_bench(node, args.wallets, args.concurrency, args.scan_rate)
+        return
+
+    async def serve_forever() -> None:
+        server = await node.serve(args.host, args.port)
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"🧪 Mock Polygon node listening on http://{host}:{port} (head {state.head():,})")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        print("\n👋 Mock node stopped")
+        node.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+📦 Multicall3 aggregation for ERC-20 balance and allowance sweeps
+==================================================================
+
+Packs many read-only calls into Multicall3 ``aggregate3`` so a whole sweep
+(every token for every wallet) costs one ``eth_call`` per chunk, all pinned
+to the same block. Calldata is encoded and decoded by hand, so no ABI
+library is needed.
+
+Multicall3 is deployed at the same address on every EVM chain, including
+Polygon: https://www.multicall3.com
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from evm import address_word, word
+from rpc_client import RpcClient
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Function selectors
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")      # aggregate3((address,bool,bytes)[])
+GET_ETH_BALANCE_SELECTOR = bytes.fromhex("4d2301cc")  # getEthBalance(address)
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")       # balanceOf(address)
+ALLOWANCE_SELECTOR = bytes.fromhex("dd62ed3e")        # allowance(address,address)
+
+# Keep each eth_call comfortably below typical node calldata/gas caps
+MAX_CALLS_PER_AGGREGATE = 500
+
+Call = Tuple[str, bytes]  # (target contract, calldata)
+
+
+def encode_balance_of(owner: str) -> bytes:
+    return BALANCE_OF_SELECTOR + address_word(owner)
+
+
+def encode_allowance(owner: str, spender: str) -> bytes:
+    return ALLOWANCE_SELECTOR + address_word(owner) + address_word(spender)
+
+
+def encode_get_eth_balance(address: str) -> bytes:
+    return GET_ETH_BALANCE_SELECTOR + address_word(address)
+
+
+def encode_aggregate3(calls: List[Call], allow_failure: bool = True) -> bytes:
+    """🧱 ABI-encode ``aggregate3(Call3[])`` where Call3 = (address, bool, bytes)"""
+    tuples = []
+    for target, calldata in calls:
+        padded = calldata + bytes(-len(calldata) % 32)
+        tuples.append(
+            address_word(target)
+            + word(1 if allow_failure else 0)
+            + word(0x60)  # bytes offset, relative to the tuple start
+            + word(len(calldata))
+            + padded
+        )
+
+    # Offsets of each tuple are relative to the first word after the length
+    offsets = []
+    position = 32 * len(tuples)
+    for encoded in tuples:
+        offsets.append(word(position))
+        position += len(encoded)
+
+    return (
+        AGGREGATE3_SELECTOR
+        + word(0x20)
+        + word(len(tuples))
+        + b"".join(offsets)
+        + b"".join(tuples)
+    )
+
+
+def decode_aggregate3(data: bytes) -> List[Tuple[bool, bytes]]:
+    """📤 Decode the ``Result[]`` returned by aggregate3, Result = (bool, bytes)"""
+    view = memoryview(data)
+
+    def read_word(offset: int) -> int:
+        return int.from_bytes(view[offset:offset + 32], "big")
+
+    array_start = read_word(0)
+    count = read_word(array_start)
+    heads = array_start + 32
+    results = []
+    for i in range(count):
+        tuple_start = heads + read_word(heads + 32 * i)
+        success = read_word(tuple_start) != 0
+        bytes_start = tuple_start + read_word(tuple_start + 32)
+        length = read_word(bytes_start)
+        results.append((success, bytes(view[bytes_start + 32:bytes_start + 32 + length])))
+    return results
+
+
+def decode_uint(return_data: bytes) -> Optional[int]:
+    """🔢 Decode a single uint256 return value (None for empty/short data)"""
+    if len(return_data) < 32:
+        return None
+    return int.from_bytes(return_data[:32], "big")
+
+
+class Multicall3:
+    """📦 Thin Multicall3 client that chunks calls and pins them to one block"""
+
+    def __init__(self, rpc: RpcClient, address: str = MULTICALL3_ADDRESS,
+                 chunk_size: int = MAX_CALLS_PER_AGGREGATE):
+        self.rpc = rpc
+        self.address = address
+        self.chunk_size = chunk_size
+
+    def block_number(self) -> int:
+        return int(self.rpc.call("eth_blockNumber", []), 16)
+
+    def aggregate3(self, calls: List[Call], block: str = "latest") -> List[Tuple[bool, bytes]]:
+        """🚀 Execute ``calls`` through aggregate3, one eth_call per chunk"""
+        results: List[Tuple[bool, bytes]] = []
+        for start in range(0, len(calls), self.chunk_size):
+            chunk = calls[start:start + self.chunk_size]
+            calldata = encode_aggregate3(chunk)
+            raw = self.rpc.eth_call(self.address, "0x" + calldata.hex(), block)
+            decoded = decode_aggregate3(bytes.fromhex(raw[2:]))
+            if len(decoded) != len(chunk):
+                # "0x" comes back when Multicall3 has no code at this block
+                raise ValueError(f"aggregate3 returned {len(decoded)} results for {len(chunk)} calls")
+            results.extend(decoded)
+        return results
+
+
+class TokenSweep:
+    """💰 Balance/allowance sweep over many wallets and tokens with a per-block cache
+
+    Results are raw integer amounts (wei / token base units) keyed by
+    ``(wallet, token_name)``. A failed sub-call is reported as None rather
+    than silently turning into a zero balance.
+    """
+
+    def __init__(self, multicall: Multicall3, tokens: Dict[str, Dict[str, Any]], spender: str):
+        self.multicall = multicall
+        self.tokens = tokens
+        self.spender = spender
+        self.block: Optional[int] = None
+        self._cache: Dict[Tuple[int, str, str], Optional[int]] = {}
+
+    def sweep(self, wallets: Iterable[str], block: Optional[int] = None) -> int:
+        """🔄 Fetch native balance plus every token balance/allowance for ``wallets``
+
+        Returns the block number all results are pinned to.
+        """
+        wallets = list(wallets)
+        if block is None:
+            block = self.multicall.block_number()
+
+        keys: List[Tuple[str, str]] = []
+        calls: List[Call] = []
+        for wallet in wallets:
+            keys.append((wallet, "native:balance"))
+            calls.append((self.multicall.address, encode_get_eth_balance(wallet)))
+            for token_name, token_info in self.tokens.items():
+                keys.append((wallet, f"{token_name}:balance"))
+                calls.append((token_info['address'], encode_balance_of(wallet)))
+                keys.append((wallet, f"{token_name}:allowance"))
+                calls.append((token_info['address'], encode_allowance(wallet, self.spender)))
+
+        results = self.multicall.aggregate3(calls, hex(block))
+        for (wallet, field), (success, return_data) in zip(keys, results):
+            self._cache[(block, wallet.lower(), field)] = decode_uint(return_data) if success else None
+
+        self.block = block
+        return block
+
+    def _get(self, wallet: str, field: str) -> Optional[int]:
+        if self.block is None:
+            raise RuntimeError("sweep() must run before reading results")
+        return self._cache.get((self.block, wallet.lower(), field))
+
+    def native_balance(self, wallet: str) -> Optional[int]:
+        return self._get(wallet, "native:balance")
+
+    def balance(self, wallet: str, token_name: str) -> Optional[int]:
+        return self._get(wallet, f"{token_name}:balance")
+
+    def allowance(self, wallet: str, token_name: str) -> Optional[int]:
+        return self._get(wallet, f"{token_name}:allowance")
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+📦 Router V6 order event indexer for our maker wallets
+=======================================================
+
+Keeps every Router V6 order event that concerns a set of maker addresses in
+a local, incrementally synced columnar store:
+
+    🎯 OrderFilled(orderHash, remainingAmount)
+    🚫 OrderCancelled(orderHash)
+    🧮 BitInvalidatorUpdated(maker, slotIndex, slotValue)
+    🔁 EpochIncreased(maker, series, newEpoch)
+
+``OrderFilled``/``OrderCancelled`` do not index the maker, so they are
+attributed by transaction. A fill belongs to one of our makers when that
+maker's maker-asset ``Transfer`` precedes it in the same transaction (the
+router moves the maker asset before it emits the event). A cancellation
+belongs to the maker who sent the ``cancelOrder`` transaction. Senders are
+only looked up (in batches) for ranges where one of our makers' nonce
+moved; otherwise none of them sent anything, and the router's other
+cancellations are skipped unread. The two invalidator events carry the
+maker as an indexed topic and are filtered by the node directly.
+
+Rows are keyed by order hash when read back, so an order's partial fills,
+remaining amount and cancellation are grouped together. Fill rate and
+latency come from the timestamps of the indexed blocks. When the app's
+transaction history export is given, latency is measured from the order's
+``createdAt`` to the block that filled it.
+
+Store layout (one directory per maker set under ``~/.cache/1limit/orders``):
+
+    block.u64   log_index.u32   timestamp.u64   kind.u8   tx_hash.b32
+    order_hash.b32   maker.b20   amount.b32   remaining.b32   checkpoint.json
+
+Usage:
+    python3 scripts/order_indexer.py 0xMAKER [0xMAKER ...]
+    python3 scripts/order_indexer.py 0xMAKER --from-block 60000000 --history history.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from evm import ROUTER_V6, address_topic, hex_bytes, read_word, topic_address
+from rpc_cache import BlockPinnedCache
+from rpc_client import RpcClient, RpcError, make_client
+from rpc_router import percentile
+from rpc_types import Block, Log, Transaction
+from transport import TransportError
+from wallet_indexer import LOGS_CHUNK_SIZE, ORDER_FILLED_TOPIC, TRANSFER_TOPIC, ColumnarStore, sync_store
+
+DEFAULT_ORDERS_DIR = os.environ.get(
+    "ONELIMIT_ORDERS_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "1limit", "orders"),
+)
+
+ORDER_CANCELLED_TOPIC = "0x5152abf959f6564662358c2e52b702259b78bac5ee7842a0f01937e670efcc7d"    # OrderCancelled(bytes32)
+BIT_INVALIDATOR_TOPIC = "0xcda0f7e73d07bdb14b141f2cf4745926629a1b63e7c6a3dd8a80232cb459a850"    # BitInvalidatorUpdated(address,uint256,uint256)
+EPOCH_INCREASED_TOPIC = "0x099133aefc2c2d1e56f8ef3622ec8e80979a0713fc9c4e1497740efcf8099396"    # EpochIncreased(address,uint256,uint256)
+
+# Row kinds
+KIND_FILLED = 1
+KIND_CANCELLED = 2
+KIND_BIT_INVALIDATED = 3
+KIND_EPOCH_INCREASED = 4
+KIND_LABELS = {
+    KIND_FILLED: "🎯 Filled",
+    KIND_CANCELLED: "🚫 Cancelled",
+    KIND_BIT_INVALIDATED: "🧮 Bit invalidator updated",
+    KIND_EPOCH_INCREASED: "🔁 Epoch increased",
+}
+
+# (name, array typecode or byte width)
+ORDER_COLUMNS = [
+    ("block", "Q"),
+    ("log_index", "I"),
+    ("timestamp", "Q"),
+    ("kind", "B"),
+    ("tx_hash", 32),
+    ("order_hash", 32),    # zero for the invalidator events
+    ("maker", 20),
+    ("amount", 32),        # making amount moved by a fill / slotIndex / series
+    ("remaining", 32),     # remaining making amount after a fill / slotValue / newEpoch
+]
+
+# Blocks per JSON-RPC batch when reading timestamps and cancelling transactions
+BATCH_SIZE = 100
+
+
+class OrderState:
+    """📋 Everything indexed about one order hash"""
+
+    __slots__ = ("order_hash", "maker", "fills", "remaining", "cancelled")
+
+    def __init__(self, order_hash: str, maker: str):
+        self.order_hash = order_hash
+        self.maker = maker
+        self.fills: List[Dict[str, Any]] = []
+        self.remaining: Optional[int] = None
+        self.cancelled: Optional[Dict[str, Any]] = None
+
+    @property
+    def filled(self) -> bool:
+        return self.remaining == 0
+
+    @property
+    def first_fill(self) -> Optional[Dict[str, Any]]:
+        return self.fills[0] if self.fills else None
+
+    @property
+    def last_fill(self) -> Optional[Dict[str, Any]]:
+        return self.fills[-1] if self.fills else None
+
+
+class OrderIndexer:
+    """📦 Incremental Router V6 order event indexer for a set of maker wallets"""
+
+    def __init__(self, rpc: RpcClient, makers: Iterable[str], index_dir: str = DEFAULT_ORDERS_DIR,
+                 chunk_size: int = LOGS_CHUNK_SIZE):
+        self.rpc = rpc
+        self.makers = sorted(set(maker.lower() for maker in makers))
+        self.chunk_size = chunk_size
+        key = self.makers[0] if len(self.makers) == 1 else \
+            hashlib.sha1(",".join(self.makers).encode()).hexdigest()[:16]
+        self.store = ColumnarStore(os.path.join(index_dir, key), ORDER_COLUMNS)
+
+    def _get_logs(self, from_block: int, to_block: int, **log_filter: Any) -> List[Log]:
+        return self.rpc.get_logs(log_filter, from_block, to_block)
+
+    def _batched(self, calls: List[tuple]) -> List[Any]:
+        results: List[Any] = []
+        for start in range(0, len(calls), BATCH_SIZE):
+            results += self.rpc.batch(calls[start:start + BATCH_SIZE])
+        return results
+
+    def _row(self, log: Log, kind: int, order_hash: bytes, maker: str,
+             amount: int, remaining: int) -> Dict[str, Any]:
+        return {
+            "block": int(log.block_number),
+            "log_index": int(log.log_index),
+            "timestamp": 0,
+            "kind": kind,
+            "tx_hash": hex_bytes(log.transaction_hash, 32),
+            "order_hash": order_hash,
+            "maker": hex_bytes(maker, 20),
+            "amount": amount.to_bytes(32, "big"),
+            "remaining": remaining.to_bytes(32, "big"),
+        }
+
+    def _fills(self, from_block: int, to_block: int) -> List[Dict[str, Any]]:
+        maker_topics = [address_topic(maker) for maker in self.makers]
+        transfers = self._get_logs(from_block, to_block, topics=[TRANSFER_TOPIC, maker_topics])
+        our_txs = {log.transaction_hash.lower() for log in transfers if len(log.topics) == 3}
+        if not our_txs:
+            return []
+        filled = [log for log in self._get_logs(from_block, to_block, address=ROUTER_V6, topics=[ORDER_FILLED_TOPIC])
+                  if log.transaction_hash.lower() in our_txs]
+
+        # Walk each transaction in log order: a fill takes the latest maker transfer since the previous fill
+        events = sorted([(log, False) for log in transfers if len(log.topics) == 3] + [(log, True) for log in filled],
+                        key=lambda item: (item[0].block_number, item[0].log_index))
+        rows = []
+        pending: Dict[str, Log] = {}
+        for log, is_fill in events:
+            tx_hash = log.transaction_hash.lower()
+            if not is_fill:
+                pending[tx_hash] = log
+                continue
+            transfer = pending.pop(tx_hash, None)
+            if transfer is None:
+                continue  # another maker's order filled in a transaction that also moved our tokens
+            data = hex_bytes(log.data, 64)
+            rows.append(self._row(log, KIND_FILLED, data[:32], topic_address(transfer.topics[1]),
+                                  int(transfer.data, 16) if transfer.data != "0x" else 0, read_word(data, 1)))
+        return rows
+
+    def _active_makers(self, from_block: int, to_block: int) -> List[str]:
+        """👛 Makers whose nonce moved over the range (all of them when the node has no state that old)"""
+        calls = []
+        for maker in self.makers:
+            calls += [("eth_getTransactionCount", [maker, hex(max(from_block - 1, 0))]),
+                      ("eth_getTransactionCount", [maker, hex(to_block)])]
+        results = self._batched(calls)
+        if any(result is None or isinstance(result, RpcError) for result in results):
+            return self.makers
+        return [maker for i, maker in enumerate(self.makers) if results[2 * i] != results[2 * i + 1]]
+
+    def _cancellations(self, from_block: int, to_block: int) -> List[Dict[str, Any]]:
+        logs = self._get_logs(from_block, to_block, address=ROUTER_V6, topics=[ORDER_CANCELLED_TOPIC])
+        makers = set(self._active_makers(from_block, to_block)) if logs else set()
+        if not makers:
+            return []  # cancelling takes a transaction, and none of our makers sent one
+        tx_hashes = list(dict.fromkeys(log.transaction_hash for log in logs))
+        senders = {}
+        calls = [("eth_getTransactionByHash", [h], Transaction) for h in tx_hashes]
+        for tx_hash, tx in zip(tx_hashes, self._batched(calls)):
+            if isinstance(tx, RpcError) or tx is None:
+                raise ValueError(f"Cancelling transaction {tx_hash} could not be fetched")
+            senders[tx_hash] = tx.sender.lower()
+        return [self._row(log, KIND_CANCELLED, hex_bytes(log.data, 32), senders[log.transaction_hash], 0, 0)
+                for log in logs if senders[log.transaction_hash] in makers]
+
+    def _invalidations(self, from_block: int, to_block: int) -> List[Dict[str, Any]]:
+        maker_topics = [address_topic(maker) for maker in self.makers]
+        logs = self._get_logs(from_block, to_block, address=ROUTER_V6,
+                              topics=[[BIT_INVALIDATOR_TOPIC, EPOCH_INCREASED_TOPIC], maker_topics])
+        rows = []
+        for log in logs:
+            kind = KIND_BIT_INVALIDATED if log.topics[0].lower() == BIT_INVALIDATOR_TOPIC else KIND_EPOCH_INCREASED
+            data = hex_bytes(log.data, 64)
+            rows.append(self._row(log, kind, bytes(32), topic_address(log.topics[1]), read_word(data, 0), read_word(data, 1)))
+        return rows
+
+    def _index_range(self, from_block: int, to_block: int) -> List[Dict[str, Any]]:
+        rows = self._fills(from_block, to_block) + self._cancellations(from_block, to_block) + \
+            self._invalidations(from_block, to_block)
+        rows.sort(key=lambda row: (row["block"], row["log_index"]))
+
+        blocks = sorted(set(row["block"] for row in rows))
+        timestamps = {}
+        calls = [("eth_getBlockByNumber", [hex(b), False], Block) for b in blocks]
+        for block, header in zip(blocks, self._batched(calls)):
+            if isinstance(header, RpcError) or header is None:
+                raise ValueError(f"Block {block:,} header could not be fetched")
+            timestamps[block] = int(header.timestamp)
+        for row in rows:
+            row["timestamp"] = timestamps[row["block"]]
+        return rows
+
+    def sync(self, start_block: Optional[int] = None, verbose: bool = True) -> int:
+        """🔄 Index everything between the checkpoint and the safe head; returns rows added"""
+        return sync_store(self.rpc, self.store, self._index_range, self.chunk_size, start_block, verbose)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """📜 Every indexed row, oldest first, decoded for display"""
+        rows = self.store.tail(self.store.row_count())
+        rows.reverse()
+        return [
+            {
+                "block": row["block"],
+                "log_index": row["log_index"],
+                "timestamp": row["timestamp"],
+                "kind": row["kind"],
+                "label": KIND_LABELS.get(row["kind"], "❓ Unknown"),
+                "tx_hash": "0x" + row["tx_hash"].hex(),
+                "order_hash": "0x" + row["order_hash"].hex(),
+                "maker": "0x" + row["maker"].hex(),
+                "amount": int.from_bytes(row["amount"], "big"),
+                "remaining": int.from_bytes(row["remaining"], "big"),
+            }
+            for row in rows
+        ]
+
+    def orders(self) -> Dict[str, OrderState]:
+        """🗂️ Fills and cancellations grouped by order hash"""
+        orders: Dict[str, OrderState] = {}
+        for event in self.events():
+            if event["kind"] not in (KIND_FILLED, KIND_CANCELLED):
+                continue
+            order = orders.setdefault(event["order_hash"], OrderState(event["order_hash"], event["maker"]))
+            if event["kind"] == KIND_FILLED:
+                order.fills.append(event)
+                order.remaining = event["remaining"]
+            else:
+                order.cancelled = event
+        return orders
+
+
+def _parse_time(value: str) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+def fill_stats(orders: Dict[str, OrderState], history: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """📊 Fill rate and latency summary
+
+    Without ``history`` the rate covers the orders seen on chain, and the
+    latency is the time from the first fill to the fill that completed the
+    order. With the app's history export (records with ``txHash`` and
+    ``createdAt``), every limit order in it counts towards the rate. Its
+    latency runs from ``createdAt`` to the block that filled it.
+    """
+    filled = [order for order in orders.values() if order.filled]
+    stats: Dict[str, Any] = {
+        "orders": len(orders),
+        "filled": len(filled),
+        "partially_filled": sum(1 for order in orders.values() if order.fills and not order.filled),
+        "cancelled": sum(1 for order in orders.values() if order.cancelled),
+        "multi_fill": sum(1 for order in orders.values() if len(order.fills) > 1),
+    }
+
+    if history is None:
+        stats["fill_rate"] = len(filled) / len(orders) if orders else None
+        latencies = [order.last_fill["timestamp"] - order.first_fill["timestamp"] for order in filled]
+        stats["latency_basis"] = "first fill → full fill"
+    else:
+        fill_times = {fill["tx_hash"].lower(): fill["timestamp"] for order in orders.values() for fill in order.fills}
+        records = [record for record in history if record.get("type", "Limit Order") == "Limit Order"]
+        latencies = []
+        for record in records:
+            created = _parse_time(record.get("createdAt") or record.get("date"))
+            filled_at = fill_times.get(str(record.get("txHash", "")).lower())
+            if created is not None and filled_at is not None:
+                latencies.append(max(0.0, filled_at - created))
+        stats["history_orders"] = len(records)
+        stats["fill_rate"] = len(latencies) / len(records) if records else None
+        stats["latency_basis"] = "createdAt → fill block"
+
+    if latencies:
+        stats["latency_median_s"] = statistics.median(latencies)
+        stats["latency_p90_s"] = percentile(latencies, 0.9)
+        stats["latency_max_s"] = max(latencies)
+    return stats
+
+
+def main():
+    """🚀 Main execution function"""
+    parser = argparse.ArgumentParser(description="📦 1Limit Router V6 order event indexer")
+    parser.add_argument("makers", nargs="+", help="👛 Maker wallet address(es)")
+    parser.add_argument("--from-block", type=int, help="🧱 First block for a fresh index (default: 50,000 blocks back)")
+    parser.add_argument("--history", help="📱 App transaction history export (JSON list) for creation-time latency")
+    parser.add_argument("--no-sync", action="store_true", help="⚡ Report from the local index only")
+    parser.add_argument("--recent", type=int, default=10, help="📋 Number of recent events to list")
+    parser.add_argument("--rpc-url", action="append", dest="rpc_urls",
+                        help="🌐 RPC endpoint, repeatable (default: routed endpoint pool)")
+    args = parser.parse_args()
+
+    rpc = make_client(args.rpc_urls, cache=BlockPinnedCache())
+    indexer = OrderIndexer(rpc, args.makers)
+
+    print("📦 1Limit Order Indexer")
+    print("=======================")
+    for maker in indexer.makers:
+        print(f"👛 Maker: {maker}")
+    print()
+
+    if not args.no_sync:
+        print("🔄 Syncing Router V6 order events...")
+        try:
+            added = indexer.sync(args.from_block)
+        except (RpcError, TransportError, ValueError) as e:
+            print(f"⚠️ Sync stopped, reporting what is indexed: {e}")
+        else:
+            print(f"✅ {added} new event(s)")
+        print()
+
+    events = indexer.events()
+    print(f"📋 Recent events ({min(args.recent, len(events))} of {len(events)}):")
+    for event in events[-args.recent:]:
+        subject = event["order_hash"][:18] + "…" if event["kind"] in (KIND_FILLED, KIND_CANCELLED) \
+            else f"{event['amount']} → {event['remaining']}"
+        print(f"   🧱 {event['block']:,}  {event['label']}  {subject}  tx {event['tx_hash'][:12]}…")
+    print()
+
+    history = None
+    if args.history:
+        with open(args.history, "r") as f:
+            history = json.load(f)
+    stats = fill_stats(indexer.orders(), history)
+
+    print("📊 Fill statistics:")
+    print(f"   Orders seen: {stats['orders']} ({stats['filled']} filled, {stats['partially_filled']} partial, "
+          f"{stats['cancelled']} cancelled, {stats['multi_fill']} multi-fill)")
+    if "history_orders" in stats:
+        print(f"   App limit orders: {stats['history_orders']}")
+    if stats["fill_rate"] is not None:
+        print(f"   Fill rate: {stats['fill_rate']:.1%}")
+    if "latency_median_s" in stats:
+        print(f"   Latency ({stats['latency_basis']}): median {stats['latency_median_s']:.0f}s, "
+              f"p90 {stats['latency_p90_s']:.0f}s, max {stats['latency_max_s']:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
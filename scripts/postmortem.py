@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+🩺 Batch post-mortem engine for failed Router V6 transactions
+==============================================================
+
+Replaces editing ``FAILED_TX_HASH`` in debug_failed_transaction.py,
+debug_contract_level.py and analyze_failed_tx.py one transaction at a time.
+Reads transaction hashes from a file or stdin, analyzes them concurrently
+and emits one structured record per transaction.
+
+For each hash the engine fetches the transaction and receipt in one batched
+round-trip, decodes the Router V6 fill, reads the maker's balance and
+allowance at the parent block (the state the order saw), replays the
+transaction there to recover the exact Router V6 revert reason, checks the
+order signature offline (eip712.py) and the MakerTraits expiry against the
+block timestamp (maker_traits.py), and runs the failure heuristics.
+Everything block-pinned goes through the on-disk ``BlockPinnedCache``, so
+re-running a report is almost free.
+
+Usage:
+    python3 scripts/postmortem.py failed_hashes.txt
+    cat hashes.txt | python3 scripts/postmortem.py - --format csv --output report.csv
+    python3 scripts/postmortem.py hashes.txt --format parquet --output report.parquet
+
+Requirements:
+    pip install requests
+    pip install pyarrow   # only for --format parquet
+    pip install eth-hash[pycryptodome]   # signature check (skipped without it)
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from eip712 import verify_fill
+from evm import ROUTER_V6
+from maker_traits import MakerTraits
+from revert_replay import replay_transaction
+from router_v6_decoder import DecodeError, decode_fill_call, is_fill_call
+from rpc_cache import BlockPinnedCache
+from rpc_client import RpcClient, RpcError, make_client
+from rpc_types import Block, Receipt, Transaction
+from transport import TransportError
+
+# A fillOrder that reverts below this much gas never reached the token transfers
+EARLY_REVERT_GAS = 50_000
+
+# Flat column order shared by CSV and Parquet output
+FIELDS = [
+    "tx_hash", "status", "block", "from", "to", "gas_limit", "gas_used", "gas_price",
+    "method", "maker", "receiver", "maker_asset", "taker_asset", "making_amount",
+    "taking_amount", "maker_traits", "fill_amount", "taker_traits", "required_making_amount",
+    "order_hash", "signer", "signature_valid", "block_timestamp", "expiration", "nonce",
+    "maker_balance", "maker_allowance", "revert_selector", "revert_reason", "findings", "error",
+]
+
+
+def read_hashes(stream: TextIO) -> Iterator[str]:
+    """📄 One hash per line; blank lines and ``#`` comments are skipped"""
+    for line in stream:
+        tx_hash = line.split("#", 1)[0].strip()
+        if tx_hash:
+            yield tx_hash
+
+
+def required_making_amount(fill) -> int:
+    """📐 Maker tokens the fill needed, from the amount and the TakerTraits flag"""
+    order = fill.order
+    if fill.taker_traits.maker_amount or order.taking_amount == 0:
+        return fill.amount
+    # Amount is a taking amount - scale it to the maker side (rounded down like the router)
+    return fill.amount * order.making_amount // order.taking_amount
+
+
+class PostMortem:
+    """🩺 Analyze failed Router V6 transactions into flat records"""
+
+    def __init__(self, rpc: RpcClient, router: str = ROUTER_V6):
+        self.rpc = rpc
+        self.router = router
+
+    def analyze(self, tx_hash: str) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"tx_hash": tx_hash, "findings": []}
+        try:
+            self._analyze(tx_hash, record)
+        except (RpcError, TransportError, OSError, ValueError, KeyError) as e:
+            record["error"] = str(e)
+        return record
+
+    def _analyze(self, tx_hash: str, record: Dict[str, Any]) -> None:
+        findings: List[str] = record["findings"]
+
+        results = self.rpc.batch([
+            ("eth_getTransactionByHash", [tx_hash], Transaction),
+            ("eth_getTransactionReceipt", [tx_hash], Receipt),
+        ])
+        for result in results:
+            if isinstance(result, RpcError):
+                raise result
+        tx, receipt = results
+        if tx is None:
+            findings.append("not_found")
+            return
+        if receipt is None:
+            findings.append("pending")
+            return
+
+        block = receipt.block_number
+        gas_limit = tx.gas
+        gas_used = receipt.gas_used
+        success = receipt.succeeded
+        record.update({
+            "status": "success" if success else "failed",
+            "block": block,
+            "from": tx.sender,
+            "to": tx.to,
+            "gas_limit": gas_limit,
+            "gas_used": gas_used,
+            "gas_price": receipt.effective_gas_price or tx.gas_price,
+        })
+
+        if not is_fill_call(tx.input):
+            findings.append("not_fill_call")
+            return
+        try:
+            fill = decode_fill_call(tx.input)
+        except DecodeError as e:
+            findings.append("decode_failed")
+            record["error"] = str(e)
+            return
+
+        order = fill.order
+        required = required_making_amount(fill)
+        record.update({
+            "method": fill.method,
+            "maker": order.maker,
+            "receiver": order.receiver,
+            "maker_asset": order.maker_asset,
+            "taker_asset": order.taker_asset,
+            "making_amount": order.making_amount,
+            "taking_amount": order.taking_amount,
+            "maker_traits": hex(order.maker_traits),
+            "fill_amount": fill.amount,
+            "taker_traits": hex(fill.taker_traits.raw),
+            "required_making_amount": required,
+        })
+
+        # Offline EIP-712 check: recompute the order hash and recover the signer from (r, vs)
+        try:
+            signature = verify_fill(fill)
+        except ImportError:
+            signature = None  # no keccak backend installed
+        if signature is not None:
+            record.update({
+                "order_hash": signature.order_hash,
+                "signer": signature.signer,
+                "signature_valid": signature.valid,
+            })
+
+        # Maker state at the parent block, i.e. before this tx's block executed
+        state_block = hex(block - 1)
+        maker_word = order.maker[2:].rjust(64, "0")
+        balance_hex, allowance_hex, header = self.rpc.batch([
+            ("eth_call", [{"to": order.maker_asset, "data": "0x70a08231" + maker_word}, state_block]),
+            ("eth_call", [{"to": order.maker_asset,
+                           "data": "0xdd62ed3e" + maker_word + self.router[2:].lower().rjust(64, "0")},
+                          state_block]),
+            ("eth_getBlockByNumber", [hex(block), False], Block),
+        ])
+        maker_balance = self._uint(balance_hex)
+        maker_allowance = self._uint(allowance_hex)
+        record["maker_balance"] = maker_balance
+        record["maker_allowance"] = maker_allowance
+
+        traits = MakerTraits.from_int(order.maker_traits)
+        timestamp = header.timestamp if isinstance(header, Block) else None
+        record.update({
+            "block_timestamp": timestamp,
+            "expiration": traits.expiration,
+            "nonce": traits.nonce_or_epoch,
+        })
+
+        if success:
+            return
+
+        # Exact revert reason from replaying the tx at the parent block
+        replay = replay_transaction(self.rpc, tx, block)
+        if replay.reason is not None:
+            record["revert_selector"] = replay.reason.selector
+            record["revert_reason"] = replay.reason.name
+            findings.append(f"revert:{replay.reason.name}")
+        elif not replay.reverted and replay.error is None:
+            findings.append("replay_succeeded")
+
+        # Failure heuristics, most specific first
+        if signature is not None and signature.valid is False:
+            findings.append("invalid_signature")
+        findings.extend(traits.audit(timestamp))
+        if maker_balance is not None and maker_balance < required:
+            findings.append("insufficient_maker_balance")
+        if maker_allowance is not None and maker_allowance < required:
+            findings.append("insufficient_maker_allowance")
+        if gas_used >= gas_limit * 0.98:
+            findings.append("out_of_gas")
+        elif gas_used < EARLY_REVERT_GAS:
+            findings.append("early_revert")
+        if order.making_amount == 0 or order.taking_amount == 0:
+            findings.append("zero_amount_order")
+        if not findings:
+            findings.append("unknown_revert")
+
+    @staticmethod
+    def _uint(result: Any) -> Optional[int]:
+        if isinstance(result, RpcError) or not result or result == "0x":
+            return None
+        return int(result, 16)
+
+    def analyze_many(self, hashes: Iterable[str], workers: int = 8) -> Iterator[Dict[str, Any]]:
+        """🚀 Analyze hashes concurrently, yielding records in input order"""
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(self.analyze, hashes)
+
+
+def write_records(records: Iterable[Dict[str, Any]], fmt: str, out: TextIO) -> int:
+    """💾 Write records as NDJSON or CSV; returns how many were written"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            writer.writerow({**record, "findings": ";".join(record["findings"])})
+            count += 1
+    else:
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            count += 1
+    return count
+
+
+def write_parquet(records: Iterable[Dict[str, Any]], path: str) -> int:
+    """🧊 Write records to a Parquet file (needs pyarrow)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("❌ Parquet output needs pyarrow: pip install pyarrow")
+
+    rows = list(records)
+    # uint256 amounts overflow Arrow integers, so every value is stored as a string
+    columns = {
+        field: [None if row.get(field) is None else
+                ";".join(row[field]) if field == "findings" else str(row[field])
+                for row in rows]
+        for field in FIELDS
+    }
+    pq.write_table(pa.table(columns), path)
+    return len(rows)
+
+
+def main():
+    """🚀 Main execution function"""
+    parser = argparse.ArgumentParser(description="🩺 1Limit batch post-mortem for failed transactions")
+    parser.add_argument("hashes", help="📄 File with one tx hash per line, or - for stdin")
+    parser.add_argument("--format", choices=["json", "csv", "parquet"], default="json",
+                        help="💾 Output format (json = one object per line)")
+    parser.add_argument("--output", help="📁 Output file (default: stdout; required for parquet)")
+    parser.add_argument("--workers", type=int, default=8, help="🔀 Transactions analyzed concurrently")
+    parser.add_argument("--rpc-url", action="append", dest="rpc_urls",
+                        help="🌐 Polygon RPC endpoint, repeatable (default: routed endpoint pool)")
+    args = parser.parse_args()
+
+    if args.format == "parquet" and not args.output:
+        parser.error("--format parquet requires --output")
+
+    source = sys.stdin if args.hashes == "-" else open(args.hashes, "r")
+    engine = PostMortem(make_client(args.rpc_urls, cache=BlockPinnedCache()))
+
+    started = time.perf_counter()
+    with source:
+        records = engine.analyze_many(read_hashes(source), workers=args.workers)
+        if args.format == "parquet":
+            count = write_parquet(records, args.output)
+        elif args.output:
+            with open(args.output, "w", newline="") as out:
+                count = write_records(records, args.format, out)
+        else:
+            count = write_records(records, args.format, sys.stdout)
+
+    print(f"✅ Analyzed {count} transactions in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+🪣 Client-side rate limiting and adaptive backoff for public RPC endpoints
+==========================================================================
+
+Public Polygon endpoints throttle aggressively, and a wallet sweep used to
+hammer them until every response was a 429. ``RateLimitedTransport`` wraps
+the pooled ``HttpTransport`` with:
+
+* a token bucket per endpoint, so bursts are smoothed before they leave
+  the process
+* adaptive backoff (AIMD): a 429/503 halves that endpoint's rate and pauses
+  its bucket for the Retry-After period (or an exponential delay with
+  jitter); every success slowly restores the configured rate
+* a retry budget per command, so a throttled sweep retries a bounded number
+  of times and then fails loudly instead of spinning forever
+
+A throttled request that runs out of budget still raises ``TransportError``,
+so callers report it as a failed call - never as a zero balance.
+
+It has the same ``post(url, payload)`` shape as ``HttpTransport`` and is the
+default transport of ``RpcClient``. ``RpcRouter`` sits on top of
+``without_retries()``: buckets are still per endpoint, but a throttled call
+is handed straight back so the router fails over to another endpoint on the
+first 429/503 instead of waiting it out on the same one.
+
+Configuration (environment variables):
+    ONELIMIT_RPC_RATE          requests per second per endpoint (default 25)
+    ONELIMIT_RPC_BURST         bucket size (default: same as the rate)
+    ONELIMIT_RETRY_BUDGET      throttling retries per command (default 50)
+    ONELIMIT_MAX_BACKOFF       longest wait before handing the error back (default 10s)
+"""
+
+import copy
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from transport import HttpTransport, TransportError, get_transport
+
+DEFAULT_RATE = float(os.environ.get("ONELIMIT_RPC_RATE", "25"))
+DEFAULT_BURST = int(os.environ.get("ONELIMIT_RPC_BURST", "0")) or None
+DEFAULT_RETRY_BUDGET = int(os.environ.get("ONELIMIT_RETRY_BUDGET", "50"))
+DEFAULT_MAX_BACKOFF = float(os.environ.get("ONELIMIT_MAX_BACKOFF", "10"))
+
+# Statuses that mean "slow down" rather than "this request is bad"
+THROTTLE_STATUSES = {429, 503}
+# Never back off the rate below this share of the configured rate
+MIN_RATE_FRACTION = 0.05
+# Share of the configured rate restored by each success
+RECOVERY_STEP = 0.05
+# First exponential backoff step when the server sends no Retry-After
+BASE_BACKOFF = 0.5
+
+
+class RetryBudget:
+    """🎟️ Bounded number of throttling retries shared by one command"""
+
+    def __init__(self, retries: int = DEFAULT_RETRY_BUDGET):
+        self.total = retries
+        self.remaining = retries
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Consume one retry; False once the budget is spent"""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    @property
+    def used(self) -> int:
+        return self.total - self.remaining
+
+
+class TokenBucket:
+    """🪣 Thread-safe token bucket whose rate adapts to throttling"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = float(burst if burst is not None else max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.throttle_streak = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        """⏳ Block until a token is available (and any throttle pause is over)"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """📈 Additive increase back towards the configured rate"""
+        with self._lock:
+            self.throttle_streak = 0
+            self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_STEP)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> float:
+        """📉 Halve the rate and pause the bucket; returns the pause in seconds"""
+        with self._lock:
+            self.throttle_streak += 1
+            self.rate = max(self.base_rate * MIN_RATE_FRACTION, self.rate / 2)
+            if retry_after is None:
+                # Exponential backoff with full jitter
+                retry_after = random.uniform(0, BASE_BACKOFF * 2 ** (self.throttle_streak - 1))
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            self.tokens = 0.0
+            return retry_after
+
+
+class RateLimitedTransport:
+    """🚦 ``HttpTransport`` wrapper with per-endpoint buckets and adaptive backoff"""
+
+    def __init__(self, transport: Optional[HttpTransport] = None, rate: float = DEFAULT_RATE,
+                 burst: Optional[int] = DEFAULT_BURST, budget: Optional[RetryBudget] = None,
+                 max_backoff: float = DEFAULT_MAX_BACKOFF, retry_throttled: bool = True):
+        self.transport = transport or get_transport()
+        self.rate = rate
+        self.burst = burst
+        self.budget = budget or RetryBudget()
+        self.max_backoff = max_backoff
+        self.retry_throttled = retry_throttled
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    # Web3 providers and timeouts are borrowed from the wrapped transport
+    @property
+    def session(self):
+        return self.transport.session
+
+    @property
+    def connect_timeout(self) -> float:
+        return self.transport.connect_timeout
+
+    @property
+    def read_timeout(self) -> float:
+        return self.transport.read_timeout
+
+    def bucket(self, url: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(url)
+            if bucket is None:
+                bucket = self._buckets[url] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    def post(self, url: str, payload: Any, decode: Optional[Callable[[bytes], Any]] = None) -> Any:
+        """📮 POST through the endpoint's bucket, retrying throttled calls within budget"""
+        bucket = self.bucket(url)
+        while True:
+            bucket.acquire()
+            try:
+                result = self.transport.post(url, payload, decode=decode)
+            except TransportError as e:
+                if e.status not in THROTTLE_STATUSES:
+                    raise
+                pause = bucket.on_throttle(e.retry_after)
+                if not self.retry_throttled or pause > self.max_backoff or not self.budget.take():
+                    raise
+                continue
+            bucket.on_success()
+            return result
+
+    def without_retries(self) -> "RateLimitedTransport":
+        """🔀 View sharing these buckets that raises on the first throttle (for ``RpcRouter``)"""
+        view = copy.copy(self)
+        view.retry_throttled = False
+        return view
+
+    def stats(self) -> Dict[str, Any]:
+        """📊 Current adaptive rate per endpoint and retries used"""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            "retries_used": self.budget.used,
+            "retries_left": self.budget.remaining,
+            **{url: {"rate": round(bucket.rate, 2), "base_rate": bucket.base_rate}
+               for url, bucket in buckets.items()},
+        }
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+_default_limiter: Optional[RateLimitedTransport] = None
+_default_lock = threading.Lock()
+
+
+def get_limiter() -> RateLimitedTransport:
+    """🌍 Process-wide rate-limited transport; its retry budget spans the whole command"""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimitedTransport()
+        return _default_limiter
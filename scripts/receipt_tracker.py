@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+🧾 Block-driven receipt tracker with confirmation depth and reorg detection
+============================================================================
+
+Python counterpart of the iOS ``TransactionPollingService``. Instead of one
+``eth_getTransactionReceipt`` timer per pending transaction, the tracker
+keeps the pending set in memory and does a fixed amount of work per block:
+the header plus ``eth_getBlockReceipts`` in one batched round-trip (or,
+on endpoints without that method, the header's transaction list plus
+batched receipts for just the pending hashes it contains). Every pending
+hash is resolved against that single result.
+
+Mined transactions are followed until they are ``confirmations`` blocks
+deep. The tracker remembers the canonical hash of recent heights; when a
+new block does not build on the remembered parent it walks back to the
+fork point, returns transactions mined on the abandoned branch to pending
+and rescans the new branch.
+
+The tracker is driven purely by block numbers, so it can be run over a
+historical range (``--from-block``/``--to-block``) to replay how the app's
+polling would have seen a set of transactions.
+
+Events (one dict each):
+    mined       {"event", "block", "tx_hash", "status", "gas_used", "block_hash"}
+    confirmed   {"event", "block", "tx_hash", "status", "depth"}
+    reorged     {"event", "block", "tx_hash", "old_block", "old_block_hash"}
+    dropped     {"event", "block", "tx_hash", "waited_blocks"}
+
+Usage:
+    python3 scripts/receipt_tracker.py 0xHASH1 0xHASH2
+    python3 scripts/receipt_tracker.py 0xHASH --from-block 55000000 --to-block 55000200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from rpc_client import RpcClient, RpcError, make_client
+from rpc_types import Block, Receipt
+from transport import TransportError
+
+# Blocks on top of the inclusion block before a tx counts as confirmed
+DEFAULT_CONFIRMATIONS = 5
+# Matches the app's 5-minute polling timeout at ~2s Polygon blocks
+DEFAULT_TIMEOUT_BLOCKS = 150
+# Canonical hashes kept for reorg detection, beyond the confirmation depth
+REORG_MEMORY_BLOCKS = 64
+
+# JSON-RPC "method not found", and how providers without that code phrase it
+METHOD_NOT_FOUND = -32601
+UNSUPPORTED_HINTS = ("method not found", "not supported", "does not exist")
+
+
+class TrackedTx:
+    """🧾 Tracking state of one transaction hash"""
+
+    __slots__ = ("tx_hash", "first_block", "block", "block_hash", "receipt")
+
+    def __init__(self, tx_hash: str, first_block: Optional[int] = None):
+        self.tx_hash = tx_hash
+        self.first_block = first_block
+        self.block: Optional[int] = None
+        self.block_hash: Optional[str] = None
+        self.receipt: Optional[Receipt] = None
+
+    @property
+    def status(self) -> Optional[str]:
+        if self.receipt is None:
+            return None
+        return "success" if self.receipt.succeeded else "failed"
+
+
+class ReceiptTracker:
+    """🧾 Resolve many pending tx hashes against one receipts fetch per block"""
+
+    def __init__(self, rpc: RpcClient, confirmations: int = DEFAULT_CONFIRMATIONS,
+                 timeout_blocks: int = DEFAULT_TIMEOUT_BLOCKS):
+        self.rpc = rpc
+        self.confirmations = confirmations
+        self.timeout_blocks = timeout_blocks
+        self.tracked: Dict[str, TrackedTx] = {}
+        self.canonical: Dict[int, str] = {}
+        self.head: Optional[int] = None
+        # Flipped off the first time the endpoint rejects eth_getBlockReceipts
+        self.block_receipts_supported = True
+
+    def track(self, tx_hash: str) -> None:
+        """➕ Start following ``tx_hash``"""
+        key = tx_hash.lower()
+        if key not in self.tracked:
+            self.tracked[key] = TrackedTx(tx_hash, self.head)
+
+    def untrack(self, tx_hash: str) -> None:
+        self.tracked.pop(tx_hash.lower(), None)
+
+    @property
+    def pending(self) -> List[TrackedTx]:
+        return [tx for tx in self.tracked.values() if tx.block is None]
+
+    def depth(self, tx_hash: str) -> Optional[int]:
+        """📏 Confirmation depth (1 = in the head block), None while pending"""
+        tx = self.tracked.get(tx_hash.lower())
+        if tx is None or tx.block is None or self.head is None:
+            return None
+        return self.head - tx.block + 1
+
+    def _fetch(self, number: int) -> Tuple[Block, Dict[str, Receipt]]:
+        """📦 Header plus receipts of pending txs in block ``number``"""
+        tag = hex(number)
+        want_receipts = bool(self.pending)
+        if want_receipts and self.block_receipts_supported:
+            header, receipts = self.rpc.batch([
+                ("eth_getBlockByNumber", [tag, False], Block),
+                ("eth_getBlockReceipts", [tag], List[Receipt]),
+            ])
+            if isinstance(receipts, RpcError):
+                message = receipts.message.lower()
+                if receipts.code != METHOD_NOT_FOUND and not any(hint in message for hint in UNSUPPORTED_HINTS):
+                    raise receipts
+                self.block_receipts_supported = False
+            else:
+                if header is None or isinstance(header, RpcError):
+                    raise ValueError(f"Block {number} not available yet")
+                return header, {r.transaction_hash.lower(): r for r in receipts or []}
+
+        header = self.rpc.call("eth_getBlockByNumber", [tag, False], Block)
+        if header is None:
+            raise ValueError(f"Block {number} not available yet")
+        if not want_receipts:
+            return header, {}
+        pending = {tx.tx_hash.lower() for tx in self.pending}
+        hits = [tx_hash for tx_hash in header.transactions if tx_hash.lower() in pending]
+        results = self.rpc.batch([("eth_getTransactionReceipt", [tx_hash], Receipt) for tx_hash in hits])
+        return header, {
+            tx_hash.lower(): receipt for tx_hash, receipt in zip(hits, results)
+            if receipt is not None and not isinstance(receipt, RpcError)
+        }
+
+    def _resolve(self, number: int, header: Block, receipts: Dict[str, Receipt],
+                 events: List[Dict[str, Any]]) -> None:
+        self.canonical[number] = header.hash
+        for tx in self.pending:
+            receipt = receipts.get(tx.tx_hash.lower())
+            if receipt is None:
+                continue
+            tx.block, tx.block_hash, tx.receipt = number, header.hash, receipt
+            events.append({"event": "mined", "block": number, "tx_hash": tx.tx_hash, "status": tx.status,
+                           "gas_used": int(receipt.gas_used), "block_hash": header.hash})
+
+    def _find_fork(self, height: int) -> int:
+        """🔀 Lowest height whose remembered hash is no longer canonical"""
+        while height in self.canonical:
+            header = self.rpc.call("eth_getBlockByNumber", [hex(height), False], Block)
+            if header is not None and header.hash == self.canonical[height]:
+                break
+            height -= 1
+        return height + 1
+
+    def _rollback(self, fork: int, number: int, events: List[Dict[str, Any]]) -> None:
+        for height in [h for h in self.canonical if h >= fork]:
+            del self.canonical[height]
+        for tx in self.tracked.values():
+            if tx.block is not None and tx.block >= fork:
+                events.append({"event": "reorged", "block": number, "tx_hash": tx.tx_hash,
+                               "old_block": tx.block, "old_block_hash": tx.block_hash})
+                tx.block, tx.block_hash, tx.receipt = None, None, None
+
+    def on_block(self, number: int) -> List[Dict[str, Any]]:
+        """🧱 Advance to block ``number`` and return the resulting events"""
+        events: List[Dict[str, Any]] = []
+        header, receipts = self._fetch(number)
+
+        parent = self.canonical.get(number - 1)
+        if parent is not None and header.parent_hash != parent:
+            fork = self._find_fork(number - 1)
+            self._rollback(fork, number, events)
+            for height in range(fork, number):
+                self._resolve(height, *self._fetch(height), events)
+            # Rolled-back txs may sit in this block too
+            header, receipts = self._fetch(number)
+        elif number in self.canonical and self.canonical[number] != header.hash:
+            # Same height delivered twice with a different hash
+            self._rollback(number, number, events)
+        self._resolve(number, header, receipts, events)
+        self.head = number
+
+        for key, tx in list(self.tracked.items()):
+            if tx.first_block is None:
+                tx.first_block = number
+            if tx.block is not None:
+                depth = number - tx.block + 1
+                if depth >= self.confirmations:
+                    events.append({"event": "confirmed", "block": number, "tx_hash": tx.tx_hash,
+                                   "status": tx.status, "depth": depth})
+                    del self.tracked[key]
+            elif number - tx.first_block >= self.timeout_blocks:
+                events.append({"event": "dropped", "block": number, "tx_hash": tx.tx_hash,
+                               "waited_blocks": number - tx.first_block})
+                del self.tracked[key]
+
+        keep_from = number - self.confirmations - REORG_MEMORY_BLOCKS
+        for height in [h for h in self.canonical if h < keep_from]:
+            del self.canonical[height]
+        return events
+
+    def run_range(self, start: int, end: int) -> Iterable[Dict[str, Any]]:
+        """⏪ Replay blocks ``start..end`` (inclusive), e.g. over recorded history"""
+        for number in range(start, end + 1):
+            yield from self.on_block(number)
+            if not self.tracked:
+                return
+
+    async def follow(self, heads: AsyncIterator[Block]) -> AsyncIterator[Dict[str, Any]]:
+        """📡 Advance on every header from ``head_monitor.head_stream`` until nothing is tracked"""
+        async for header in heads:
+            head = header.number
+            start = head if self.head is None else self.head + 1
+            if head < start and self.canonical.get(head) != header.hash:
+                start = head  # reorg to an equal or lower height
+            for number in range(start, head + 1):
+                try:
+                    events = await asyncio.to_thread(self.on_block, number)
+                except (RpcError, TransportError, ValueError) as e:
+                    print(f"⚠️ Block {number}: {e} - will retry with the next head", file=sys.stderr)
+                    break
+                for event in events:
+                    yield event
+            if not self.tracked:
+                return
+
+
+def main():
+    """🚀 Main execution function"""
+    parser = argparse.ArgumentParser(description="🧾 1Limit block-driven receipt tracker")
+    parser.add_argument("tx_hashes", nargs="+", help="🧾 Transaction hashes to follow")
+    parser.add_argument("--confirmations", type=int, default=DEFAULT_CONFIRMATIONS,
+                        help="📏 Depth at which a tx counts as confirmed")
+    parser.add_argument("--timeout-blocks", type=int, default=DEFAULT_TIMEOUT_BLOCKS,
+                        help="⏰ Blocks to wait before a tx is reported dropped")
+    parser.add_argument("--from-block", type=int, help="⏪ Replay history from this block instead of following heads")
+    parser.add_argument("--to-block", type=int, help="⏪ Last block to replay (default: from-block + timeout)")
+    parser.add_argument("--rpc-url", action="append", dest="rpc_urls",
+                        help="🌐 Polygon RPC endpoint, repeatable (default: routed endpoint pool)")
+    parser.add_argument("--ws-url", default=None, help="🔌 WebSocket endpoint ('' = poll only)")
+    args = parser.parse_args()
+
+    rpc = make_client(args.rpc_urls)
+    tracker = ReceiptTracker(rpc, args.confirmations, args.timeout_blocks)
+
+    def emit(event: Dict[str, Any]) -> None:
+        sys.stdout.write(json.dumps(event) + "\n")
+        sys.stdout.flush()
+
+    if args.from_block is not None:
+        tracker.head = args.from_block - 1
+        for tx_hash in args.tx_hashes:
+            tracker.track(tx_hash)
+        end = args.to_block if args.to_block is not None else args.from_block + args.timeout_blocks
+        for event in tracker.run_range(args.from_block, end):
+            emit(event)
+    else:
+        from head_monitor import DEFAULT_WS_URL, head_stream
+
+        for tx_hash in args.tx_hashes:
+            tracker.track(tx_hash)
+        ws_url = DEFAULT_WS_URL if args.ws_url is None else args.ws_url
+
+        async def follow() -> None:
+            async for event in tracker.follow(head_stream(rpc, ws_url or None)):
+                emit(event)
+
+        try:
+            asyncio.run(follow())
+        except KeyboardInterrupt:
+            print("\n👋 Tracker stopped", file=sys.stderr)
+
+    if tracker.tracked:
+        print(f"⏳ {len(tracker.tracked)} transaction(s) still unconfirmed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+⏪ Revert-reason extraction by replaying a transaction with eth_call
+=====================================================================
+
+Public Polygon nodes do not serve ``debug_traceTransaction``, so instead we
+re-execute the failed transaction as an ``eth_call`` at ``blockNumber - 1``
+with the same sender, target, value, gas and calldata, capture the revert
+data the node returns and decode it against Router V6 custom errors,
+``Error(string)`` and ``Panic(uint256)``.
+
+The replay runs against the parent block's state, so a revert caused by an
+earlier transaction in the same block (e.g. a competing fill) may replay
+as a success; that case is reported as ``replay_succeeded``.
+"""
+
+import re
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+from rpc_client import RpcClient, RpcError
+from rpc_types import Transaction
+
+ERROR_STRING_SELECTOR = bytes.fromhex("08c379a0")  # Error(string)
+PANIC_SELECTOR = bytes.fromhex("4e487b71")         # Panic(uint256)
+
+# Router V6 (Limit Order Protocol v4) custom errors: selector -> (name, hint)
+ROUTER_V6_ERRORS: Dict[bytes, Tuple[str, str]] = {
+    bytes.fromhex(selector): entry for selector, entry in {
+        "5cd5d233": ("BadSignature", "✍️  EIP-712 signature does not recover to the maker"),
+        "d4dfdafe": ("PrivateOrder", "🔒 Order is restricted to a different taker (allowed sender)"),
+        "c56873ba": ("OrderExpired", "⏰ Order expiration is before the block timestamp"),
+        "f71fbda2": ("InvalidatedOrder", "🚫 Order was cancelled or fully filled"),
+        "a4f62a96": ("BitInvalidatedOrder", "🔢 Nonce bit already used (order filled or cancelled)"),
+        "aa3eef95": ("RemainingInvalidatedOrder", "🔢 Order has no remaining amount"),
+        "e3e8b052": ("WrongSeriesNonce", "🔢 Maker epoch/series nonce does not match"),
+        "fba5a276": ("SwapWithZeroAmount", "0️⃣  Computed fill amount is zero"),
+        "8ef0017c": ("PartialFillNotAllowed", "🧩 Order forbids partial fills"),
+        "7f902a93": ("TakingAmountExceeded", "📈 Taking amount exceeds the threshold"),
+        "fb8ae129": ("TakingAmountTooHigh", "📈 Taking amount above taker threshold"),
+        "481ea392": ("MakingAmountTooLow", "📉 Making amount below taker threshold"),
+        "70a03f48": ("TransferFromMakerToTakerFailed", "💰 Maker balance or allowance too low"),
+        "478a5205": ("TransferFromTakerToMakerFailed", "💰 Taker balance or allowance too low"),
+        "b6629c02": ("PredicateIsNotTrue", "🎯 Order predicate evaluated to false"),
+        "86bffaca": ("OrderIsNotSuitableForMassInvalidation", "🚫 Order cannot use mass invalidation"),
+        "9e744e25": ("EpochManagerAndBitInvalidatorsAreIncompatible", "⚙️  Conflicting MakerTraits flags"),
+        "c5f2be51": ("ReentrancyDetected", "🔁 Reentrant fill"),
+        "d97cd9d8": ("MismatchArraysLengths", "📏 Array arguments have different lengths"),
+        "2aefd060": ("InvalidPermit2Transfer", "🔐 Permit2 transfer failed"),
+        "1841b4e1": ("InvalidMsgValue", "💸 Unexpected msg.value for this order"),
+        "1b10b0f9": ("EthDepositRejected", "💸 Native token deposit rejected"),
+        "b2d25e49": ("MissingOrderExtension", "🧩 MakerTraits says HAS_EXTENSION but none was passed"),
+        "74896a7b": ("UnexpectedOrderExtension", "🧩 Extension passed for an order without HAS_EXTENSION"),
+        "dc11ee6b": ("InvalidExtensionHash", "🧩 Extension does not match the order salt"),
+        "f4059071": ("SafeTransferFromFailed", "💰 ERC-20 transferFrom failed"),
+        "fb7f5079": ("SafeTransferFailed", "💰 ERC-20 transfer failed"),
+        "19be9a90": ("ForceApproveFailed", "🔐 ERC-20 approve failed"),
+        "68275857": ("SafePermitBadLength", "🔐 Malformed permit data"),
+        "d93c0665": ("EnforcedPause", "⏸️  Router is paused"),
+    }.items()
+}
+
+PANIC_CODES = {
+    0x01: "assertion failed",
+    0x11: "arithmetic overflow/underflow",
+    0x12: "division by zero",
+    0x21: "invalid enum value",
+    0x31: "pop on empty array",
+    0x32: "array index out of bounds",
+    0x41: "out of memory",
+    0x51: "call to zero-initialized function",
+}
+
+# Whole bytes only, so an odd-length run in the message still decodes
+_HEX_DATA = re.compile(r"0x(?:[0-9a-fA-F]{2}){4,}")
+
+
+class RevertReason(NamedTuple):
+    """🚨 Decoded revert data"""
+    selector: str
+    name: str
+    message: str
+    data: bytes
+
+
+class ReplayResult(NamedTuple):
+    """⏪ Outcome of replaying a transaction"""
+    reverted: bool
+    block: int
+    reason: Optional[RevertReason]
+    error: Optional[str]
+
+
+def decode_revert(data: bytes) -> RevertReason:
+    """🔍 Decode raw revert data into a named reason"""
+    selector = bytes(data[:4])
+    if selector == ERROR_STRING_SELECTOR and len(data) >= 4 + 64:
+        length = int.from_bytes(data[36:68], "big")
+        message = bytes(data[68:68 + length]).decode("utf-8", errors="replace")
+        return RevertReason("0x" + selector.hex(), "Error", message, bytes(data))
+    if selector == PANIC_SELECTOR and len(data) >= 36:
+        code = int.from_bytes(data[4:36], "big")
+        return RevertReason("0x" + selector.hex(), "Panic",
+                            f"0x{code:02x} {PANIC_CODES.get(code, 'unknown panic code')}", bytes(data))
+    if selector in ROUTER_V6_ERRORS:
+        name, hint = ROUTER_V6_ERRORS[selector]
+        return RevertReason("0x" + selector.hex(), name, hint, bytes(data))
+    if not data:
+        return RevertReason("", "EmptyRevert", "Reverted without data (require without message or OOG)", b"")
+    return RevertReason("0x" + selector.hex(), "UnknownError", "Selector not in the Router V6 error table", bytes(data))
+
+
+def extract_revert_data(error: RpcError) -> Optional[bytes]:
+    """📤 Pull revert bytes out of the different shapes nodes use for errors"""
+    candidates = [error.data]
+    if isinstance(error.data, dict):
+        candidates = [error.data.get("data"), error.data.get("result"), error.data.get("originalError")]
+    for candidate in candidates:
+        if isinstance(candidate, dict):
+            candidate = candidate.get("data")
+        if isinstance(candidate, str) and candidate.startswith("0x"):
+            try:
+                return bytes.fromhex(candidate[2:])
+            except ValueError:
+                continue  # not revert data after all; try the other shapes
+
+    # Some providers only embed the data in the message text
+    match = _HEX_DATA.search(error.message or "")
+    if match:
+        return bytes.fromhex(match.group(0)[2:])
+    if "revert" in (error.message or "").lower():
+        return b""
+    return None
+
+
+def replay_call_params(tx: Union[Transaction, Dict[str, Any]]) -> Dict[str, Any]:
+    """🧾 eth_call object reproducing a transaction (fees are omitted on purpose)"""
+    if isinstance(tx, Transaction):
+        call = {"from": tx.sender, "data": tx.input, "gas": hex(tx.gas), "value": hex(tx.value)}
+        if tx.to:
+            call["to"] = tx.to
+        return call
+    call = {"from": tx["from"], "data": tx["input"], "gas": tx["gas"], "value": tx.get("value", "0x0")}
+    if tx.get("to"):
+        call["to"] = tx["to"]
+    return call
+
+
+def replay_transaction(rpc: RpcClient, tx: Union[Transaction, Dict[str, Any]], block_number: int) -> ReplayResult:
+    """⏪ Re-execute ``tx`` at ``block_number - 1`` and decode the revert"""
+    parent = block_number - 1
+    try:
+        rpc.call("eth_call", [replay_call_params(tx), hex(parent)])
+    except RpcError as e:
+        data = extract_revert_data(e)
+        if data is None:
+            return ReplayResult(False, parent, None, str(e))
+        return ReplayResult(True, parent, decode_revert(data), None)
+    return ReplayResult(False, parent, None, None)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+🧩 Router V6 order-fill calldata decoder
+=========================================
+
+Table-driven decoder for every Router V6 (1inch Limit Order Protocol v4)
+order-fill entry point. Calldata is decoded from raw bytes through a
+``memoryview`` (no hex-string slicing) into typed ``Order`` / ``TakerTraits``
+structures, and ``decode_fill_calls`` decodes thousands of inputs in one
+pass for post-mortems over a whole day of fills.
+
+Order layout matches ``RouterV6ABI`` in TransactionSubmitter.swift: a static
+tuple of eight uint256 words, with the address fields packed in the low 20
+bytes.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+ORDER_WORDS = 8
+WORD = 32
+
+# TakerTraits bit layout (LOP v4)
+MAKER_AMOUNT_FLAG = 1 << 255
+UNWRAP_WETH_FLAG = 1 << 254
+SKIP_ORDER_PERMIT_FLAG = 1 << 253
+USE_PERMIT2_FLAG = 1 << 252
+ARGS_HAS_TARGET = 1 << 251
+ARGS_EXTENSION_LENGTH_OFFSET = 224
+ARGS_INTERACTION_LENGTH_OFFSET = 200
+ARGS_LENGTH_MASK = 0xffffff
+AMOUNT_MASK = (1 << 185) - 1
+
+
+class DecodeError(ValueError):
+    """❌ Calldata is not a well-formed Router V6 order fill"""
+
+
+class Order(NamedTuple):
+    """📦 IOrderMixin.Order"""
+    salt: int
+    maker: str
+    receiver: str
+    maker_asset: str
+    taker_asset: str
+    making_amount: int
+    taking_amount: int
+    maker_traits: int
+
+
+class TakerTraits(NamedTuple):
+    """🏷️ Decoded TakerTraits word"""
+    raw: int
+    maker_amount: bool          # amount is a making amount (otherwise taking)
+    unwrap_weth: bool
+    skip_order_permit: bool
+    use_permit2: bool
+    args_has_target: bool
+    extension_length: int
+    interaction_length: int
+    threshold: int
+
+    @classmethod
+    def from_int(cls, value: int) -> "TakerTraits":
+        return cls(
+            raw=value,
+            maker_amount=bool(value & MAKER_AMOUNT_FLAG),
+            unwrap_weth=bool(value & UNWRAP_WETH_FLAG),
+            skip_order_permit=bool(value & SKIP_ORDER_PERMIT_FLAG),
+            use_permit2=bool(value & USE_PERMIT2_FLAG),
+            args_has_target=bool(value & ARGS_HAS_TARGET),
+            extension_length=(value >> ARGS_EXTENSION_LENGTH_OFFSET) & ARGS_LENGTH_MASK,
+            interaction_length=(value >> ARGS_INTERACTION_LENGTH_OFFSET) & ARGS_LENGTH_MASK,
+            threshold=value & AMOUNT_MASK,
+        )
+
+
+class FillCall(NamedTuple):
+    """🎯 One decoded order-fill call"""
+    selector: str
+    method: str
+    order: Order
+    r: Optional[bytes]          # EOA orders: compact signature (r, vs)
+    vs: Optional[bytes]
+    signature: Optional[bytes]  # contract orders: ERC-1271 signature bytes
+    amount: int
+    taker_traits: TakerTraits
+    args: bytes
+
+
+# selector -> (method name, parameters after the Order tuple)
+FILL_METHODS: Dict[bytes, Tuple[str, Tuple[str, ...]]] = {
+    bytes.fromhex("9fda64bd"): ("fillOrder", ("r", "vs", "amount", "taker_traits")),
+    bytes.fromhex("f497df75"): ("fillOrderArgs", ("r", "vs", "amount", "taker_traits", "args")),
+    bytes.fromhex("cc713a04"): ("fillContractOrder", ("signature", "amount", "taker_traits")),
+    bytes.fromhex("56a75868"): ("fillContractOrderArgs", ("signature", "amount", "taker_traits", "args")),
+}
+
+# Parameters encoded as dynamic `bytes` (offset in the head, data in the tail)
+DYNAMIC_PARAMS = {"signature", "args"}
+BYTES32_PARAMS = {"r", "vs"}
+
+
+def _address(view: memoryview, offset: int) -> str:
+    return "0x" + view[offset + 12:offset + WORD].hex()
+
+
+def _uint(view: memoryview, offset: int) -> int:
+    return int.from_bytes(view[offset:offset + WORD], "big")
+
+
+def _dynamic_bytes(args: memoryview, head_value: int) -> bytes:
+    if head_value + WORD > len(args):
+        raise DecodeError(f"bytes offset {head_value} out of range")
+    length = _uint(args, head_value)
+    start = head_value + WORD
+    if start + length > len(args):
+        raise DecodeError(f"bytes length {length} out of range")
+    return bytes(args[start:start + length])
+
+
+def decode_order(view: memoryview, offset: int = 0) -> Order:
+    """📦 Decode the static Order tuple starting at ``offset``"""
+    if len(view) < offset + ORDER_WORDS * WORD:
+        raise DecodeError("calldata too short for Order tuple")
+    return Order(
+        salt=_uint(view, offset),
+        maker=_address(view, offset + WORD),
+        receiver=_address(view, offset + 2 * WORD),
+        maker_asset=_address(view, offset + 3 * WORD),
+        taker_asset=_address(view, offset + 4 * WORD),
+        making_amount=_uint(view, offset + 5 * WORD),
+        taking_amount=_uint(view, offset + 6 * WORD),
+        maker_traits=_uint(view, offset + 7 * WORD),
+    )
+
+
+def _to_bytes(calldata: Union[bytes, bytearray, memoryview, str]) -> memoryview:
+    if isinstance(calldata, str):
+        calldata = bytes.fromhex(calldata[2:] if calldata.startswith("0x") else calldata)
+    return memoryview(calldata)
+
+
+def is_fill_call(calldata: Union[bytes, bytearray, memoryview, str]) -> bool:
+    """🔍 Does ``calldata`` start with a known Router V6 order-fill selector?"""
+    view = _to_bytes(calldata)
+    return bytes(view[:4]) in FILL_METHODS
+
+
+def decode_fill_call(calldata: Union[bytes, bytearray, memoryview, str]) -> FillCall:
+    """🧩 Decode one Router V6 order-fill call (raises DecodeError)"""
+    view = _to_bytes(calldata)
+    selector = bytes(view[:4])
+    method = FILL_METHODS.get(selector)
+    if method is None:
+        raise DecodeError(f"unknown selector 0x{selector.hex()}")
+    name, params = method
+
+    args = view[4:]
+    order = decode_order(args)
+    head = ORDER_WORDS * WORD
+    if len(args) < head + len(params) * WORD:
+        raise DecodeError(f"calldata too short for {name}")
+
+    values: Dict[str, object] = {"r": None, "vs": None, "signature": None, "args": b""}
+    for i, param in enumerate(params):
+        offset = head + i * WORD
+        if param in DYNAMIC_PARAMS:
+            values[param] = _dynamic_bytes(args, _uint(args, offset))
+        elif param in BYTES32_PARAMS:
+            values[param] = bytes(args[offset:offset + WORD])
+        else:
+            values[param] = _uint(args, offset)
+
+    return FillCall(
+        selector="0x" + selector.hex(),
+        method=name,
+        order=order,
+        r=values["r"],
+        vs=values["vs"],
+        signature=values["signature"],
+        amount=values["amount"],
+        taker_traits=TakerTraits.from_int(values["taker_traits"]),
+        args=values["args"],
+    )
+
+
+def decode_fill_calls(inputs: Iterable[Union[bytes, bytearray, memoryview, str]]) -> List[Optional[FillCall]]:
+    """📚 Batch-decode many inputs; non-fill or malformed calldata yields None"""
+    decoded: List[Optional[FillCall]] = []
+    for calldata in inputs:
+        try:
+            decoded.append(decode_fill_call(calldata))
+        except (DecodeError, ValueError):
+            decoded.append(None)
+    return decoded
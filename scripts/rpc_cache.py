@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+🗄️ Block-pinned JSON-RPC read cache
+====================================
+
+Reads pinned to a specific block (``eth_call`` / ``eth_getBalance`` at
+``hex(block_number)``), mined transactions and their receipts never change
+once the block is final, so they are stored permanently in a small SQLite
+file. Re-running a post-mortem on the same transaction is then served
+entirely from disk.
+
+Only results at least ``FINALITY_DEPTH`` blocks below the chain head are
+stored, so a Polygon reorg can never poison the cache. ``latest``/
+``pending`` reads are never cached here.
+
+The cache lives at ``~/.cache/1limit/rpc_cache.sqlite3`` unless
+``ONELIMIT_RPC_CACHE`` points somewhere else.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "ONELIMIT_RPC_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "1limit", "rpc_cache.sqlite3"),
+)
+
+# Blocks below head after which Polygon state is treated as immutable
+FINALITY_DEPTH = 128
+
+# Methods whose block argument sits at this params index
+BLOCK_PARAM_INDEX = {
+    "eth_call": 1,
+    "eth_getBalance": 1,
+    "eth_getTransactionCount": 1,
+    "eth_getCode": 1,
+    "eth_getStorageAt": 2,
+    "eth_getBlockByNumber": 0,
+    "eth_getBlockReceipts": 0,
+}
+
+# Methods keyed by a hash whose result carries the block it was mined in
+MINED_RESULT_METHODS = {
+    "eth_getTransactionByHash",
+    "eth_getTransactionReceipt",
+    "eth_getBlockByHash",
+}
+
+
+def cache_key(method: str, params: list) -> str:
+    """🔑 Canonical key: method plus params with sorted keys and lowercased hex"""
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":")).lower()
+    return f"{method}:{canonical}"
+
+
+def pinned_block(method: str, params: list) -> Optional[int]:
+    """🧱 Block number a request is pinned to, or None for tags like ``latest``"""
+    index = BLOCK_PARAM_INDEX.get(method)
+    if index is None or len(params) <= index:
+        return None
+    tag = params[index]
+    if isinstance(tag, str) and tag.startswith("0x"):
+        return int(tag, 16)
+    return None
+
+
+def result_block(method: str, result: Any) -> Optional[int]:
+    """🧱 Block a hash-keyed result was mined in (None while still pending)"""
+    if method not in MINED_RESULT_METHODS or not isinstance(result, dict):
+        return None
+    block = result.get("blockNumber") or result.get("number")
+    if isinstance(block, str) and block.startswith("0x"):
+        return int(block, 16)
+    return None
+
+
+class BlockPinnedCache:
+    """🗄️ Persistent SQLite store for immutable JSON-RPC results"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, finality_depth: int = FINALITY_DEPTH):
+        self.path = path
+        self.finality_depth = finality_depth
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rpc_cache (key TEXT PRIMARY KEY, block INTEGER, value TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, method: str, params: list) -> Tuple[bool, Any]:
+        """📖 Return ``(hit, result)``"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM rpc_cache WHERE key = ?", (cache_key(method, params),)
+            ).fetchone()
+        if row is None:
+            return False, None
+        return True, json.loads(row[0])
+
+    def is_cacheable(self, method: str, params: list) -> bool:
+        """🤔 Could this request ever be served from the cache?"""
+        return method in MINED_RESULT_METHODS or pinned_block(method, params) is not None
+
+    def put(self, method: str, params: list, result: Any, latest_block: Callable[[], Optional[int]]) -> bool:
+        """💾 Store ``result`` if it is final; ``latest_block`` is only called when needed"""
+        if result is None:
+            return False
+        block = pinned_block(method, params)
+        if block is None:
+            block = result_block(method, result)
+        if block is None:
+            return False
+
+        head = latest_block()
+        if head is None or head - block < self.finality_depth:
+            return False
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO rpc_cache (key, block, value) VALUES (?, ?, ?)",
+                (cache_key(method, params), block, json.dumps(result, separators=(",", ":"))),
+            )
+            self._db.commit()
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
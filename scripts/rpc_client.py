@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+🌐 Shared Polygon JSON-RPC client for the debug scripts
+========================================================
+
+A small raw JSON-RPC client used instead of ad-hoc ``requests.post`` calls
+and ``web3`` lookups. Requests go through the shared pooled transport behind
+the per-endpoint rate limiter, and when given a ``BlockPinnedCache`` the
+client reads through it, so block-pinned reads, mined transactions and
+their receipts only ever hit the network once. Identical concurrent reads
+are coalesced into one request by the process-wide ``SingleFlight``.
+
+Calls given a ``result_type`` (a struct from rpc_types.py, or a ``List`` of
+one) come back decoded straight from the response bytes into that type;
+without one they return plain JSON as before.
+"""
+
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+
+from rate_limit import get_limiter
+from rpc_cache import BlockPinnedCache
+from rpc_types import Log, as_json, decode_response, decode_result
+from single_flight import SingleFlight, get_single_flight
+from transport import HttpTransport, TransportError
+
+# Polygon Mainnet RPC endpoint (matching iOS app configuration)
+POLYGON_RPC_URL = "https://polygon-bor-rpc.publicnode.com"
+
+# How providers phrase "this eth_getLogs range returns too much" (-32005 is the common code)
+LOGS_LIMIT_CODE = -32005
+LOGS_LIMIT_HINTS = ("block range", "response size", "query returned more than", "limit exceeded",
+                    "too many results", "too large", "timeout", "timed out")
+
+
+def _result_type(call: tuple) -> Any:
+    return call[2] if len(call) > 2 else None
+
+
+class RpcError(Exception):
+    """❌ JSON-RPC error object returned by the node"""
+
+    def __init__(self, method: str, error: Any):
+        self.method = method
+        self.error = error
+        if isinstance(error, dict):
+            self.code = error.get('code')
+            self.message = error.get('message', '')
+            self.data = error.get('data')
+        else:
+            self.code, self.message, self.data = None, str(error), None
+        super().__init__(f"{method}: {self.message}")
+
+
+def logs_range_too_large(error: Exception) -> bool:
+    """📏 True when an eth_getLogs failure means the node wants fewer blocks per request"""
+    if isinstance(error, RpcError):
+        message = error.message.lower()
+        # Some providers also use -32005 for "rate limit exceeded"; splitting the range would not help
+        if "rate" in message:
+            return False
+        return error.code == LOGS_LIMIT_CODE or any(hint in message for hint in LOGS_LIMIT_HINTS)
+    if isinstance(error, TransportError):
+        # Read timeouts and oversized responses. Never throttling (the rate limiter owns 429), and never
+        # connection failures: a refused connection or DNS error fails the same way for any range
+        return error.timed_out or error.status in (413, 502, 504)
+    return False
+
+
+class RpcClient:
+    """🌐 JSON-RPC client with an optional read-through block-pinned cache"""
+
+    def __init__(self, rpc_url: str = POLYGON_RPC_URL, cache: Optional[BlockPinnedCache] = None,
+                 transport: Optional[HttpTransport] = None, flight: Optional[SingleFlight] = None):
+        self.rpc_url = rpc_url
+        self.cache = cache
+        self.transport = transport or get_limiter()
+        self.flight = flight or get_single_flight()
+        self._request_ids = itertools.count(1)
+        self._latest_block: Optional[int] = None
+        # Flipped off the first time the endpoint rejects an array payload
+        self.batch_supported = True
+
+    def _post(self, method: str, params: list, typed: bool = False) -> Any:
+        """📮 One call; with ``typed`` the result is left undecoded for ``_decode``"""
+        payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": next(self._request_ids)}
+        if typed:
+            data = self.transport.post(self.rpc_url, payload, decode=decode_response)
+        else:
+            data = self.transport.post(self.rpc_url, payload)
+        if 'error' in data:
+            raise RpcError(method, data['error'])
+        return data.get('result')
+
+    def _decode(self, method: str, result: Any, result_type: Any) -> Any:
+        try:
+            return decode_result(result, result_type)
+        except ValueError as e:
+            raise TransportError(f"Failed to parse {method} result: {e}", url=self.rpc_url) from e
+
+    def _fetch(self, method: str, params: list, result_type: Any = None) -> Any:
+        result = self._post(method, params, typed=result_type is not None)
+        if self.cache is not None and self.cache.is_cacheable(method, params):
+            self.cache.put(method, params, as_json(result), self.latest_block)
+        return self._decode(method, result, result_type)
+
+    def call(self, method: str, params: list, result_type: Any = None) -> Any:
+        """📞 Make a JSON-RPC call, serving immutable results from the cache
+
+        Identical reads made concurrently from other threads share one
+        request (see single_flight.py). With ``result_type`` the result is
+        decoded into that rpc_types struct (None stays None).
+        """
+        if self.cache is not None and self.cache.is_cacheable(method, params):
+            hit, result = self.cache.get(method, params)
+            if hit:
+                return self._decode(method, result, result_type)
+        return self.flight.call(self.rpc_url, method, params,
+                                lambda: self._fetch(method, params, result_type), result_type)
+
+    def _send(self, calls: List[tuple]) -> List[Any]:
+        """📮 Send ``calls`` as one array payload (sequentially if the endpoint refuses arrays)
+
+        Results of typed calls are left undecoded for ``_decode``.
+        """
+        results: List[Any] = [None] * len(calls)
+        if len(calls) == 1 or not self.batch_supported:
+            for i, call in enumerate(calls):
+                try:
+                    results[i] = self._post(call[0], call[1], typed=_result_type(call) is not None)
+                except RpcError as e:
+                    results[i] = e
+            return results
+
+        payload = [
+            {"jsonrpc": "2.0", "method": call[0], "params": call[1], "id": next(self._request_ids)}
+            for call in calls
+        ]
+        try:
+            if any(_result_type(call) is not None for call in calls):
+                data = self.transport.post(self.rpc_url, payload, decode=decode_response)
+            else:
+                data = self.transport.post(self.rpc_url, payload)
+        except TransportError as e:
+            if e.status is None or e.status == 429 or e.status >= 500:
+                raise
+            data = None  # 4xx: endpoint refuses array payloads
+        if not isinstance(data, list):
+            # Endpoint rejects array payloads - remember and go sequential
+            self.batch_supported = False
+            return self._send(calls)
+        by_id = {item.get('id'): item for item in data if isinstance(item, dict)}
+        for i, request in enumerate(payload):
+            item = by_id.get(request['id'])
+            if item is None:
+                # Some providers cap batch size and drop the tail - retry it alone
+                try:
+                    results[i] = self._post(calls[i][0], calls[i][1], typed=_result_type(calls[i]) is not None)
+                except RpcError as e:
+                    results[i] = e
+            elif 'error' in item:
+                results[i] = RpcError(calls[i][0], item['error'])
+            else:
+                results[i] = item.get('result')
+        return results
+
+    def batch(self, calls: List[tuple]) -> List[Any]:
+        """📦 Several calls in one round-trip (cache hits are never sent)
+
+        Each call is ``(method, params)`` or ``(method, params, result_type)``.
+        Results are returned in call order; a call the node rejected yields
+        an ``RpcError`` instance in its slot instead of raising, so one bad
+        call does not discard the rest of the batch. Duplicate calls in the
+        batch, and calls another thread already has in flight, are not sent
+        again.
+        """
+        results: List[Any] = [None] * len(calls)
+        leaders: List[int] = []
+        leader_flights: List[Any] = []
+        followers: List[Tuple[int, Any]] = []
+        duplicates: List[Tuple[int, int]] = []
+        first_by_key: Dict[str, int] = {}
+        for i, call in enumerate(calls):
+            method, params, result_type = call[0], call[1], _result_type(call)
+            if self.cache is not None and self.cache.is_cacheable(method, params):
+                hit, result = self.cache.get(method, params)
+                if hit:
+                    results[i] = self._decode(method, result, result_type)
+                    continue
+            key = self.flight.key(self.rpc_url, method, params, result_type)
+            if key is None:
+                leaders.append(i)
+                leader_flights.append(None)
+                continue
+            if key in first_by_key:
+                duplicates.append((i, first_by_key[key]))
+                continue
+            first_by_key[key] = i
+            flight, leader = self.flight.begin(key)
+            if leader:
+                leaders.append(i)
+                leader_flights.append((key, flight))
+            else:
+                followers.append((i, flight))
+
+        if leaders:
+            try:
+                sent = self._send([calls[i] for i in leaders])
+                decoded = [result if isinstance(result, RpcError)
+                           else self._decode(calls[i][0], result, _result_type(calls[i]))
+                           for i, result in zip(leaders, sent)]
+            except BaseException as e:
+                for entry in leader_flights:
+                    if entry is not None:
+                        self.flight.finish(entry[0], entry[1], error=e)
+                raise
+            for i, result, entry in zip(leaders, decoded, leader_flights):
+                results[i] = result
+                if entry is None:
+                    continue
+                if isinstance(result, RpcError):
+                    self.flight.finish(entry[0], entry[1], error=result)
+                else:
+                    self.flight.finish(entry[0], entry[1], result, ttl=self.flight.ttl_for(calls[i][0], calls[i][1]))
+            # Only after every flight is released: a cache put may itself need eth_blockNumber
+            if self.cache is not None:
+                for i, result in zip(leaders, sent):
+                    method, params = calls[i][0], calls[i][1]
+                    if not isinstance(result, RpcError) and self.cache.is_cacheable(method, params):
+                        self.cache.put(method, params, as_json(result), self.latest_block)
+
+        for i, flight in followers:
+            try:
+                results[i] = flight.wait()
+            except RpcError as e:
+                results[i] = e
+        for i, first in duplicates:
+            results[i] = results[first]
+        return results
+
+    def latest_block(self) -> Optional[int]:
+        """🧱 Chain head, fetched at most once per client (only needed on cache misses)"""
+        if self._latest_block is None:
+            self._latest_block = int(self.flight.call(self.rpc_url, "eth_blockNumber", [],
+                                                      lambda: self._post("eth_blockNumber", [])), 16)
+        return self._latest_block
+
+    def eth_call(self, to: str, data: str, block: str = "latest") -> str:
+        """📞 Read-only contract call"""
+        return self.call("eth_call", [{"to": to, "data": data}, block])
+
+    def get_logs(self, log_filter: dict, from_block: int, to_block: int,
+                 chunk_size: Optional[int] = None) -> List[Log]:
+        """📜 ``eth_getLogs`` over ``from_block..to_block`` with adaptive range splitting
+
+        The range is walked in chunks of ``chunk_size`` blocks (default: all
+        at once). Whenever the node refuses a chunk as too large the chunk is
+        halved and retried; after a success it grows back towards
+        ``chunk_size``. Logs come back typed, in chain order.
+        """
+        max_span = chunk_size or (to_block - from_block + 1)
+        span = max_span
+        logs: List[Log] = []
+        start = from_block
+        while start <= to_block:
+            end = min(start + span - 1, to_block)
+            try:
+                chunk = self.call("eth_getLogs", [{**log_filter, "fromBlock": hex(start), "toBlock": hex(end)}],
+                                  List[Log])
+            except (RpcError, TransportError) as e:
+                if end == start or not logs_range_too_large(e):
+                    raise
+                span = max(1, (end - start + 1) // 2)
+                continue
+            logs.extend(chunk or [])
+            start = end + 1
+            span = min(max_span, span * 2)
+        return logs
+
+
+def make_client(rpc_urls: Optional[List[str]] = None, cache: Optional[BlockPinnedCache] = None) -> RpcClient:
+    """🧭 Client for one endpoint, or routed over a pool with failover
+
+    With exactly one URL the client talks to it directly; with several (or
+    none, meaning the ``rpc_router.DEFAULT_ENDPOINTS`` pool) calls go through
+    an ``RpcRouter`` that picks the fastest healthy endpoint.
+    """
+    from rpc_router import RpcRouter, get_router
+
+    if rpc_urls and len(rpc_urls) == 1:
+        return RpcClient(rpc_urls[0], cache=cache)
+    router = RpcRouter(rpc_urls) if rpc_urls else get_router()
+    return RpcClient(",".join(stats.url for stats in router.endpoints), cache=cache, transport=router)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+🧭 Multi-endpoint RPC router with latency-based selection and failover
+=======================================================================
+
+Every script used to pin one public endpoint, which made that endpoint a
+single point of failure. ``RpcRouter`` spreads calls over a pool of Polygon
+endpoints instead:
+
+* tracks p50/p99 latency and error rate per endpoint over a sliding window
+* sends each call to the fastest healthy endpoint (unmeasured ones first)
+* hedges slow reads: if the first endpoint has not answered within its own
+  p99 (clamped), the same read goes to the next endpoint and the first
+  answer wins
+* fails over on 429, 5xx and network errors, benching the endpoint for the
+  Retry-After period (or a default cooldown)
+
+The router sits above per-endpoint rate limiting, not behind it: its
+default transport is ``get_limiter().without_retries()``, which paces each
+endpoint but hands a throttle straight back, so the first 429/503 moves the
+call to the next endpoint rather than backing off on the same one.
+
+The router has the same ``post(url, payload)`` shape as ``HttpTransport``,
+so it plugs straight into ``RpcClient``; the ``url`` argument is ignored
+because the router picks the endpoint. Point it at local mock servers with
+injected latency to exercise selection, hedging and failover.
+
+Configuration:
+    ONELIMIT_RPC_URLS   comma-separated endpoint list (default: the two
+                        endpoints used by the scripts and the iOS app)
+"""
+
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Iterable, List, Optional
+
+from rate_limit import get_limiter
+from transport import HttpTransport, TransportError
+
+DEFAULT_ENDPOINTS = [
+    url.strip() for url in os.environ.get(
+        "ONELIMIT_RPC_URLS",
+        "https://polygon-bor-rpc.publicnode.com,https://polygon-rpc.com",
+    ).split(",") if url.strip()
+]
+
+# Sliding window of samples per endpoint
+WINDOW_SIZE = 200
+# An endpoint failing more than this share of recent calls is unhealthy
+MAX_ERROR_RATE = 0.5
+# Bench time after a 429/5xx without Retry-After
+DEFAULT_COOLDOWN = 10.0
+# Hedge delay bounds (seconds)
+MIN_HEDGE_DELAY = 0.05
+MAX_HEDGE_DELAY = 2.0
+
+# Methods that change chain state are never hedged
+WRITE_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction"}
+
+
+def _is_read(payload: Any) -> bool:
+    requests = payload if isinstance(payload, list) else [payload]
+    return all(request.get("method") not in WRITE_METHODS for request in requests)
+
+
+def _retryable(error: TransportError) -> bool:
+    return error.status is None or error.status == 429 or error.status >= 500
+
+
+def percentile(values: Iterable[float], q: float) -> Optional[float]:
+    """📐 Nearest-rank ``q`` quantile of ``values`` (None when empty)"""
+    samples = sorted(values)
+    if not samples:
+        return None
+    return samples[min(len(samples) - 1, int(round(q * (len(samples) - 1))))]
+
+
+class EndpointStats:
+    """📊 Sliding-window latency and error statistics for one endpoint"""
+
+    def __init__(self, url: str, window: int = WINDOW_SIZE):
+        self.url = url
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)  # True = error
+        self.benched_until = 0.0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            self.outcomes.append(False)
+
+    def record_error(self, cooldown: Optional[float] = None) -> None:
+        with self._lock:
+            self.outcomes.append(True)
+            if cooldown:
+                self.benched_until = max(self.benched_until, time.monotonic() + cooldown)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = list(self.latencies)
+        return percentile(samples, q)
+
+    @property
+    def p50(self) -> Optional[float]:
+        with self._lock:
+            return statistics.median(self.latencies) if self.latencies else None
+
+    @property
+    def p99(self) -> Optional[float]:
+        return self.percentile(0.99)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def is_healthy(self) -> bool:
+        return time.monotonic() >= self.benched_until and self.error_rate <= MAX_ERROR_RATE
+
+    def snapshot(self) -> dict:
+        return {
+            "url": self.url,
+            "p50_ms": None if self.p50 is None else round(self.p50 * 1000, 1),
+            "p99_ms": None if self.p99 is None else round(self.p99 * 1000, 1),
+            "error_rate": round(self.error_rate, 3),
+            "samples": len(self.outcomes),
+            "healthy": self.is_healthy(),
+        }
+
+
+class RpcRouter:
+    """🧭 Route JSON-RPC payloads to the fastest healthy endpoint"""
+
+    def __init__(self, endpoints: Optional[List[str]] = None, transport: Optional[HttpTransport] = None,
+                 hedge: bool = True):
+        endpoints = endpoints or DEFAULT_ENDPOINTS
+        if not endpoints:
+            raise ValueError("RpcRouter needs at least one endpoint")
+        self.endpoints = [EndpointStats(url) for url in endpoints]
+        self.transport = transport or get_limiter().without_retries()
+        self.hedge = hedge and len(self.endpoints) > 1
+
+    def ranked(self) -> List[EndpointStats]:
+        """🏁 Healthy endpoints fastest-first (unmeasured first), then benched ones"""
+        def speed(stats: EndpointStats) -> float:
+            return -1.0 if stats.p50 is None else stats.p50
+
+        healthy = sorted((s for s in self.endpoints if s.is_healthy()), key=speed)
+        unhealthy = sorted((s for s in self.endpoints if not s.is_healthy()),
+                           key=lambda s: (s.benched_until, s.error_rate))
+        return healthy + unhealthy
+
+    def _send(self, stats: EndpointStats, payload: Any, decode: Optional[Callable[[bytes], Any]] = None) -> Any:
+        started = time.perf_counter()
+        try:
+            result = self.transport.post(stats.url, payload, decode=decode)
+        except TransportError as e:
+            if _retryable(e):
+                stats.record_error(e.retry_after if e.retry_after is not None else DEFAULT_COOLDOWN)
+            else:
+                stats.record_error()
+            raise
+        stats.record_success(time.perf_counter() - started)
+        return result
+
+    def _hedge_delay(self, stats: EndpointStats) -> float:
+        p99 = stats.p99
+        if p99 is None:
+            return MAX_HEDGE_DELAY
+        return min(MAX_HEDGE_DELAY, max(MIN_HEDGE_DELAY, p99))
+
+    def _submit(self, stats: EndpointStats, payload: Any, decode: Optional[Callable[[bytes], Any]] = None) -> Future:
+        """🧵 Run ``_send`` on a daemon thread
+
+        Hedge losers are left running, so they must not hold up interpreter
+        exit the way non-daemon executor workers would (they are joined at
+        shutdown, for up to the read timeout). At most one thread per
+        endpoint is started per call.
+        """
+        future: Future = Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self._send(stats, payload, decode))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="rpc-hedge", daemon=True).start()
+        return future
+
+    def post(self, url: str, payload: Any, decode: Optional[Callable[[bytes], Any]] = None) -> Any:
+        """📮 Send ``payload`` through the pool (``url`` is ignored)"""
+        candidates = self.ranked()
+        if self.hedge and _is_read(payload):
+            return self._post_hedged(candidates, payload, decode)
+
+        last_error: Optional[TransportError] = None
+        for stats in candidates:
+            try:
+                return self._send(stats, payload, decode)
+            except TransportError as e:
+                if not _retryable(e):
+                    raise
+                last_error = e
+        raise last_error
+
+    def _post_hedged(self, candidates: List[EndpointStats], payload: Any, decode: Optional[Callable[[bytes], Any]] = None) -> Any:
+        pending = {}
+        queue = list(candidates)
+        last_error: Optional[TransportError] = None
+
+        def launch() -> None:
+            stats = queue.pop(0)
+            pending[self._submit(stats, payload, decode)] = stats
+
+        launch()
+        while pending:
+            # Wait for the in-flight call; if it is slower than its p99, hedge to the next endpoint
+            timeout = self._hedge_delay(next(iter(pending.values()))) if queue else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                launch()
+                continue
+            for future in done:
+                pending.pop(future)
+                try:
+                    result = future.result()
+                except TransportError as e:
+                    if not _retryable(e):
+                        raise
+                    last_error = e
+                    if queue and not pending:
+                        launch()
+                    continue
+                # Losers keep running on their daemon threads; their latency still feeds the stats
+                return result
+        raise last_error
+
+    def stats(self) -> List[dict]:
+        """📊 Per-endpoint p50/p99 latency, error rate and health"""
+        return [stats.snapshot() for stats in self.endpoints]
+
+
+_default_router: Optional[RpcRouter] = None
+_default_lock = threading.Lock()
+
+
+def get_router() -> RpcRouter:
+    """🌍 Process-wide router over ``DEFAULT_ENDPOINTS`` (created on first use)"""
+    global _default_router
+    with _default_lock:
+        if _default_router is None:
+            _default_router = RpcRouter()
+        return _default_router
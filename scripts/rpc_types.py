@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+🧱 Typed JSON-RPC transactions, receipts, logs and blocks
+==========================================================
+
+The node returns every quantity as a hex string, and the scripts used to
+keep the raw dicts and call ``int(x, 16)`` at each use. The structs here
+are decoded straight from the response bytes instead: when a caller passes
+``result_type`` to ``RpcClient.call``/``batch`` (or uses ``get_logs``), the
+transport parses the JSON-RPC envelope with every ``result`` left as raw
+bytes (``msgspec.Raw``), and each result is then decoded directly into
+the requested struct. Quantities become ints once, at decode time, and no
+intermediate dict is built for a receipt, log or block. A mixed batch (a
+header plus that block's receipts) decodes each slot into its own type.
+
+The block-pinned cache still stores the wire JSON, so typed and untyped
+callers share entries; a cache hit is converted into the struct.
+
+Without ``msgspec`` the same classes are plain frozen objects filled from
+the stdlib ``json`` parse, so every tool keeps working, just more slowly.
+
+Requirements:
+    pip install msgspec   # optional, decodes straight from the response bytes
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Union, get_args, get_origin, get_type_hints
+
+from transport import loads
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class Quantity(int):
+    """🔢 Hex quantity (``"0x1a"``) decoded to an int"""
+
+
+def _rename(name: str) -> str:
+    """snake_case field → JSON key (``sender`` stands in for the keyword ``from``)"""
+    if name == "sender":
+        return "from"
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def _dec_hook(tp: Any, value: Any) -> Any:
+    if tp is Quantity:
+        return Quantity(value, 16) if isinstance(value, str) else Quantity(value)
+    raise NotImplementedError(f"Cannot decode {tp!r}")
+
+
+if msgspec is not None:
+    class Struct(msgspec.Struct, rename=_rename, frozen=True, gc=False):
+        """🧱 Base of the typed results (``msgspec.Struct``)"""
+else:
+    class Struct:
+        """🧱 Base of the typed results (stand-in for ``msgspec.Struct``)
+
+        Fields come from the class annotations, in order; those with a
+        class-level value are optional. Instances are read-only.
+        """
+
+        __struct_fields__ = ()
+
+        def __init_subclass__(cls, **kwargs: Any):
+            super().__init_subclass__(**kwargs)
+            cls.__struct_fields__ = tuple(get_type_hints(cls))
+            cls.__struct_encode_fields__ = tuple(_rename(name) for name in cls.__struct_fields__)
+
+        def __init__(self, *args: Any, **kwargs: Any):
+            values = dict(zip(self.__struct_fields__, args), **kwargs)
+            for name in self.__struct_fields__:
+                if name in values:
+                    value = values.pop(name)
+                elif hasattr(type(self), name):
+                    value = getattr(type(self), name)
+                    value = list(value) if isinstance(value, list) else value
+                else:
+                    raise TypeError(f"Missing required argument {name!r}")
+                object.__setattr__(self, name, value)
+            if values:
+                raise TypeError(f"Unexpected keyword argument {next(iter(values))!r}")
+
+        def __setattr__(self, name: str, value: Any) -> None:
+            raise AttributeError(f"immutable type: {type(self).__name__!r}")
+
+        def __eq__(self, other: Any) -> bool:
+            if type(other) is not type(self):
+                return NotImplemented
+            return all(getattr(self, name) == getattr(other, name) for name in self.__struct_fields__)
+
+        def __repr__(self) -> str:
+            fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__struct_fields__)
+            return f"{type(self).__name__}({fields})"
+
+
+class Log(Struct):
+    """📜 ``eth_getLogs`` entry (also inside receipts)"""
+    address: str
+    topics: List[str]
+    data: str
+    block_number: Quantity
+    block_hash: str
+    transaction_hash: str
+    transaction_index: Quantity
+    log_index: Quantity
+    removed: bool = False
+
+
+class Transaction(Struct):
+    """📄 ``eth_getTransactionByHash`` result (block fields are None while pending)"""
+    hash: str
+    sender: str
+    nonce: Quantity
+    value: Quantity
+    gas: Quantity
+    input: str
+    to: Optional[str] = None
+    gas_price: Optional[Quantity] = None
+    max_fee_per_gas: Optional[Quantity] = None
+    max_priority_fee_per_gas: Optional[Quantity] = None
+    type: Quantity = Quantity(0)
+    block_number: Optional[Quantity] = None
+    block_hash: Optional[str] = None
+    transaction_index: Optional[Quantity] = None
+
+
+class Receipt(Struct):
+    """🧾 ``eth_getTransactionReceipt`` / ``eth_getBlockReceipts`` entry"""
+    transaction_hash: str
+    block_number: Quantity
+    block_hash: str
+    transaction_index: Quantity
+    sender: str
+    status: Quantity
+    gas_used: Quantity
+    logs: List[Log]
+    to: Optional[str] = None
+    cumulative_gas_used: Optional[Quantity] = None
+    effective_gas_price: Optional[Quantity] = None
+    contract_address: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == 1
+
+
+class Block(Struct):
+    """🧱 Block header with transaction hashes (``eth_getBlockByNumber(tag, False)``, ``newHeads``)
+
+    ``newHeads`` notifications carry no transaction list, so it defaults to empty.
+    """
+    number: Quantity
+    hash: str
+    parent_hash: str
+    timestamp: Quantity
+    transactions: List[str] = []
+
+
+class FullBlock(Block):
+    """🧱 Block with transaction objects (``eth_getBlockByNumber(tag, True)``)"""
+    transactions: List[Transaction] = []
+
+
+if msgspec is not None:
+    class Response(msgspec.Struct, gc=False):
+        """📨 JSON-RPC response envelope; ``result`` stays raw bytes until its type is known"""
+        id: Any = None
+        result: msgspec.Raw = msgspec.Raw(b"null")
+        error: Any = None
+
+
+def _convert(value: Any, tp: Any) -> Any:
+    """Builtins from ``json.loads`` → ``tp`` (the decoding path without msgspec)"""
+    if tp is Any:
+        return value
+    origin = get_origin(tp)
+    if origin is Union:
+        if value is None and type(None) in get_args(tp):
+            return None
+        inner, = [arg for arg in get_args(tp) if arg is not type(None)]
+        return _convert(value, inner)
+    if value is None:
+        raise ValueError(f"Expected {tp!r}, got null")
+    if origin is list:
+        item, = get_args(tp)
+        if not isinstance(value, list):
+            raise ValueError(f"Expected array, got {value!r}")
+        return [_convert(entry, item) for entry in value]
+    if tp is Quantity:
+        try:
+            return _dec_hook(tp, value)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Expected quantity, got {value!r}") from e
+    if isinstance(tp, type) and issubclass(tp, Struct):
+        if not isinstance(value, dict):
+            raise ValueError(f"Expected object for {tp.__name__}, got {value!r}")
+        hints = get_type_hints(tp)
+        try:
+            return tp(**{name: _convert(value[key], hints[name])
+                         for name, key in zip(tp.__struct_fields__, tp.__struct_encode_fields__) if key in value})
+        except TypeError as e:
+            raise ValueError(f"{tp.__name__}: {e}") from e
+    return value
+
+
+@lru_cache(maxsize=None)
+def _decoder(tp: Any) -> Callable[[bytes], Any]:
+    """Bytes → ``tp``; built once per type"""
+    if msgspec is None:
+        return lambda body: _convert(json.loads(body), tp)
+    return msgspec.json.Decoder(tp, dec_hook=_dec_hook).decode
+
+
+def _unwrap(response: Any) -> dict:
+    unwrapped = {"id": response.id, "result": response.result}
+    if response.error is not None:
+        unwrapped["error"] = response.error
+    return unwrapped
+
+
+def decode_response(body: bytes) -> Any:
+    """📨 Response body → ``{"id", "result"[, "error"]}`` per envelope, results left undecoded
+
+    Passed as the ``decode`` callable of ``transport.post``. Keeps the dict
+    shape ``RpcClient`` already reads envelopes in; only the results
+    inside are deferred. ValueError if the body is malformed.
+    """
+    if msgspec is None:
+        return loads(body)
+    data = _decoder(Union[Response, List[Response]])(body)
+    return [_unwrap(item) for item in data] if isinstance(data, list) else _unwrap(data)
+
+
+def decode_result(result: Any, result_type: Any) -> Any:
+    """🧱 Undecoded ``result`` from ``decode_response`` → ``result_type`` (None = plain JSON)
+
+    A null result (unknown or pending transaction, block not yet mined) is
+    None whatever the type. Also accepts already-parsed JSON (cassettes,
+    cache hits). ValueError if the result does not fit the type.
+    """
+    if msgspec is not None and isinstance(result, msgspec.Raw):
+        if result_type is None:
+            return loads(result)
+        return _decoder(Optional[result_type])(result)
+    if result_type is None:
+        return result
+    if msgspec is None:
+        return _convert(result, Optional[result_type])
+    try:
+        return msgspec.convert(result, Optional[result_type], dec_hook=_dec_hook)
+    except msgspec.ValidationError as e:
+        raise ValueError(str(e)) from e
+
+
+def as_json(result: Any) -> Any:
+    """📄 Undecoded ``result`` → the plain JSON the block-pinned cache stores"""
+    if msgspec is not None and isinstance(result, msgspec.Raw):
+        return loads(result)
+    return result
+
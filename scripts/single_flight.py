@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+🛬 In-flight JSON-RPC request coalescing (single-flight)
+=========================================================
+
+During a fleet sweep or a batch post-mortem many threads ask the node the
+same question at the same moment: the chain head, a token's ``decimals``,
+one receipt. ``SingleFlight`` keys every read on (endpoint, method,
+canonical params). The first caller becomes the leader and sends the
+request. Everyone who asks for the same key while it is in flight waits
+for that one response and gets the same decoded result, or the same
+exception.
+
+Reads tagged ``latest`` (including implicit ones like ``eth_blockNumber``)
+are also kept in a micro-cache for ``ONELIMIT_LATEST_TTL`` seconds, shorter
+than a Polygon block. Back-to-back callers are then served without a
+request. Block-pinned reads need no TTL; ``rpc_cache.BlockPinnedCache``
+stores them permanently once final. Transaction submission and filter
+polling have side effects and are never shared.
+
+Shared results are the same Python objects for every caller, so treat them
+as read-only.
+
+Configuration:
+    ONELIMIT_LATEST_TTL   seconds a ``latest`` read is reused (default 1.0, 0 disables)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from rpc_cache import BLOCK_PARAM_INDEX, cache_key
+
+DEFAULT_LATEST_TTL = float(os.environ.get("ONELIMIT_LATEST_TTL", "1.0"))
+
+# Side effects or per-call state - every call must reach the node
+NEVER_SHARED = {
+    "eth_sendRawTransaction",
+    "eth_sendTransaction",
+    "eth_subscribe",
+    "eth_unsubscribe",
+    "eth_newFilter",
+    "eth_newBlockFilter",
+    "eth_newPendingTransactionFilter",
+    "eth_getFilterChanges",
+    "eth_uninstallFilter",
+}
+
+# Methods that always answer about the chain head
+IMPLICIT_LATEST = {"eth_blockNumber", "eth_gasPrice", "eth_maxPriorityFeePerGas", "eth_blobBaseFee"}
+
+
+def is_latest_read(method: str, params: list) -> bool:
+    """🆕 True for reads answered at the current head (``latest`` tag or no block argument)"""
+    if method in IMPLICIT_LATEST:
+        return True
+    index = BLOCK_PARAM_INDEX.get(method)
+    if index is None:
+        return False
+    if len(params) <= index:
+        return True  # the node defaults a missing block argument to latest
+    return params[index] == "latest"
+
+
+class Flight:
+    """✈️ One in-flight request; followers wait on ``done``"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """🛬 Coalesce identical concurrent reads and briefly reuse ``latest`` results"""
+
+    def __init__(self, latest_ttl: float = DEFAULT_LATEST_TTL):
+        self.latest_ttl = latest_ttl
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Flight] = {}
+        self._recent: Dict[str, Tuple[float, Any]] = {}
+        self.requests = 0      # reads that reached the network
+        self.coalesced = 0     # reads that waited on another caller's request
+        self.ttl_hits = 0      # reads served from the latest micro-cache
+
+    @staticmethod
+    def key(url: str, method: str, params: list, result_type: Any = None) -> Optional[str]:
+        """🔑 Sharing key, or None when the call must never be shared
+
+        Followers get the leader's decoded result, so a typed read (see
+        rpc_types.py) never shares a key with the plain JSON one.
+        """
+        if method in NEVER_SHARED:
+            return None
+        key = f"{url}|{cache_key(method, params)}"
+        return key if result_type is None else f"{key}|{result_type!r}"
+
+    def begin(self, key: str) -> Tuple[Flight, bool]:
+        """🛫 ``(flight, leader)``; a finished flight means a micro-cache hit
+
+        The leader must call ``finish`` exactly once. Followers call
+        ``flight.wait()``.
+        """
+        with self._lock:
+            recent = self._recent.get(key)
+            if recent is not None:
+                if recent[0] > time.monotonic():
+                    self.ttl_hits += 1
+                    flight = Flight()
+                    flight.result = recent[1]
+                    flight.done.set()
+                    return flight, False
+                del self._recent[key]
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._inflight[key] = Flight()
+            self.requests += 1
+            return flight, True
+
+    def finish(self, key: str, flight: Flight, result: Any = None, error: Optional[BaseException] = None,
+               ttl: float = 0.0) -> None:
+        """🛬 Publish the leader's outcome to every follower"""
+        flight.result, flight.error = result, error
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is None and ttl > 0:
+                self._recent[key] = (time.monotonic() + ttl, result)
+        flight.done.set()
+
+    def call(self, url: str, method: str, params: list, fetch: Callable[[], Any], result_type: Any = None) -> Any:
+        """📞 ``fetch()`` once per key no matter how many callers ask concurrently"""
+        key = self.key(url, method, params, result_type)
+        if key is None:
+            return fetch()
+        flight, leader = self.begin(key)
+        if not leader:
+            return flight.wait()
+        try:
+            result = fetch()
+        except BaseException as e:
+            self.finish(key, flight, error=e)
+            raise
+        self.finish(key, flight, result, ttl=self.ttl_for(method, params))
+        return result
+
+    def ttl_for(self, method: str, params: list) -> float:
+        return self.latest_ttl if is_latest_read(method, params) else 0.0
+
+    def stats(self) -> Dict[str, int]:
+        """📊 Network requests made versus reads answered without one"""
+        with self._lock:
+            return {"requests": self.requests, "coalesced": self.coalesced, "ttl_hits": self.ttl_hits}
+
+
+_default_flight: Optional[SingleFlight] = None
+_default_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """🌍 Process-wide single-flight group shared by every ``RpcClient``"""
+    global _default_flight
+    with _default_lock:
+        if _default_flight is None:
+            _default_flight = SingleFlight()
+        return _default_flight
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+⏱️ Cold-start benchmark for the wallet tools
+=============================================
+
+The wallet tools run from cron and health checks thousands of times a day,
+so interpreter startup plus module import is paid on every run. Each tool
+keeps its work behind ``main()`` and imports heavy dependencies (requests,
+numpy, asyncio, web3, ...) only on the code path that needs them.
+
+This script guards that budget. Each tool is imported in a fresh
+interpreter several times, and the median wall time, including process
+start, is compared with the budget. Importing a tool must also not load any
+of ``HEAVY_MODULES``. When a tool fails either check, its slowest imports
+(from ``python -X importtime``) are listed. Exits 1 on any failure, so it
+can gate CI.
+
+Usage:
+    python3 scripts/startup_benchmark.py
+    python3 scripts/startup_benchmark.py --runs 20 --budget-ms 80 check_wallet_balances
+
+Configuration:
+    ONELIMIT_STARTUP_BUDGET_MS   per-tool cold-start budget in ms (default 100)
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BUDGET_MS = float(os.environ.get("ONELIMIT_STARTUP_BUDGET_MS", "100"))
+
+# Tools invoked from cron and health checks
+DEFAULT_TOOLS = [
+    "check_wallet_transactions",
+    "check_wallet_balances",
+    "debug_contract_level",
+    "debug_failed_transaction",
+    "analyze_failed_tx",
+    "postmortem",
+    "balance_ledger",
+]
+
+# Must only be imported by the code paths that use them
+HEAVY_MODULES = ["web3", "eth_account", "eth_abi", "requests", "httpx", "numpy", "pyarrow", "asyncio"]
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=SCRIPTS_DIR)
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=SCRIPTS_DIR, env=env,
+                          capture_output=True, text=True)
+
+
+def cold_start_ms(code: str, runs: int) -> float:
+    """⏱️ Median wall time of ``runs`` fresh interpreters executing ``code``"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = _run(code)
+        samples.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return statistics.median(samples)
+
+
+def heavy_imports(tool: str) -> List[str]:
+    """🐘 ``HEAVY_MODULES`` that importing ``tool`` pulls in"""
+    result = _run(f"import sys, {tool}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    return result.stdout.split()
+
+
+def slowest_imports(tool: str, count: int = 5) -> List[Tuple[int, str]]:
+    """🐢 ``(cumulative µs, module)`` for the slowest imports, from ``-X importtime``"""
+    result = _run(f"import {tool}", "-X", "importtime")
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        timings.append((int(cumulative), module.strip()))
+    return sorted(timings, reverse=True)[1:count + 1]  # [0] is the tool itself
+
+
+def main():
+    parser = argparse.ArgumentParser(description="⏱️ Cold-start benchmark for the wallet tools")
+    parser.add_argument("tools", nargs="*", default=DEFAULT_TOOLS, help="🧰 Tool modules (default: the cron tools)")
+    parser.add_argument("--runs", type=int, default=10, help="🔁 Fresh interpreters per tool")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="🎯 Cold-start budget per tool")
+    args = parser.parse_args()
+
+    baseline = cold_start_ms("pass", args.runs)
+    print(f"⏱️ Interpreter startup: {baseline:.1f} ms (median of {args.runs})")
+    print(f"🎯 Budget: {args.budget_ms:.0f} ms per tool")
+    print()
+
+    failures = 0
+    for tool in args.tools:
+        try:
+            total = cold_start_ms(f"import {tool}", args.runs)
+        except RuntimeError as e:
+            print(f"❌ {tool}: import failed - {e}")
+            failures += 1
+            continue
+        heavy = heavy_imports(tool)
+        ok = total <= args.budget_ms and not heavy
+        print(f"{'✅' if ok else '❌'} {tool}: {total:.1f} ms (imports {total - baseline:.1f} ms)")
+        if heavy:
+            print(f"   🐘 Loads heavy modules at import: {', '.join(heavy)}")
+        if not ok:
+            failures += 1
+            for cumulative, module in slowest_imports(tool):
+                print(f"   🐢 {module}: {cumulative / 1000:.1f} ms")
+
+    print()
+    if failures:
+        print(f"❌ {failures} of {len(args.tools)} tools over the startup budget")
+        sys.exit(1)
+    print(f"✅ All {len(args.tools)} tools start within {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+🧪 Token amount parsing, truncation and AmountArray tests
+==========================================================
+
+Every AmountArray check runs against both the NumPy columns and the
+pure-Python fallback (the same path twice when NumPy is not installed).
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import contextlib
+import math
+import os
+import sys
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import amounts  # noqa: E402
+from amounts import (MAX_UINT256, UNLIMITED_THRESHOLD, AmountArray, format_units, is_unlimited,  # noqa: E402
+                     parse_quantity, to_decimal)
+
+USDC = 6
+WMATIC = 18
+
+
+class FormatUnitsTest(unittest.TestCase):
+    def test_truncates_instead_of_rounding(self):
+        self.assertEqual(format_units(1_999_999, USDC, 2), "1.99")
+        self.assertEqual(format_units(10**18 - 1, WMATIC), "0.999999")
+        self.assertEqual(format_units(1, WMATIC), "0.000000")
+
+    def test_pads_short_fractions(self):
+        self.assertEqual(format_units(1_500_000, USDC), "1.500000")
+        self.assertEqual(format_units(15, 1, 4), "1.5000")
+        self.assertEqual(format_units(0, USDC), "0.000000")
+
+    def test_whole_units(self):
+        self.assertEqual(format_units(1_999_999, USDC, 0), "1")
+        self.assertEqual(format_units(42, 0), "42")
+
+    def test_sign_and_missing(self):
+        self.assertEqual(format_units(-1_500_000, USDC, 2), "-1.50")
+        self.assertIsNone(format_units(None, USDC))
+
+    def test_exact_decimal(self):
+        self.assertEqual(to_decimal(3 * 10**18, WMATIC), Decimal(3))
+        self.assertEqual(str(to_decimal(MAX_UINT256, WMATIC)),
+                         "115792089237316195423570985008687907853269984665640564039457.584007913129639935")
+
+    def test_parse_quantity(self):
+        self.assertEqual(parse_quantity("0x10"), 16)
+        self.assertEqual(parse_quantity(7), 7)
+        for empty in (None, "0x", "", ValueError("call failed")):
+            self.assertIsNone(parse_quantity(empty))
+
+
+class UnlimitedTest(unittest.TestCase):
+    def test_threshold(self):
+        self.assertFalse(is_unlimited(UNLIMITED_THRESHOLD - 1))
+        self.assertTrue(is_unlimited(UNLIMITED_THRESHOLD))
+        # Partly spent infinite approvals still count as unlimited
+        self.assertTrue(is_unlimited(MAX_UINT256 - 10**24))
+        self.assertFalse(is_unlimited(None))
+
+
+class AmountArrayTest(unittest.TestCase):
+    RAW = [1_999_999, 0, None, MAX_UINT256, UNLIMITED_THRESHOLD - 1, 2**63 * 10**USDC, 5]
+
+    def backends(self):
+        """🔀 ``(name, context)`` for the NumPy path and the list fallback"""
+        return [("numpy", contextlib.nullcontext()),
+                ("fallback", mock.patch.object(amounts, "optional_numpy", return_value=None))]
+
+    def test_format(self):
+        for name, backend in self.backends():
+            with self.subTest(name), backend:
+                array = AmountArray(self.RAW, USDC)
+                self.assertEqual(array.format(2, missing="?"), [
+                    "1.99", "0.00", "?", "unlimited",
+                    format_units(UNLIMITED_THRESHOLD - 1, USDC, 2),
+                    format_units(2**63 * 10**USDC, USDC, 2),
+                    "0.00",
+                ])
+                self.assertEqual(array.format(unlimited=None)[3], format_units(MAX_UINT256, USDC))
+                # Places beyond the token's decimals are clamped
+                self.assertEqual(array.format(10)[0], "1.999999")
+
+    def test_total_skips_missing_and_unlimited(self):
+        expected = 1_999_999 + UNLIMITED_THRESHOLD - 1 + 2**63 * 10**USDC + 5
+        small = [1_999_999, None, MAX_UINT256, 5]
+        for name, backend in self.backends():
+            with self.subTest(name), backend:
+                self.assertEqual(AmountArray(self.RAW, USDC).total(), expected)
+                self.assertEqual(AmountArray(small, USDC).total(), 1_999_999 + 5)
+                self.assertEqual(AmountArray([], USDC).total(), 0)
+
+    def test_at_least(self):
+        for name, backend in self.backends():
+            with self.subTest(name), backend:
+                left = AmountArray([10**6, 5, None, 10**6 + 1], USDC)
+                right = AmountArray([10**6, 6, 1, 10**6], USDC)
+                self.assertEqual(left.at_least(right), [True, False, None, True])
+
+    def test_to_float(self):
+        for name, backend in self.backends():
+            with self.subTest(name), backend:
+                values = list(AmountArray([1_500_000, None, MAX_UINT256], USDC).to_float())
+                self.assertEqual(values[0], 1.5)
+                self.assertTrue(math.isnan(values[1]))
+                self.assertAlmostEqual(values[2] / (MAX_UINT256 / 10**USDC), 1.0)
+
+    def test_mixed_decimals_are_rejected(self):
+        with self.assertRaises(ValueError):
+            AmountArray([1], USDC).at_least(AmountArray([1], WMATIC))
+        with self.assertRaises(ValueError):
+            AmountArray([1], 19)
+
+
+if __name__ == "__main__":
+    unittest.main()
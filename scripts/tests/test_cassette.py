@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+🧪 Cassette record → replay tests
+==================================
+
+Records against a scripted in-process transport, then replays the file
+with the scripted transport gone.
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cassette import RecordingTransport, ReplayTransport  # noqa: E402
+from rate_limit import RateLimitedTransport, RetryBudget  # noqa: E402
+from rpc_client import RpcClient, RpcError  # noqa: E402
+from single_flight import SingleFlight  # noqa: E402
+from transport import TransportError  # noqa: E402
+
+URL = "http://node.invalid"
+WALLET = "0x" + "ab" * 20
+
+
+class ScriptedNode:
+    """🎬 Answers each method from its own queue; TransportErrors are raised, dicts are JSON-RPC errors"""
+
+    def __init__(self, script):
+        self.script = {method: list(answers) for method, answers in script.items()}
+
+    def _answer(self, request):
+        queue = self.script[request["method"]]
+        answer = queue.pop(0) if len(queue) > 1 else queue[0]
+        if isinstance(answer, TransportError):
+            raise answer
+        if isinstance(answer, dict) and "code" in answer:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": answer}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": answer}
+
+    def post(self, url, payload, decode=None):
+        data = [self._answer(r) for r in payload] if isinstance(payload, list) else self._answer(payload)
+        return data if decode is None else decode(json.dumps(data).encode())
+
+    def close(self):
+        pass
+
+
+def request(method, params=None, request_id=1):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or []}
+
+
+class CassetteTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def record(self, script, payloads, name="calls.ndjson"):
+        """⏺️ Post every payload through a recorder; returns the cassette path and what each call gave"""
+        path = os.path.join(self.directory, name)
+        recorder = RecordingTransport(path, ScriptedNode(script))
+        outcomes = []
+        for payload in payloads:
+            try:
+                outcomes.append(recorder.post(URL, payload))
+            except TransportError as e:
+                outcomes.append((e.status, e.retry_after, e.timed_out))
+        recorder.close()
+        return path, outcomes
+
+    def replay(self, path, payloads):
+        replay = ReplayTransport(path)
+        outcomes = []
+        for payload in payloads:
+            try:
+                outcomes.append(replay.post("http://other.invalid", payload))
+            except TransportError as e:
+                outcomes.append((e.status, e.retry_after, e.timed_out))
+        return replay, outcomes
+
+    def test_repeated_keys_replay_in_order_then_repeat(self):
+        payloads = [request("eth_blockNumber", request_id=i) for i in range(3)]
+        path, recorded = self.record({"eth_blockNumber": ["0x1", "0x2", "0x3"]}, payloads)
+        replay, replayed = self.replay(path, payloads + [request("eth_blockNumber", request_id=9)])
+        self.assertEqual(replayed[:3], recorded)
+        self.assertEqual([r["result"] for r in replayed], ["0x1", "0x2", "0x3", "0x3"])
+        self.assertEqual(replayed[3]["id"], 9)
+        self.assertEqual((len(replay), replay.served, replay.misses), (3, 4, 0))
+
+    def test_recorded_throttles_and_timeouts_replay(self):
+        throttled = TransportError("429 Too Many Requests", status=429, retry_after=2.0, url=URL)
+        timed_out = TransportError("read timed out", url=URL, timed_out=True)
+        payloads = [request("eth_getBalance", [WALLET, "latest"])] * 3 + [request("eth_getLogs", [{}])]
+        path, recorded = self.record({"eth_getBalance": [throttled, "0x64"], "eth_getLogs": [timed_out]}, payloads)
+        self.assertEqual(recorded[0], (429, 2.0, False))
+        self.assertEqual(recorded[3], (None, None, True))
+        _, replayed = self.replay(path, payloads)
+        self.assertEqual(replayed, recorded)
+
+    def test_batches_replay_under_any_grouping(self):
+        calls = [request("eth_getBalance", [WALLET, "0x10"], 1), request("eth_call", [{"to": WALLET}, "0x10"], 2)]
+        path, _ = self.record({"eth_getBalance": ["0x64"], "eth_call": [{"code": 3, "message": "execution reverted"}]},
+                              [calls], name="batch.ndjson.gz")
+        # Recorded as one batch, replayed one call at a time with different ids and hex case
+        _, replayed = self.replay(path, [request("eth_call", [{"to": WALLET.upper().replace("0X", "0x")}, "0x10"], 7),
+                                         request("eth_getBalance", [WALLET, "0x10"], 8)])
+        self.assertEqual(replayed[0], {"jsonrpc": "2.0", "id": 7,
+                                       "error": {"code": 3, "message": "execution reverted"}})
+        self.assertEqual(replayed[1], {"jsonrpc": "2.0", "id": 8, "result": "0x64"})
+
+    def test_unrecorded_call_is_a_transport_error(self):
+        path, _ = self.record({"eth_chainId": ["0x89"]}, [request("eth_chainId")])
+        replay = ReplayTransport(path)
+        with self.assertRaises(TransportError):
+            replay.post(URL, request("eth_blockNumber"))
+        self.assertEqual(replay.misses, 1)
+
+    def test_client_retries_a_replayed_throttle(self):
+        throttled = TransportError("429 Too Many Requests", status=429, retry_after=0.0, url=URL)
+        payload = request("eth_getBalance", [WALLET, "latest"])
+        path, _ = self.record({"eth_getBalance": [throttled, "0x64"], "eth_chainId": [{"code": -32601,
+                                                                                        "message": "nope"}]},
+                              [payload, payload, request("eth_chainId")])
+
+        limiter = RateLimitedTransport(ReplayTransport(path), budget=RetryBudget(5))
+        rpc = RpcClient(URL, transport=limiter, flight=SingleFlight(latest_ttl=0))
+        self.assertEqual(rpc.call("eth_getBalance", [WALLET, "latest"]), "0x64")
+        self.assertEqual(limiter.budget.used, 1)
+        with self.assertRaises(RpcError) as caught:
+            rpc.call("eth_chainId", [])
+        self.assertEqual(caught.exception.code, -32601)
+
+
+if __name__ == "__main__":
+    unittest.main()
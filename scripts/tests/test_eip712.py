@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+🧪 EIP-712 hashing and EIP-2098 signer recovery tests
+======================================================
+
+Vectors are the Mail example from the EIP-712 specification and the two
+compact signatures from EIP-2098. Order round-trips are signed in the test
+with a fixed key.
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+
+Requirements:
+    pip install eth-hash[pycryptodome]   # keccak256; skipped without it
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eip712  # noqa: E402
+from evm import address_word, word  # noqa: E402
+from router_v6_decoder import FillCall, Order, TakerTraits  # noqa: E402
+
+
+def setUpModule():
+    try:
+        eip712.keccak256(b"")
+    except ImportError:
+        raise unittest.SkipTest("needs eth-hash or pycryptodome")
+
+
+def personal_message(message: bytes) -> bytes:
+    return eip712.keccak256(b"\x19Ethereum Signed Message:\n" + str(len(message)).encode() + message)
+
+
+def address_of(private_key: int) -> str:
+    x, y = eip712._from_jacobian(eip712._jacobian_multiply((*eip712._G, 1), private_key))
+    return "0x" + eip712.keccak256(word(x) + word(y))[-20:].hex()
+
+
+def sign_compact(digest: bytes, private_key: int):
+    """✍️ Low-s ECDSA signature as EIP-2098 ``(r, vs)`` (deterministic nonce, tests only)"""
+    n = eip712._N
+    k = int.from_bytes(eip712.keccak256(word(private_key) + digest), "big") % n
+    x, y = eip712._from_jacobian(eip712._jacobian_multiply((*eip712._G, 1), k))
+    r = x % n
+    s = pow(k, -1, n) * (int.from_bytes(digest, "big") + r * private_key) % n
+    parity = y & 1
+    if s > n // 2:
+        s, parity = n - s, parity ^ 1
+    return word(r), word(parity << 255 | s)
+
+
+# EIP-712 "Mail" example
+MAIL_DOMAIN = ("Ether Mail", "1", 1, "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC")
+PERSON_TYPE = "Person(string name,address wallet)"
+MAIL_TYPE = "Mail(Person from,Person to,string contents)" + PERSON_TYPE
+COW_KEY = 0xc85ef7d79691fe79573b1a7064c19c1a9819ebdbd1faaab1a8ec92344438aaf4  # keccak256("cow")
+COW = "0xcd2a3d9f938e13cd947ec05abc7fe734df8dd826"
+BOB = "0xbBbBBBBbbBBBbbbBbbBbbbbBBbBbbbbBbBbbBBbB"
+
+# EIP-2098 examples
+EIP2098_KEY = 0x1234567890123456789012345678901234567890123456789012345678901234
+EIP2098_ADDRESS = "0x2e988a386a799f506693793c6a5af6b54dfaabfb"
+EIP2098_VECTORS = [
+    (b"Hello World",
+     "68a020a209d3d56c46f38cc50a33f704f4a9a10a59377f8dd762ac66910e9b90",
+     "7e865ad05c4035ab5792787d4a0297a43617ae897930a6fe4d822b8faea52064"),  # v = 27
+    (b"It's a small(er) world",
+     "9328da16089fcba9bececa81663203989f2df5fe1faa6291a45381c81bd17f76",
+     "939c6d6b623b42da56557e5e734a43dc83345ddfadec52cbe24d0cc64f550793"),  # v = 28
+]
+
+ORDER = Order(salt=0x1234, maker=COW, receiver="0x" + "00" * 20,
+              maker_asset="0x0d500b1d8e8ef31e21c99d1db9a6444d3adf1270",
+              taker_asset="0x3c499c542cef5e3811e1192ce70d8cc03d5c3359",
+              making_amount=10**18, taking_amount=500_000, maker_traits=1 << 254)
+
+
+class Eip712HashTest(unittest.TestCase):
+    def mail_digest(self) -> bytes:
+        name, version, chain_id, contract = MAIL_DOMAIN
+        domain = eip712.domain_separator(chain_id, contract, name, version)
+        self.assertEqual(domain.hex(), "f2cee375fa42b42143804025fc449deafd50cc031ca257e0b194a650a912090f")
+
+        def person(person_name: str, wallet: str) -> bytes:
+            return eip712.keccak256(eip712.type_hash(PERSON_TYPE) + eip712.keccak256(person_name.encode())
+                                    + address_word(wallet))
+
+        struct = eip712.keccak256(eip712.type_hash(MAIL_TYPE) + person("Cow", COW) + person("Bob", BOB)
+                                  + eip712.keccak256(b"Hello, Bob!"))
+        self.assertEqual(struct.hex(), "c52c0ee5d84264471806290a3f2c4cecfc5490626bf912d01f240d7a274b371e")
+        return eip712.keccak256(b"\x19\x01" + domain + struct)
+
+    def test_mail_example(self):
+        self.assertEqual(self.mail_digest().hex(),
+                         "be609aee343fb3c4b28e1df9e632fca64fcfaede20f02e86244efddf30957bd2")
+
+    def test_mail_signature_recovers_cow(self):
+        r = bytes.fromhex("4355c47d63924e8a72e509b65029052eb6c299d53a04e167c5775fd466751c9d")
+        s = 0x07299936d304c153f6443dfa05f40ff007d72911b6f72307f996231605b91562
+        vs = word(1 << 255 | s)  # v = 28
+        self.assertEqual(eip712.recover_signer(self.mail_digest(), r, vs), COW)
+
+    def test_order_hash_uses_router_domain(self):
+        polygon = eip712.order_hash(ORDER)
+        self.assertEqual(polygon, eip712.keccak256(b"\x19\x01" + eip712.domain_separator()
+                                                   + eip712.order_struct_hash(ORDER)))
+        self.assertNotEqual(polygon, eip712.order_hash(ORDER, chain_id=1))
+        self.assertNotEqual(polygon, eip712.order_hash(ORDER._replace(salt=ORDER.salt + 1)))
+
+
+class Eip2098RecoveryTest(unittest.TestCase):
+    def test_key_address(self):
+        self.assertEqual(address_of(EIP2098_KEY), EIP2098_ADDRESS)
+        self.assertEqual(address_of(COW_KEY), COW)
+
+    def test_vectors(self):
+        for message, r, vs in EIP2098_VECTORS:
+            digest = personal_message(message)
+            self.assertEqual(eip712.recover_signer(digest, bytes.fromhex(r), bytes.fromhex(vs)),
+                             EIP2098_ADDRESS, message)
+
+    def test_split_compact(self):
+        _, r, vs = EIP2098_VECTORS[1]
+        v, r_int, s = eip712.split_compact(bytes.fromhex(r), bytes.fromhex(vs))
+        self.assertEqual(v, 28)
+        self.assertEqual(r_int, int(r, 16))
+        self.assertEqual(s, 0x139c6d6b623b42da56557e5e734a43dc83345ddfadec52cbe24d0cc64f550793)
+
+    def test_high_s_and_zero_r_rejected(self):
+        message, r, vs = EIP2098_VECTORS[0]
+        digest = personal_message(message)
+        high_s = word(eip712._N // 2 + 1)  # still below bit 255, so v stays 27
+        self.assertIsNone(eip712.recover_signer(digest, bytes.fromhex(r), high_s))
+        self.assertIsNone(eip712.recover_signer(digest, bytes(32), bytes.fromhex(vs)))
+
+
+class VerifyOrderTest(unittest.TestCase):
+    def test_maker_signature(self):
+        r, vs = sign_compact(eip712.order_hash(ORDER), COW_KEY)
+        check = eip712.verify_order(ORDER, r, vs)
+        self.assertTrue(check.valid)
+        self.assertEqual(check.signer, COW)
+        self.assertEqual(check.order_hash, "0x" + eip712.order_hash(ORDER).hex())
+
+    def test_other_signer(self):
+        r, vs = sign_compact(eip712.order_hash(ORDER), EIP2098_KEY)
+        check = eip712.verify_order(ORDER, r, vs)
+        self.assertIs(check.valid, False)
+        self.assertEqual(check.signer, EIP2098_ADDRESS)
+
+    def test_wrong_chain(self):
+        r, vs = sign_compact(eip712.order_hash(ORDER, chain_id=1), COW_KEY)
+        self.assertIs(eip712.verify_order(ORDER, r, vs).valid, False)
+
+    def test_fills_and_batches(self):
+        r, vs = sign_compact(eip712.order_hash(ORDER), COW_KEY)
+        traits = TakerTraits.from_int(0)
+        eoa = FillCall("0x9fda64bd", "fillOrder", ORDER, r, vs, None, 1, traits, b"")
+        contract = FillCall("0xcc713a04", "fillContractOrder", ORDER, None, None, b"\x01", 1, traits, b"")
+        self.assertTrue(eip712.verify_fill(eoa).valid)
+        self.assertIsNone(eip712.verify_fill(contract).valid)
+        checks = eip712.verify_orders([(ORDER, r, vs), (ORDER._replace(salt=1), r, vs)])
+        self.assertEqual([check.valid for check in checks], [True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+🧪 HeadMonitor reorg and watched-receipt tests against the mock node
+=====================================================================
+
+Reuses the switchable fork of ``test_receipt_tracker.ForkingChain``, with
+full transaction objects in ``eth_getBlockByNumber(tag, True)``.
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+
+Requirements:
+    pip install requests   # HTTP transport to the mock node; skipped without it
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from head_monitor import HeadMonitor  # noqa: E402
+from mock_node import MockNode  # noqa: E402
+from rpc_client import RpcClient  # noqa: E402
+from single_flight import SingleFlight  # noqa: E402
+from test_receipt_tracker import HEAD, START, TX, ForkingChain  # noqa: E402
+from transport import HttpTransport  # noqa: E402
+
+EARLY_TX = "0x" + "ef" * 32
+
+
+def setUpModule():
+    try:
+        import requests  # noqa: F401
+    except ImportError:
+        raise unittest.SkipTest("needs requests")
+
+
+class FullForkingChain(ForkingChain):
+    """🔀 ``ForkingChain`` that also serves transaction objects"""
+
+    def full_block(self, tag):
+        header = self.block(tag)
+        if header is not None:
+            header["transactions"] = [dict(self.transaction(tx), blockNumber=header["number"], blockHash=header["hash"])
+                                      for tx in header["transactions"]]
+        return header
+
+
+class HeadMonitorReorgTest(unittest.TestCase):
+    def setUp(self):
+        self.chain = FullForkingChain({EARLY_TX: START - 5})
+        node = MockNode(self.chain)
+        node.handlers["eth_getBlockByNumber"] = (
+            lambda p: self.chain.full_block(p[0]) if len(p) > 1 and p[1] else self.chain.block(p[0]))
+        rpc = RpcClient(node.start_in_thread(), transport=HttpTransport(), flight=SingleFlight(latest_ttl=0))
+        self.monitor = HeadMonitor(rpc, [], [TX, EARLY_TX])
+
+    def start(self):
+        events = self.monitor.baseline(START, self.chain.block_hash(START))
+        # The mock node is already at HEAD, so TX only gets mined once the monitor is running
+        self.chain.mined[TX] = START + 2
+        return events
+
+    def advance(self, start, end):
+        events = []
+        for number in range(start, end + 1):
+            events.extend(self.monitor.process_block(number))
+        return events
+
+    def kinds(self, events, tx_hash=TX):
+        return [(e["event"], e["block"]) for e in events if e.get("tx_hash") == tx_hash]
+
+    def test_mined_before_start_is_reported(self):
+        events = self.start()
+        self.assertEqual(self.kinds(events, EARLY_TX), [("receipt", START - 5)])
+        self.assertEqual(self.kinds(events), [])
+        self.assertEqual(self.monitor.pending, {TX})
+
+    def test_reorged_receipt_returns_to_pending(self):
+        self.start()
+        self.assertEqual(self.kinds(self.advance(START + 1, START + 3)), [("receipt", START + 2)])
+
+        self.chain.reorg(START + 2, {})
+        events = self.monitor.process_block(START + 4)
+        reorg, = [e for e in events if e["event"] == "reorg"]
+        self.assertEqual(reorg["fork"], START + 2)
+        self.assertEqual([e["old_block"] for e in events if e["event"] == "receipt_reorged"], [START + 2])
+        self.assertIn(TX, self.monitor.pending)
+        self.assertEqual(self.monitor.canonical[START + 3], self.chain.block_hash(START + 3))
+
+        # Mined again further up the new branch
+        self.chain.reorg(START + 2, {TX: START + 5})
+        self.assertEqual(self.kinds(self.monitor.process_block(START + 5)), [("receipt", START + 5)])
+
+    def test_equal_height_walks_back_to_the_fork(self):
+        self.start()
+        self.advance(START + 1, START + 2)
+        # Heights START + 1 and START + 2 are both replaced; the new head arrives at the same height
+        self.chain.reorg(START + 1, {TX: START + 1})
+        events = self.monitor.process_block(START + 2)
+        reorg, = [e for e in events if e["event"] == "reorg"]
+        self.assertEqual(reorg["fork"], START + 1)
+        # The replaced ancestor is rescanned: TX is found in its new block
+        self.assertEqual(self.kinds(events), [("receipt_reorged", START + 2), ("receipt", START + 1)])
+        self.assertEqual(self.monitor.canonical[START + 1], self.chain.block_hash(START + 1))
+        self.assertEqual(self.monitor.canonical[START + 2], self.chain.block_hash(START + 2))
+        self.assertEqual(self.monitor.pending, set())
+
+    def test_memory_is_bounded(self):
+        self.start()
+        with mock.patch("head_monitor.REORG_MEMORY_BLOCKS", 10):
+            self.advance(START + 1, HEAD)
+        self.assertEqual(min(self.monitor.canonical), HEAD - 10)
+        self.assertEqual(self.monitor.mined, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
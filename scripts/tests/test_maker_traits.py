@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+🧪 MakerTraits / TakerTraits bit packing tests
+===============================================
+
+Expected words are written out as hex, with the flag constants copied from
+LOP v4 MakerTraitsLib.sol / TakerTraitsLib.sol, so a shifted field cannot
+pass by agreeing with its own encoder.
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import maker_traits  # noqa: E402
+from maker_traits import (APP_EXPIRY_IGNORED, APP_EXPIRY_PASSED, DUPLICATE_NONCE,  # noqa: E402
+                          EPOCH_WITHOUT_MULTIPLE_FILLS, EXPIRED, FLAG_IN_EXPIRATION, MakerTraits,
+                          TraitsArray, decode_taker_traits, encode_app_maker_traits, encode_maker_traits,
+                          encode_taker_traits)
+
+# MakerTraitsLib.sol
+NO_PARTIAL_FILLS_FLAG = 0x8000000000000000000000000000000000000000000000000000000000000000
+ALLOW_MULTIPLE_FILLS_FLAG = 0x4000000000000000000000000000000000000000000000000000000000000000
+PRE_INTERACTION_CALL_FLAG = 0x1000000000000000000000000000000000000000000000000000000000000000
+POST_INTERACTION_CALL_FLAG = 0x0800000000000000000000000000000000000000000000000000000000000000
+NEED_CHECK_EPOCH_MANAGER_FLAG = 0x0400000000000000000000000000000000000000000000000000000000000000
+HAS_EXTENSION_FLAG = 0x0200000000000000000000000000000000000000000000000000000000000000
+USE_PERMIT2_FLAG = 0x0100000000000000000000000000000000000000000000000000000000000000
+UNWRAP_WETH_FLAG = 0x0080000000000000000000000000000000000000000000000000000000000000
+
+# TakerTraitsLib.sol
+TAKER_MAKER_AMOUNT_FLAG = 0x8000000000000000000000000000000000000000000000000000000000000000
+TAKER_UNWRAP_WETH_FLAG = 0x4000000000000000000000000000000000000000000000000000000000000000
+TAKER_SKIP_ORDER_PERMIT_FLAG = 0x2000000000000000000000000000000000000000000000000000000000000000
+TAKER_USE_PERMIT2_FLAG = 0x1000000000000000000000000000000000000000000000000000000000000000
+TAKER_ARGS_HAS_TARGET = 0x0800000000000000000000000000000000000000000000000000000000000000
+
+# allow multiple fills, nonce 7, expiration 0x6564b4a0, allowed sender ...1234567890abcdef1234
+MAKER_WORD = 0x4000000000000000000000000000000007006564b4a01234567890abcdef1234
+# maker amount, args has target, extension length 20, interaction length 3, threshold 1000
+TAKER_WORD = 0x88000014000003000000000000000000000000000000000000000000000003e8
+
+
+class MakerTraitsTest(unittest.TestCase):
+    def test_flags_match_lop_v4(self):
+        flags = {
+            "no_partial_fills": NO_PARTIAL_FILLS_FLAG,
+            "allow_multiple_fills": ALLOW_MULTIPLE_FILLS_FLAG,
+            "pre_interaction": PRE_INTERACTION_CALL_FLAG,
+            "post_interaction": POST_INTERACTION_CALL_FLAG,
+            "need_check_epoch_manager": NEED_CHECK_EPOCH_MANAGER_FLAG,
+            "has_extension": HAS_EXTENSION_FLAG,
+            "use_permit2": USE_PERMIT2_FLAG,
+            "unwrap_weth": UNWRAP_WETH_FLAG,
+        }
+        for name, flag in flags.items():
+            self.assertEqual(encode_maker_traits(**{name: True}), flag, name)
+            traits = MakerTraits.from_int(flag)
+            self.assertEqual([n for n in flags if getattr(traits, n)], [name])
+
+    def test_decode_known_word(self):
+        traits = MakerTraits.from_int(MAKER_WORD)
+        self.assertEqual(traits.allowed_sender, 0x1234567890abcdef1234)
+        self.assertEqual(traits.expiration, 0x6564b4a0)
+        self.assertEqual(traits.nonce_or_epoch, 7)
+        self.assertEqual(traits.series, 0)
+        self.assertTrue(traits.allow_multiple_fills)
+        self.assertFalse(traits.no_partial_fills)
+
+    def test_encode_known_word(self):
+        word = encode_maker_traits(expiration=0x6564b4a0, nonce_or_epoch=7,
+                                   allowed_sender="0x" + "ab" * 10 + "1234567890abcdef1234",
+                                   allow_multiple_fills=True)
+        self.assertEqual(word, MAKER_WORD)
+
+    def test_series_and_epoch(self):
+        word = encode_maker_traits(nonce_or_epoch=3, series=2, need_check_epoch_manager=True,
+                                   allow_multiple_fills=True)
+        self.assertEqual(word, 0x4400000000000000000000020000000003000000000000000000000000000000)
+        self.assertEqual(MakerTraits.from_int(word).series, 2)
+
+    def test_field_overflow(self):
+        with self.assertRaises(ValueError):
+            encode_maker_traits(expiration=1 << 40)
+        with self.assertRaises(ValueError):
+            encode_maker_traits(bogus=True)
+
+    def test_expiry(self):
+        traits = MakerTraits.from_int(MAKER_WORD)
+        self.assertFalse(traits.is_expired(0x6564b4a0))
+        self.assertTrue(traits.is_expired(0x6564b4a1))
+        self.assertFalse(MakerTraits.from_int(0).is_expired(2**40))
+
+    def test_app_layout(self):
+        # MakerTraitsCalculator.swift: nonce at 120, expiry at 160, partial/multiple fills at bits 80/81
+        word = encode_app_maker_traits(5, 0x6564b4a0, allow_partial_fills=True, allow_multiple_fills=True)
+        self.assertEqual(word, 0x00000000000000006564b4a00000000005000000000300000000000000000000)
+        traits = MakerTraits.from_int(word)
+        self.assertEqual(traits.app_expiry, 0x6564b4a0)
+        self.assertEqual(traits.expiration, 3)
+        self.assertEqual(traits.audit(), [FLAG_IN_EXPIRATION])
+
+        # Without those flags the router sees no expiration at all
+        traits = MakerTraits.from_int(encode_app_maker_traits(5, 0x6564b4a0))
+        self.assertEqual(traits.expiration, 0)
+        self.assertEqual(traits.audit(0x6564b4a1), [APP_EXPIRY_IGNORED, APP_EXPIRY_PASSED])
+
+
+class TakerTraitsTest(unittest.TestCase):
+    def test_flags_match_lop_v4(self):
+        self.assertEqual(encode_taker_traits(maker_amount=True), TAKER_MAKER_AMOUNT_FLAG)
+        self.assertEqual(encode_taker_traits(unwrap_weth=True), TAKER_UNWRAP_WETH_FLAG)
+        self.assertEqual(encode_taker_traits(skip_order_permit=True), TAKER_SKIP_ORDER_PERMIT_FLAG)
+        self.assertEqual(encode_taker_traits(use_permit2=True), TAKER_USE_PERMIT2_FLAG)
+        self.assertEqual(encode_taker_traits(args_has_target=True), TAKER_ARGS_HAS_TARGET)
+
+    def test_known_word_round_trip(self):
+        word = encode_taker_traits(threshold=1000, maker_amount=True, args_has_target=True,
+                                   extension_length=20, interaction_length=3)
+        self.assertEqual(word, TAKER_WORD)
+        traits = decode_taker_traits(TAKER_WORD)
+        self.assertEqual((traits.extension_length, traits.interaction_length, traits.threshold), (20, 3, 1000))
+        self.assertTrue(traits.maker_amount and traits.args_has_target)
+        self.assertFalse(traits.unwrap_weth or traits.skip_order_permit or traits.use_permit2)
+
+    def test_field_overflow(self):
+        with self.assertRaises(ValueError):
+            encode_taker_traits(threshold=1 << 200)  # would run into the length fields
+        with self.assertRaises(ValueError):
+            encode_taker_traits(extension_length=1 << 24)
+
+
+class TraitsArrayTest(unittest.TestCase):
+    WORDS = [
+        MAKER_WORD,
+        encode_app_maker_traits(5, 0x6564b4a0, allow_partial_fills=True, allow_multiple_fills=True),
+        encode_maker_traits(nonce_or_epoch=1, series=9, need_check_epoch_manager=True),
+        encode_maker_traits(expiration=100, nonce_or_epoch=4),
+        encode_maker_traits(nonce_or_epoch=4, no_partial_fills=True),
+        (1 << 256) - 1,
+    ]
+    MAKERS = ["0xa", "0xa", "0xb", "0xc", "0xC", "0xd"]
+
+    def _columns(self, array):
+        return {
+            "expiration": [int(x) for x in array.expiration],
+            "nonce_or_epoch": [int(x) for x in array.nonce_or_epoch],
+            "series": [int(x) for x in array.series],
+            "app_expiry": [int(x) for x in array.app_expiry],
+            "has_allowed_sender": [bool(x) for x in array.has_allowed_sender],
+            "flags": {name: [bool(x) for x in column] for name, column in array.flags.items()},
+        }
+
+    def test_matches_scalar_decoding(self):
+        columns = self._columns(TraitsArray(self.WORDS))
+        decoded = [MakerTraits.from_int(word) for word in self.WORDS]
+        self.assertEqual(columns["expiration"], [t.expiration for t in decoded])
+        self.assertEqual(columns["nonce_or_epoch"], [t.nonce_or_epoch for t in decoded])
+        self.assertEqual(columns["series"], [t.series for t in decoded])
+        self.assertEqual(columns["app_expiry"], [t.app_expiry for t in decoded])
+        self.assertEqual(columns["has_allowed_sender"], [t.allowed_sender != 0 for t in decoded])
+        for name, column in columns["flags"].items():
+            self.assertEqual(column, [getattr(t, name) for t in decoded], name)
+
+    def test_numpy_and_fallback_agree(self):
+        vectorized = TraitsArray(self.WORDS)
+        with mock.patch.object(maker_traits, "optional_numpy", return_value=None):
+            fallback = TraitsArray(self.WORDS)
+            fallback_audit = fallback.audit(200, makers=self.MAKERS)
+        self.assertEqual(self._columns(vectorized), self._columns(fallback))
+        self.assertEqual(vectorized.audit(200, makers=self.MAKERS), fallback_audit)
+
+    def test_audit(self):
+        findings = TraitsArray(self.WORDS).audit(200, makers=self.MAKERS)
+        self.assertEqual(findings[0], [])
+        self.assertEqual(findings[1], [EXPIRED, FLAG_IN_EXPIRATION])
+        self.assertEqual(findings[2], [EPOCH_WITHOUT_MULTIPLE_FILLS])
+        # Same maker (case-insensitive) and nonce on two single-fill orders
+        self.assertEqual(findings[3], [EXPIRED, DUPLICATE_NONCE])
+        self.assertEqual(findings[4], [DUPLICATE_NONCE])
+
+
+if __name__ == "__main__":
+    unittest.main()
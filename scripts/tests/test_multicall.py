@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+🧪 Multicall3 aggregate3 encoding and sweep tests
+==================================================
+
+The ABI layout is checked against a small reference codec written out
+word by word here, so the encoder and decoder cannot pass by agreeing
+with each other.
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evm import address_word, read_word, word  # noqa: E402
+from multicall import (AGGREGATE3_SELECTOR, ALLOWANCE_SELECTOR, BALANCE_OF_SELECTOR,  # noqa: E402
+                       MULTICALL3_ADDRESS, Multicall3, TokenSweep, decode_aggregate3, decode_uint,
+                       encode_aggregate3, encode_allowance, encode_balance_of)
+
+TOKEN = "0x" + "aa" * 20
+BROKEN = "0x" + "bb" * 20
+WALLET = "0x" + "cc" * 20
+SPENDER = "0x" + "dd" * 20
+
+
+def decode_calls(data: bytes):
+    """📥 Reference decoder for ``aggregate3(Call3[])`` calldata → [(target, allowFailure, calldata)]"""
+    assert data[:4] == AGGREGATE3_SELECTOR
+    args = data[4:]
+    array_start = read_word(args, 0) // 32
+    count = read_word(args, array_start)
+    calls = []
+    for i in range(count):
+        start = 32 * (array_start + 1) + read_word(args, array_start + 1 + i)
+        head = args[start:]
+        target = "0x" + head[12:32].hex()
+        length = read_word(head, read_word(head, 2) // 32)
+        body = head[read_word(head, 2) + 32:read_word(head, 2) + 32 + length]
+        calls.append((target, read_word(head, 1) != 0, body))
+    return calls
+
+
+def encode_results(results):
+    """📤 Reference encoder for the returned ``Result[]``, Result = (bool success, bytes returnData)"""
+    items = [word(int(success)) + word(0x40) + word(len(data)) + data + bytes(-len(data) % 32)
+             for success, data in results]
+    offsets, position = [], 32 * len(items)
+    for item in items:
+        offsets.append(word(position))
+        position += len(item)
+    return word(0x20) + word(len(items)) + b"".join(offsets) + b"".join(items)
+
+
+class FakeRpc:
+    """🧪 Executes aggregate3 in-process: BROKEN targets fail, others return len(calldata)"""
+
+    def __init__(self, head: int = 1_000):
+        self.head = head
+        self.eth_calls = []
+
+    def call(self, method, params):
+        assert method == "eth_blockNumber"
+        return hex(self.head)
+
+    def eth_call(self, to, data, block="latest"):
+        self.eth_calls.append((to, block))
+        calls = decode_calls(bytes.fromhex(data[2:]))
+        return "0x" + encode_results([(False, b"") if target == BROKEN else (True, word(len(body)))
+                                      for target, _, body in calls]).hex()
+
+
+class Aggregate3CodecTest(unittest.TestCase):
+    CALLS = [
+        (TOKEN, encode_balance_of(WALLET)),
+        (BROKEN, encode_allowance(WALLET, SPENDER)),
+        (TOKEN, b""),
+        (MULTICALL3_ADDRESS.lower(), bytes(range(100))),
+    ]
+
+    def test_calls_round_trip(self):
+        decoded = decode_calls(encode_aggregate3(self.CALLS))
+        self.assertEqual([(target, body) for target, _, body in decoded], self.CALLS)
+        self.assertTrue(all(allow_failure for _, allow_failure, _ in decoded))
+
+    def test_allow_failure_flag(self):
+        decoded = decode_calls(encode_aggregate3(self.CALLS, allow_failure=False))
+        self.assertFalse(any(allow_failure for _, allow_failure, _ in decoded))
+
+    def test_selectors(self):
+        self.assertEqual(encode_balance_of(WALLET), BALANCE_OF_SELECTOR + address_word(WALLET))
+        self.assertEqual(encode_allowance(WALLET, SPENDER),
+                         ALLOWANCE_SELECTOR + address_word(WALLET) + address_word(SPENDER))
+
+    def test_results_round_trip_with_failure_slots(self):
+        results = [(True, word(7)), (False, b""), (True, b""), (False, b"\x08\xc3\x79\xa0" + bytes(40)),
+                   (True, bytes(range(65)))]
+        self.assertEqual(decode_aggregate3(encode_results(results)), results)
+
+    def test_empty(self):
+        self.assertEqual(decode_calls(encode_aggregate3([])), [])
+        self.assertEqual(decode_aggregate3(encode_results([])), [])
+
+    def test_decode_uint(self):
+        self.assertEqual(decode_uint(word(42) + bytes(32)), 42)
+        self.assertIsNone(decode_uint(b""))
+        self.assertIsNone(decode_uint(bytes(31)))
+
+
+class Multicall3Test(unittest.TestCase):
+    def test_chunks_keep_order_and_block(self):
+        rpc = FakeRpc()
+        calls = [(TOKEN, bytes(n)) for n in range(5)]
+        results = Multicall3(rpc, chunk_size=2).aggregate3(calls, "0x10")
+        self.assertEqual(results, [(True, word(n)) for n in range(5)])
+        self.assertEqual(rpc.eth_calls, [(MULTICALL3_ADDRESS, "0x10")] * 3)
+
+    def test_missing_contract_is_an_error(self):
+        rpc = FakeRpc()
+        rpc.eth_call = lambda to, data, block="latest": "0x"
+        with self.assertRaises(ValueError):
+            Multicall3(rpc).aggregate3([(TOKEN, encode_balance_of(WALLET))])
+
+    def test_sweep_reports_failed_calls_as_none(self):
+        rpc = FakeRpc(head=1_234)
+        tokens = {"GOOD": {"address": TOKEN}, "BAD": {"address": BROKEN}}
+        sweep = TokenSweep(Multicall3(rpc), tokens, SPENDER)
+        self.assertEqual(sweep.sweep([WALLET.upper().replace("0X", "0x")]), 1_234)
+        self.assertEqual(rpc.eth_calls, [(MULTICALL3_ADDRESS, hex(1_234))])
+        self.assertEqual(sweep.native_balance(WALLET), 36)
+        self.assertEqual(sweep.balance(WALLET, "GOOD"), 36)
+        self.assertEqual(sweep.allowance(WALLET, "GOOD"), 68)
+        self.assertIsNone(sweep.balance(WALLET, "BAD"))
+        self.assertIsNone(sweep.allowance(WALLET, "BAD"))
+
+
+if __name__ == "__main__":
+    unittest.main()
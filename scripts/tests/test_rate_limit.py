@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+🧪 Adaptive backoff and retry-budget tests for RateLimitedTransport
+====================================================================
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rate_limit  # noqa: E402
+from rate_limit import RateLimitedTransport, RetryBudget, TokenBucket  # noqa: E402
+from transport import TransportError  # noqa: E402
+
+URL = "http://node.invalid"
+PAYLOAD = {"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}
+RATE = 100.0
+
+
+class ThrottlingTransport:
+    """🚥 Fake transport that raises the queued errors in order, then answers"""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def post(self, url, payload, decode=None):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x1"}
+
+
+def throttle(status=429, retry_after=0.0):
+    # retry_after=0 keeps the bucket pause instant
+    return TransportError(f"{status}", status=status, retry_after=retry_after, url=URL)
+
+
+class RateLimitedTransportTest(unittest.TestCase):
+    def limiter(self, errors=(), retries=10, **kwargs):
+        self.inner = ThrottlingTransport(errors)
+        return RateLimitedTransport(self.inner, rate=RATE, burst=int(RATE), budget=RetryBudget(retries), **kwargs)
+
+    def test_each_throttle_halves_the_rate(self):
+        limiter = self.limiter([throttle(429), throttle(503)])
+        self.assertEqual(limiter.post(URL, PAYLOAD)["result"], "0x1")
+        self.assertEqual(self.inner.calls, 3)
+        # Halved twice, then one success adds back RECOVERY_STEP of the configured rate
+        self.assertAlmostEqual(limiter.bucket(URL).rate, RATE / 4 + RATE * rate_limit.RECOVERY_STEP)
+        self.assertEqual(limiter.budget.used, 2)
+
+    def test_successes_recover_to_the_configured_rate(self):
+        bucket = TokenBucket(RATE)
+        for _ in range(3):
+            bucket.on_throttle(0)
+        self.assertEqual(bucket.rate, RATE / 8)
+        for _ in range(100):
+            bucket.on_success()
+        self.assertEqual(bucket.rate, RATE)
+        self.assertEqual(bucket.throttle_streak, 0)
+
+    def test_rate_never_drops_below_the_floor(self):
+        bucket = TokenBucket(RATE)
+        for _ in range(50):
+            bucket.on_throttle(0)
+        self.assertAlmostEqual(bucket.rate, RATE * rate_limit.MIN_RATE_FRACTION)
+
+    def test_spent_budget_raises_the_throttle(self):
+        limiter = self.limiter([throttle() for _ in range(10)], retries=3)
+        with self.assertRaises(TransportError) as caught:
+            limiter.post(URL, PAYLOAD)
+        self.assertEqual(caught.exception.status, 429)
+        self.assertEqual(self.inner.calls, 4)
+        self.assertEqual(limiter.budget.remaining, 0)
+
+        # The budget spans the command: the next throttle is not retried at all
+        with self.assertRaises(TransportError):
+            limiter.post(URL, PAYLOAD)
+        self.assertEqual(self.inner.calls, 5)
+
+    def test_retry_after_beyond_max_backoff_is_not_waited_out(self):
+        limiter = self.limiter([throttle(retry_after=60)], max_backoff=5)
+        with self.assertRaises(TransportError):
+            limiter.post(URL, PAYLOAD)
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual(limiter.budget.used, 0)
+        self.assertEqual(limiter.bucket(URL).rate, RATE / 2)
+
+    def test_other_errors_are_not_retried_or_throttled(self):
+        limiter = self.limiter([throttle(500)])
+        with self.assertRaises(TransportError):
+            limiter.post(URL, PAYLOAD)
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual(limiter.bucket(URL).rate, RATE)
+
+    def test_without_retries_shares_buckets(self):
+        limiter = self.limiter([throttle()])
+        view = limiter.without_retries()
+        with self.assertRaises(TransportError):
+            view.post(URL, PAYLOAD)
+        self.assertEqual(limiter.bucket(URL).rate, RATE / 2)
+        self.assertEqual(limiter.budget.used, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
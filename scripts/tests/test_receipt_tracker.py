@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+🧪 ReceiptTracker reorg rollback tests against the mock node
+=============================================================
+
+``ForkingChain`` extends the mock node's synthetic chain with one switchable
+fork: blocks from ``fork_at`` up get new hashes and the tracked
+transactions can move to other blocks or disappear.
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+
+Requirements:
+    pip install requests   # HTTP transport to the mock node; skipped without it
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_node import CallError, ChainState, MockNode  # noqa: E402
+from receipt_tracker import ReceiptTracker  # noqa: E402
+from rpc_client import RpcClient, RpcError  # noqa: E402
+from single_flight import SingleFlight  # noqa: E402
+from transport import HttpTransport  # noqa: E402
+
+HEAD = 60_000_000
+START = HEAD - 50
+TX = "0x" + "ab" * 32
+OTHER_TX = "0x" + "cd" * 32
+
+
+def setUpModule():
+    try:
+        import requests  # noqa: F401
+    except ImportError:
+        raise unittest.SkipTest("needs requests")
+
+
+class ForkingChain(ChainState):
+    """🔀 Synthetic chain whose blocks from ``fork_at`` up can be replaced once"""
+
+    def __init__(self, mined):
+        super().__init__(head=HEAD, block_time=0)
+        self.mined = dict(mined)  # tx hash -> block number on the current branch
+        self.fork_at = None
+
+    def reorg(self, fork_at, mined):
+        self.fork_at = fork_at
+        self.mined = dict(mined)
+
+    def block_hash(self, number):
+        if self.fork_at is not None and number >= self.fork_at:
+            return self._hash("block", number, "fork")
+        return self._hash("block", number)
+
+    def block(self, tag):
+        header = super().block(tag)
+        if header is None:
+            return None
+        number = int(header["number"], 16)
+        header["hash"] = self.block_hash(number)
+        header["parentHash"] = self.block_hash(number - 1)
+        header["transactions"] = [tx for tx, block in self.mined.items() if block == number]
+        return header
+
+    def receipt(self, tx_hash):
+        block = self.mined.get(tx_hash)
+        if block is None:
+            return None
+        receipt = super().receipt(tx_hash)
+        receipt.update(blockNumber=hex(block), blockHash=self.block_hash(block))
+        return receipt
+
+    def block_receipts(self, tag):
+        header = self.block(tag)
+        return None if header is None else [self.receipt(tx) for tx in header["transactions"]]
+
+
+class ReorgTest(unittest.TestCase):
+    block_receipts = True
+
+    def setUp(self):
+        self.chain = ForkingChain({TX: START + 2, OTHER_TX: START + 1})
+        self.node = MockNode(self.chain)
+        if self.block_receipts:
+            self.node.handlers["eth_getBlockReceipts"] = lambda p: self.chain.block_receipts(p[0])
+        rpc = RpcClient(self.node.start_in_thread(), transport=HttpTransport(),
+                        flight=SingleFlight(latest_ttl=0))
+        self.tracker = ReceiptTracker(rpc, confirmations=4, timeout_blocks=20)
+        self.tracker.track(TX)
+        self.tracker.track(OTHER_TX)
+
+    def advance(self, start, end):
+        events = []
+        for number in range(start, end + 1):
+            events.extend(self.tracker.on_block(number))
+        return events
+
+    def only(self, events, kind, tx_hash=TX):
+        matches = [e for e in events if e["event"] == kind and e["tx_hash"] == tx_hash]
+        self.assertEqual(len(matches), 1, events)
+        return matches[0]
+
+    def test_reorg_moves_tx_to_new_block(self):
+        mined = self.only(self.advance(START, START + 3), "mined")
+        self.assertEqual((mined["block"], mined["block_hash"]), (START + 2, self.chain.block_hash(START + 2)))
+        self.assertEqual(self.tracker.depth(TX), 2)
+
+        # The branch from START + 2 is replaced; TX lands two blocks later, OTHER_TX is untouched
+        self.chain.reorg(START + 2, {TX: START + 4, OTHER_TX: START + 1})
+        events = self.tracker.on_block(START + 4)
+        reorged = self.only(events, "reorged")
+        self.assertEqual((reorged["old_block"], reorged["old_block_hash"]), (START + 2, mined["block_hash"]))
+        # OTHER_TX sits below the fork: it keeps its block and reaches depth 4 here
+        self.assertEqual([e["event"] for e in events if e["tx_hash"] == OTHER_TX], ["confirmed"])
+        remined = self.only(events, "mined")
+        self.assertEqual((remined["block"], remined["block_hash"]), (START + 4, self.chain.block_hash(START + 4)))
+        self.assertEqual(self.tracker.canonical[START + 2], self.chain.block_hash(START + 2))
+
+        events = self.advance(START + 5, START + 7)
+        self.assertEqual(self.only(events, "confirmed")["block"], START + 7)
+        self.assertEqual(self.tracker.tracked, {})
+
+    def test_reorged_out_tx_returns_to_pending(self):
+        self.advance(START, START + 3)
+        self.chain.reorg(START + 1, {})
+        events = self.tracker.on_block(START + 4)
+        self.assertEqual({e["tx_hash"] for e in events if e["event"] == "reorged"}, {TX, OTHER_TX})
+        self.assertEqual([e for e in events if e["event"] == "mined"], [])
+        self.assertEqual({tx.tx_hash for tx in self.tracker.pending}, {TX, OTHER_TX})
+        self.assertIsNone(self.tracker.depth(TX))
+
+        events = self.advance(START + 5, START + 20)
+        self.assertEqual(self.only(events, "dropped")["waited_blocks"], 20)
+
+    def test_same_height_with_new_hash(self):
+        self.advance(START, START + 2)
+        self.chain.reorg(START + 2, {TX: START + 3, OTHER_TX: START + 1})
+        events = self.tracker.on_block(START + 2)
+        self.only(events, "reorged")
+        self.assertIsNone(self.tracker.depth(TX))
+        self.assertEqual(self.only(self.tracker.on_block(START + 3), "mined")["block"], START + 3)
+
+    def fail_block_receipts(self, code, message):
+        def handler(params):
+            raise CallError(code, message)
+        self.node.handlers["eth_getBlockReceipts"] = handler
+
+    def test_block_receipts_error_is_raised(self):
+        # A lagging node's "header not found" is not "method not found"
+        self.fail_block_receipts(-32000, "header not found")
+        with self.assertRaises(RpcError):
+            self.tracker.on_block(START)
+        self.assertTrue(self.tracker.block_receipts_supported)
+
+    def test_unsupported_phrase_falls_back(self):
+        self.fail_block_receipts(-32000, "eth_getBlockReceipts is not supported on this plan")
+        self.only(self.advance(START, START + 2), "mined")
+        self.assertFalse(self.tracker.block_receipts_supported)
+
+
+class ReorgWithoutBlockReceiptsTest(ReorgTest):
+    """Same scenarios through the header + per-transaction receipt fallback"""
+    block_receipts = False
+
+    def test_falls_back(self):
+        self.advance(START, START + 1)
+        self.assertFalse(self.tracker.block_receipts_supported)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+🧪 Router V6 calldata decoder tests
+====================================
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evm import address_word, word  # noqa: E402
+from router_v6_decoder import (FILL_METHODS, DecodeError, Order, decode_fill_call,  # noqa: E402
+                               decode_fill_calls, is_fill_call)
+
+MAKER = "0x" + "11" * 20
+RECEIVER = "0x" + "00" * 20
+WMATIC = "0x0d500b1d8e8ef31e21c99d1db9a6444d3adf1270"
+USDC = "0x3c499c542cef5e3811e1192ce70d8cc03d5c3359"
+ORDER = Order(salt=12345, maker=MAKER, receiver=RECEIVER, maker_asset=WMATIC, taker_asset=USDC,
+              making_amount=10**18, taking_amount=500_000, maker_traits=1 << 255 | 42)
+R = bytes(range(32))
+VS = bytes(range(32, 64))
+TAKER_TRAITS = 1 << 255 | 7 << 224 | 500_000
+
+
+def encode_order(order: Order) -> bytes:
+    return b"".join([word(order.salt), address_word(order.maker), address_word(order.receiver),
+                     address_word(order.maker_asset), address_word(order.taker_asset),
+                     word(order.making_amount), word(order.taking_amount), word(order.maker_traits)])
+
+
+def encode_bytes(data: bytes) -> bytes:
+    padding = -len(data) % 32
+    return word(len(data)) + data + bytes(padding)
+
+
+def selector(method: str) -> bytes:
+    return next(sel for sel, (name, _) in FILL_METHODS.items() if name == method)
+
+
+def fill_order(amount: int = 10**18) -> bytes:
+    return selector("fillOrder") + encode_order(ORDER) + R + VS + word(amount) + word(TAKER_TRAITS)
+
+
+def fill_contract_order_args(signature: bytes, args: bytes) -> bytes:
+    # Head: Order (8 words), signature offset, amount, taker traits, args offset
+    head_size = 12 * 32
+    signature_tail = encode_bytes(signature)
+    head = (encode_order(ORDER) + word(head_size) + word(10**18) + word(TAKER_TRAITS)
+            + word(head_size + len(signature_tail)))
+    return selector("fillContractOrderArgs") + head + signature_tail + encode_bytes(args)
+
+
+class DecodeFillCallTest(unittest.TestCase):
+    def test_fill_order(self):
+        fill = decode_fill_call(fill_order())
+        self.assertEqual(fill.method, "fillOrder")
+        self.assertEqual(fill.selector, "0x9fda64bd")
+        self.assertEqual(fill.order, ORDER)
+        self.assertEqual((fill.r, fill.vs, fill.signature), (R, VS, None))
+        self.assertEqual(fill.amount, 10**18)
+        self.assertEqual(fill.args, b"")
+
+    def test_taker_traits(self):
+        traits = decode_fill_call(fill_order()).taker_traits
+        self.assertEqual(traits.raw, TAKER_TRAITS)
+        self.assertTrue(traits.maker_amount)
+        self.assertFalse(traits.unwrap_weth)
+        self.assertEqual(traits.extension_length, 7)
+        self.assertEqual(traits.interaction_length, 0)
+        self.assertEqual(traits.threshold, 500_000)
+
+    def test_hex_string_input(self):
+        calldata = fill_order()
+        self.assertEqual(decode_fill_call("0x" + calldata.hex()), decode_fill_call(calldata))
+        self.assertEqual(decode_fill_call(calldata.hex()), decode_fill_call(bytearray(calldata)))
+
+    def test_contract_order_dynamic_bytes(self):
+        signature = bytes(range(65))
+        args = b"\xaa" * 7
+        fill = decode_fill_call(fill_contract_order_args(signature, args))
+        self.assertEqual(fill.method, "fillContractOrderArgs")
+        self.assertEqual(fill.order, ORDER)
+        self.assertEqual((fill.r, fill.vs), (None, None))
+        self.assertEqual(fill.signature, signature)
+        self.assertEqual(fill.args, args)
+        self.assertEqual(fill.amount, 10**18)
+
+    def test_unknown_selector(self):
+        calldata = b"\xa9\x05\x9c\xbb" + bytes(64)  # ERC-20 transfer
+        self.assertFalse(is_fill_call(calldata))
+        with self.assertRaises(DecodeError):
+            decode_fill_call(calldata)
+
+    def test_truncated_calldata(self):
+        calldata = fill_order()
+        self.assertTrue(is_fill_call(calldata[:4]))
+        with self.assertRaises(DecodeError):
+            decode_fill_call(calldata[:4 + 7 * 32])  # inside the Order tuple
+        with self.assertRaises(DecodeError):
+            decode_fill_call(calldata[:-32])  # missing taker traits
+
+    def test_dynamic_offset_out_of_range(self):
+        calldata = bytearray(fill_contract_order_args(b"\x01" * 65, b""))
+        calldata[4 + 8 * 32:4 + 9 * 32] = word(10**6)
+        with self.assertRaises(DecodeError):
+            decode_fill_call(bytes(calldata))
+
+    def test_matches_eth_abi_encoding(self):
+        try:
+            from eth_abi import encode
+        except ImportError:
+            self.skipTest("needs eth-abi")
+        order = (ORDER.salt, int(ORDER.maker, 16), int(ORDER.receiver, 16), int(ORDER.maker_asset, 16),
+                 int(ORDER.taker_asset, 16), ORDER.making_amount, ORDER.taking_amount, ORDER.maker_traits)
+        calldata = selector("fillOrderArgs") + encode(
+            ["(uint256,uint256,uint256,uint256,uint256,uint256,uint256,uint256)",
+             "bytes32", "bytes32", "uint256", "uint256", "bytes"],
+            [order, R, VS, 10**18, TAKER_TRAITS, b"\x01\x02\x03"])
+        fill = decode_fill_call(calldata)
+        self.assertEqual(fill.method, "fillOrderArgs")
+        self.assertEqual(fill.order, ORDER)
+        self.assertEqual((fill.r, fill.vs, fill.amount), (R, VS, 10**18))
+        self.assertEqual(fill.taker_traits.raw, TAKER_TRAITS)
+        self.assertEqual(fill.args, b"\x01\x02\x03")
+
+    def test_batch_yields_none_for_bad_inputs(self):
+        good = fill_order()
+        decoded = decode_fill_calls([good, "0x1234", "not hex", good.hex()])
+        self.assertEqual(decoded[0], decoded[3])
+        self.assertIsNotNone(decoded[0])
+        self.assertEqual(decoded[1:3], [None, None])
+
+
+class SelectorTest(unittest.TestCase):
+    def test_selectors_match_signatures(self):
+        try:
+            from eip712 import keccak256
+            keccak256(b"")
+        except ImportError:
+            self.skipTest("needs eth-hash or pycryptodome")
+        order = "(uint256,uint256,uint256,uint256,uint256,uint256,uint256,uint256)"
+        signatures = {
+            "fillOrder": f"fillOrder({order},bytes32,bytes32,uint256,uint256)",
+            "fillOrderArgs": f"fillOrderArgs({order},bytes32,bytes32,uint256,uint256,bytes)",
+            "fillContractOrder": f"fillContractOrder({order},bytes,uint256,uint256)",
+            "fillContractOrderArgs": f"fillContractOrderArgs({order},bytes,uint256,uint256,bytes)",
+        }
+        for method, signature in signatures.items():
+            self.assertEqual(selector(method), keccak256(signature.encode())[:4], method)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+🧪 BlockPinnedCache finality tests
+===================================
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rpc_cache import FINALITY_DEPTH, BlockPinnedCache, cache_key  # noqa: E402
+from rpc_client import RpcClient  # noqa: E402
+from single_flight import SingleFlight  # noqa: E402
+
+URL = "http://node.invalid"
+HEAD = 60_000_000
+WALLET = "0x" + "ab" * 20
+TX = "0x" + "cd" * 32
+
+
+def balance(block):
+    return ["eth_getBalance", [WALLET, hex(block)]]
+
+
+class CountingNode:
+    """🧮 Fake transport answering eth_blockNumber with HEAD and counting every request"""
+
+    def __init__(self):
+        self.methods = []
+
+    def post(self, url, payload, decode=None):
+        self.methods.append(payload["method"])
+        result = hex(HEAD) if payload["method"] == "eth_blockNumber" else "0x64"
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": result}
+
+
+class BlockPinnedCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = BlockPinnedCache(":memory:")
+        self.head_reads = 0
+
+    def tearDown(self):
+        self.cache.close()
+
+    def head(self):
+        self.head_reads += 1
+        return HEAD
+
+    def test_never_caches_within_finality_depth(self):
+        for depth in (0, 1, FINALITY_DEPTH - 1):
+            self.assertFalse(self.cache.put(*balance(HEAD - depth), "0x1", self.head))
+            self.assertEqual(self.cache.get(*balance(HEAD - depth)), (False, None))
+        # Blocks "ahead" of a stale head are not final either
+        self.assertFalse(self.cache.put(*balance(HEAD + 5), "0x1", self.head))
+
+    def test_caches_from_finality_depth_down(self):
+        for depth in (FINALITY_DEPTH, FINALITY_DEPTH + 1, 10 * FINALITY_DEPTH):
+            self.assertTrue(self.cache.put(*balance(HEAD - depth), hex(depth), self.head))
+            self.assertEqual(self.cache.get(*balance(HEAD - depth)), (True, hex(depth)))
+
+    def test_mined_results_use_their_own_block(self):
+        recent = {"transactionHash": TX, "blockNumber": hex(HEAD - FINALITY_DEPTH + 1)}
+        self.assertFalse(self.cache.put("eth_getTransactionReceipt", [TX], recent, self.head))
+        final = dict(recent, blockNumber=hex(HEAD - FINALITY_DEPTH))
+        self.assertTrue(self.cache.put("eth_getTransactionReceipt", [TX], final, self.head))
+        self.assertEqual(self.cache.get("eth_getTransactionReceipt", [TX]), (True, final))
+
+    def test_pending_and_unpinned_reads_never_ask_for_head(self):
+        pending = {"hash": TX, "blockNumber": None}
+        self.assertFalse(self.cache.put("eth_getTransactionByHash", [TX], pending, self.head))
+        self.assertFalse(self.cache.put("eth_getBalance", [WALLET, "latest"], "0x1", self.head))
+        self.assertFalse(self.cache.put("eth_getTransactionReceipt", [TX], None, self.head))
+        self.assertFalse(self.cache.is_cacheable("eth_getBalance", [WALLET, "latest"]))
+        self.assertEqual(self.head_reads, 0)
+
+    def test_keys_ignore_hex_case(self):
+        self.assertEqual(cache_key("eth_getBalance", [WALLET.upper().replace("0X", "0x"), "0xABC"]),
+                         cache_key("eth_getBalance", [WALLET, "0xabc"]))
+
+    def test_entries_survive_reopening(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite3")
+            cache = BlockPinnedCache(path)
+            cache.put(*balance(HEAD - FINALITY_DEPTH), "0x7", self.head)
+            cache.close()
+            reopened = BlockPinnedCache(path)
+            self.assertEqual(reopened.get(*balance(HEAD - FINALITY_DEPTH)), (True, "0x7"))
+            reopened.close()
+
+
+class ClientCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.node = CountingNode()
+        self.rpc = RpcClient(URL, cache=BlockPinnedCache(":memory:"), transport=self.node,
+                             flight=SingleFlight(latest_ttl=0))
+
+    def tearDown(self):
+        self.rpc.cache.close()
+
+    def test_recent_blocks_are_always_fetched(self):
+        for _ in range(3):
+            self.rpc.call(*balance(HEAD - 10))
+        self.assertEqual(self.node.methods.count("eth_getBalance"), 3)
+
+    def test_final_blocks_are_fetched_once(self):
+        for _ in range(3):
+            self.assertEqual(self.rpc.call(*balance(HEAD - FINALITY_DEPTH)), "0x64")
+        self.assertEqual(self.node.methods, ["eth_getBalance", "eth_blockNumber"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+🧪 JSON-RPC batch reordering, partial-error and log range splitting tests
+==========================================================================
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from check_wallet_transactions import PolygonWalletChecker  # noqa: E402
+from rpc_client import RpcClient, RpcError, logs_range_too_large  # noqa: E402
+from single_flight import SingleFlight  # noqa: E402
+from transport import TransportError  # noqa: E402
+
+URL = "http://node.invalid"
+ADDRESS = "0x" + "11" * 20
+BLOCK = "0x10"
+
+CALLS = [
+    ("eth_getTransactionCount", [ADDRESS, BLOCK]),
+    ("eth_getBalance", [ADDRESS, BLOCK]),
+    ("eth_call", [{"to": ADDRESS, "data": "0x"}, BLOCK]),
+    ("eth_getCode", [ADDRESS, BLOCK]),
+]
+RESULTS = {"eth_getTransactionCount": "0x5", "eth_getBalance": "0x64", "eth_getCode": "0x6080"}
+REVERTED = {"code": 3, "message": "execution reverted"}
+
+
+class FakeNode:
+    """🧪 Scripted transport: answers arrays out of order, can drop ids or refuse arrays"""
+
+    def __init__(self, drop=(), refuse_arrays=None):
+        self.drop = set(drop)                # methods left out of array responses
+        self.refuse_arrays = refuse_arrays   # None, "object" or an HTTP status
+        self.payloads = []
+
+    def _answer(self, request):
+        if request["method"] == "eth_call":
+            return {"jsonrpc": "2.0", "id": request["id"], "error": REVERTED}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": RESULTS[request["method"]]}
+
+    def post(self, url, payload):
+        self.payloads.append(payload)
+        if not isinstance(payload, list):
+            return self._answer(payload)
+        if self.refuse_arrays == "object":
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch not supported"}}
+        if self.refuse_arrays is not None:
+            raise TransportError("batch refused", status=self.refuse_arrays, url=url)
+        answers = [self._answer(request) for request in payload if request["method"] not in self.drop]
+        return list(reversed(answers))
+
+
+def client(node):
+    return RpcClient(URL, transport=node, flight=SingleFlight(latest_ttl=0))
+
+
+class BatchTest(unittest.TestCase):
+    def assert_results(self, results):
+        self.assertEqual(results[0], "0x5")
+        self.assertEqual(results[1], "0x64")
+        self.assertIsInstance(results[2], RpcError)
+        self.assertEqual(results[2].code, 3)
+        self.assertEqual(results[3], "0x6080")
+
+    def test_reordered_response(self):
+        node = FakeNode()
+        self.assert_results(client(node).batch(CALLS))
+        self.assertEqual(len(node.payloads), 1)
+        ids = [request["id"] for request in node.payloads[0]]
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_dropped_ids_are_retried_alone(self):
+        node = FakeNode(drop={"eth_getBalance", "eth_getCode"})
+        self.assert_results(client(node).batch(CALLS))
+        self.assertEqual([p["method"] for p in node.payloads[1:]], ["eth_getBalance", "eth_getCode"])
+
+    def test_falls_back_when_arrays_refused(self):
+        for refusal in ("object", 400):
+            node = FakeNode(refuse_arrays=refusal)
+            rpc = client(node)
+            self.assert_results(rpc.batch(CALLS))
+            self.assertFalse(rpc.batch_supported)
+            # Later batches go straight to sequential calls
+            node.payloads.clear()
+            self.assert_results(rpc.batch(CALLS))
+            self.assertTrue(all(isinstance(p, dict) for p in node.payloads))
+
+    def test_throttling_is_not_mistaken_for_refusal(self):
+        for status in (429, 503):
+            rpc = client(FakeNode(refuse_arrays=status))
+            with self.assertRaises(TransportError):
+                rpc.batch(CALLS)
+            self.assertTrue(rpc.batch_supported)
+
+    def test_single_call_is_not_wrapped(self):
+        node = FakeNode()
+        self.assertEqual(client(node).batch(CALLS[:1]), ["0x5"])
+        self.assertIsInstance(node.payloads[0], dict)
+
+
+class WalletCheckerBatchTest(unittest.TestCase):
+    def test_errors_become_none_in_place(self):
+        checker = PolygonWalletChecker(URL, transport=FakeNode())
+        checker.rpc.flight = SingleFlight(latest_ttl=0)
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            results = checker.json_rpc_batch(CALLS)
+        self.assertEqual(results, ["0x5", "0x64", None, "0x6080"])
+        self.assertIn("eth_call", out.getvalue())
+
+    def test_transport_failure_fails_every_slot(self):
+        checker = PolygonWalletChecker(URL, transport=FakeNode(refuse_arrays=502))
+        checker.rpc.flight = SingleFlight(latest_ttl=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(checker.json_rpc_batch(CALLS), [None] * len(CALLS))
+        self.assertEqual(checker.json_rpc_batch([]), [])
+
+
+
+class NarrowLogsNode:
+    """🧪 ``eth_getLogs`` endpoint that fails any range wider than ``max_span`` blocks with ``error``"""
+
+    def __init__(self, error, max_span=1):
+        self.error = error
+        self.max_span = max_span
+        self.spans = []
+
+    def post(self, url, payload, decode=None):
+        log_filter = payload["params"][0]
+        span = int(log_filter["toBlock"], 16) - int(log_filter["fromBlock"], 16) + 1
+        self.spans.append(span)
+        if span > self.max_span:
+            raise self.error
+        return (decode or json.loads)(json.dumps({"jsonrpc": "2.0", "id": payload["id"], "result": []}).encode())
+
+
+class LogsRangeTest(unittest.TestCase):
+    def get_logs(self, error):
+        node = NarrowLogsNode(error)
+        RpcClient(URL, transport=node, flight=SingleFlight(latest_ttl=0)).get_logs({"address": ADDRESS}, 0, 3)
+        return node.spans
+
+    def test_read_timeout_and_oversized_responses_split(self):
+        for error in (TransportError("read timed out", url=URL, timed_out=True),
+                      TransportError("HTTP 413", status=413, url=URL),
+                      TransportError("HTTP 504", status=504, url=URL)):
+            # Halves on failure, grows back after every success
+            self.assertEqual(self.get_logs(error), [4, 2, 1, 2, 1, 2, 1, 1], error)
+
+    def test_connection_failures_fail_fast(self):
+        for error in (TransportError("connection refused", url=URL),
+                      TransportError("HTTP 429", status=429, url=URL),
+                      TransportError("HTTP 503", status=503, url=URL)):
+            self.assertFalse(logs_range_too_large(error))
+            node = NarrowLogsNode(error)
+            with self.assertRaises(TransportError):
+                RpcClient(URL, transport=node, flight=SingleFlight(latest_ttl=0)).get_logs({}, 0, 3)
+            self.assertEqual(node.spans, [4])
+
+    def test_rpc_errors(self):
+        self.assertTrue(logs_range_too_large(RpcError("eth_getLogs", {"code": -32005, "message": "query returned "
+                                                                      "more than 10000 results"})))
+        self.assertFalse(logs_range_too_large(RpcError("eth_getLogs", {"code": -32005,
+                                                                       "message": "rate limit exceeded"})))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+🧪 RpcRouter hedging and failover tests
+========================================
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rpc_router  # noqa: E402
+from rpc_router import RpcRouter  # noqa: E402
+from transport import TransportError  # noqa: E402
+
+FAST = "http://fast.invalid"
+SLOW = "http://slow.invalid"
+SPARE = "http://spare.invalid"
+READ = {"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber", "params": []}
+WRITE = {"jsonrpc": "2.0", "id": 1, "method": "eth_sendRawTransaction", "params": ["0x00"]}
+
+
+class ScriptedTransport:
+    """🎬 Fake transport: each URL answers at once, raises, or blocks until released"""
+
+    def __init__(self, script):
+        self.script = script  # url -> result, TransportError, or "block"
+        self.release = threading.Event()
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def post(self, url, payload, decode=None):
+        with self._lock:
+            self.calls.append(url)
+        answer = self.script[url]
+        if answer == "block":
+            self.release.wait(5)
+            return {"jsonrpc": "2.0", "id": payload["id"], "result": url}
+        if isinstance(answer, TransportError):
+            raise answer
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": answer}
+
+
+class RpcRouterTest(unittest.TestCase):
+    def router(self, script, latencies=None):
+        self.transport = ScriptedTransport(script)
+        router = RpcRouter(list(script), transport=self.transport)
+        # Measured latencies fix the ranking (and each endpoint's hedge delay)
+        for stats in router.endpoints:
+            if latencies and stats.url in latencies:
+                stats.record_success(latencies[stats.url])
+        return router
+
+    def tearDown(self):
+        self.transport.release.set()
+
+    def test_slow_read_is_hedged_after_p99(self):
+        router = self.router({SLOW: "block", FAST: "0x2"}, latencies={SLOW: 0.001, FAST: 0.002})
+        started = time.monotonic()
+        response = router.post("ignored", READ)
+        self.assertEqual(response["result"], "0x2")
+        self.assertEqual(self.transport.calls, [SLOW, FAST])
+        # Hedged after the clamped p99, well before the slow endpoint answers
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_fast_read_is_not_hedged(self):
+        router = self.router({FAST: "0x1", SLOW: "0x2"}, latencies={FAST: 0.001, SLOW: 0.002})
+        self.assertEqual(router.post("ignored", READ)["result"], "0x1")
+        time.sleep(2 * rpc_router.MIN_HEDGE_DELAY)
+        self.assertEqual(self.transport.calls, [FAST])
+
+    def test_throttled_endpoint_fails_over_without_waiting_for_hedge(self):
+        throttled = TransportError("429 Too Many Requests", status=429, retry_after=30, url=SLOW)
+        router = self.router({SLOW: throttled, FAST: "0x2", SPARE: "0x3"})
+        started = time.monotonic()
+        self.assertEqual(router.post("ignored", READ)["result"], "0x2")
+        # Unmeasured endpoints hedge after MAX_HEDGE_DELAY; the failover must not wait for it
+        self.assertLess(time.monotonic() - started, rpc_router.MAX_HEDGE_DELAY / 2)
+        self.assertEqual(self.transport.calls, [SLOW, FAST])
+        self.assertFalse(router.endpoints[0].is_healthy())
+        self.assertEqual([stats.url for stats in router.ranked()][-1], SLOW)
+
+    def test_every_endpoint_failing_raises_the_last_error(self):
+        router = self.router({
+            SLOW: TransportError("503", status=503, url=SLOW),
+            FAST: TransportError("connection refused", url=FAST),
+        })
+        with self.assertRaises(TransportError) as caught:
+            router.post("ignored", READ)
+        self.assertEqual(caught.exception.url, FAST)
+        self.assertEqual(self.transport.calls, [SLOW, FAST])
+
+    def test_client_error_is_not_failed_over(self):
+        router = self.router({SLOW: TransportError("400 Bad Request", status=400, url=SLOW), FAST: "0x2"})
+        with self.assertRaises(TransportError) as caught:
+            router.post("ignored", READ)
+        self.assertEqual(caught.exception.status, 400)
+        self.assertEqual(self.transport.calls, [SLOW])
+
+    def test_writes_are_never_hedged(self):
+        router = self.router({SLOW: "block", FAST: "0x2"}, latencies={SLOW: 0.001, FAST: 0.002})
+        threading.Timer(4 * rpc_router.MIN_HEDGE_DELAY, self.transport.release.set).start()
+        self.assertEqual(router.post("ignored", WRITE)["result"], SLOW)
+        self.assertEqual(self.transport.calls, [SLOW])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+🧪 Typed JSON-RPC result decoding tests
+========================================
+
+Results are decoded from response bytes, through ``RpcClient`` and on the
+stdlib fallback used when msgspec is not installed.
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import unittest
+from typing import List
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rpc_types  # noqa: E402
+from rpc_cache import BlockPinnedCache  # noqa: E402
+from rpc_client import RpcClient, RpcError  # noqa: E402
+from rpc_types import Block, FullBlock, Log, Receipt, Transaction, decode_response, decode_result  # noqa: E402
+from single_flight import SingleFlight  # noqa: E402
+from transport import TransportError  # noqa: E402
+
+URL = "http://node.invalid"
+TX = "0x" + "ab" * 32
+SENDER = "0x" + "11" * 20
+TOKEN = "0x" + "22" * 20
+HEAD = 0x1000
+
+LOG = {
+    "address": TOKEN,
+    "topics": ["0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef",
+               "0x" + SENDER[2:].rjust(64, "0"), "0x" + "33" * 32],
+    "data": "0x" + "00" * 31 + "64",
+    "blockNumber": "0x10",
+    "blockHash": "0x" + "b1" * 32,
+    "transactionHash": TX,
+    "transactionIndex": "0x2",
+    "logIndex": "0x7",
+    "removed": False,
+}
+RECEIPT = {
+    "transactionHash": TX,
+    "blockNumber": "0x10",
+    "blockHash": "0x" + "b1" * 32,
+    "transactionIndex": "0x2",
+    "from": SENDER,
+    "to": TOKEN,
+    "status": "0x1",
+    "gasUsed": "0xc350",
+    "cumulativeGasUsed": "0x4c4b40",
+    "effectiveGasPrice": "0x826299e00",
+    "contractAddress": None,
+    "logs": [LOG],
+    "type": "0x2",  # not a Receipt field - ignored
+}
+TRANSACTION = {
+    "hash": TX,
+    "from": SENDER,
+    "to": TOKEN,
+    "nonce": "0x5",
+    "value": "0x0",
+    "gas": "0x186a0",
+    "maxFeePerGas": "0x826299e00",
+    "input": "0xa9059cbb",
+    "type": "0x2",
+    "blockNumber": "0x10",
+    "blockHash": "0x" + "b1" * 32,
+    "transactionIndex": "0x2",
+}
+BLOCK = {
+    "number": "0x10",
+    "hash": "0x" + "b1" * 32,
+    "parentHash": "0x" + "b0" * 32,
+    "timestamp": "0x65000000",
+    "transactions": [TRANSACTION],
+}
+RESULTS = {
+    "eth_getTransactionReceipt": RECEIPT,
+    "eth_getTransactionByHash": TRANSACTION,
+    "eth_getBlockByNumber": BLOCK,
+    "eth_getLogs": [LOG],
+    "eth_blockNumber": hex(HEAD),
+}
+
+
+def body(*responses) -> bytes:
+    return json.dumps(list(responses) if len(responses) > 1 else responses[0]).encode()
+
+
+def fields(value):
+    """Struct → plain nested dict, for comparing the msgspec and fallback classes"""
+    if isinstance(value, list):
+        return [fields(item) for item in value]
+    if hasattr(value, "__struct_fields__"):
+        return {name: fields(getattr(value, name)) for name in value.__struct_fields__}
+    return value
+
+
+class BytesNode:
+    """🧪 Transport that serialises its answers and hands the bytes to ``decode``"""
+
+    def __init__(self):
+        self.payloads = []
+        self.decoders = []
+
+    def _answer(self, request):
+        if request["method"] == "eth_call":
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": 3, "message": "execution reverted"}}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": RESULTS.get(request["method"])}
+
+    def post(self, url, payload, decode=None):
+        self.payloads.append(payload)
+        self.decoders.append(decode)
+        data = [self._answer(r) for r in payload] if isinstance(payload, list) else self._answer(payload)
+        return (decode or json.loads)(json.dumps(data).encode())
+
+
+def client(node, cache=None):
+    return RpcClient(URL, transport=node, cache=cache, flight=SingleFlight(latest_ttl=0))
+
+
+class DecodeTest(unittest.TestCase):
+    def test_envelopes_keep_results_undecoded(self):
+        data = decode_response(body({"jsonrpc": "2.0", "id": 1, "result": RECEIPT},
+                                    {"jsonrpc": "2.0", "id": 2, "error": {"code": -32000, "message": "boom"}}))
+        self.assertEqual([item["id"] for item in data], [1, 2])
+        self.assertNotIn("error", data[0])
+        self.assertEqual(data[1]["error"]["message"], "boom")
+        self.assertEqual(decode_result(data[0]["result"], None), RECEIPT)
+
+    def test_receipt(self):
+        data = decode_response(body({"jsonrpc": "2.0", "id": 1, "result": RECEIPT}))
+        receipt = decode_result(data["result"], Receipt)
+        self.assertIsInstance(receipt, Receipt)
+        self.assertEqual((receipt.block_number, receipt.gas_used, receipt.status), (16, 50_000, 1))
+        self.assertTrue(receipt.succeeded)
+        self.assertEqual(receipt.sender, SENDER)
+        self.assertIsNone(receipt.contract_address)
+        self.assertEqual(receipt.logs[0].log_index, 7)
+        with self.assertRaises(AttributeError):
+            receipt.status = 0
+
+    def test_blocks_and_null(self):
+        full = decode_result(decode_response(body({"id": 1, "result": BLOCK}))["result"], FullBlock)
+        self.assertEqual((full.number, full.timestamp), (16, 0x65000000))
+        self.assertEqual(full.transactions[0].max_fee_per_gas, 35 * 10**9)
+        self.assertIsNone(full.transactions[0].gas_price)
+        header = decode_result({**BLOCK, "transactions": [TX]}, Block)
+        self.assertEqual(header.transactions, [TX])
+        # newHeads notifications have no transaction list
+        self.assertEqual(decode_result({k: v for k, v in BLOCK.items() if k != "transactions"}, Block).transactions, [])
+        self.assertIsNone(decode_result(decode_response(body({"id": 1, "result": None}))["result"], Receipt))
+
+    def test_malformed_is_value_error(self):
+        with self.assertRaises(ValueError):
+            decode_result({**RECEIPT, "gasUsed": "0xzz"}, Receipt)
+        with self.assertRaises(ValueError):
+            decode_result({k: v for k, v in RECEIPT.items() if k != "blockHash"}, Receipt)
+        with self.assertRaises(ValueError):
+            decode_response(b"{not json")
+
+    def test_fallback_matches_msgspec(self):
+        if rpc_types.msgspec is None:
+            self.skipTest("needs msgspec to compare against")
+        with mock.patch.dict(sys.modules, {"msgspec": None}):
+            spec = importlib.util.spec_from_file_location("rpc_types_fallback", rpc_types.__file__)
+            fallback = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(fallback)
+        self.assertIsNone(fallback.msgspec)
+
+        raw = body({"jsonrpc": "2.0", "id": 1, "result": RECEIPT}, {"jsonrpc": "2.0", "id": 2, "result": BLOCK})
+        typed = [decode_result(item["result"], tp) for item, tp in zip(decode_response(raw), (Receipt, FullBlock))]
+        plain = [fallback.decode_result(item["result"], tp)
+                 for item, tp in zip(fallback.decode_response(raw), (fallback.Receipt, fallback.FullBlock))]
+        self.assertEqual(fields(plain), fields(typed))
+        self.assertEqual(repr(plain[0].logs[0]), repr(typed[0].logs[0]))
+
+
+class ClientTest(unittest.TestCase):
+    def test_mixed_batch(self):
+        node = BytesNode()
+        header, receipt, head, reverted = client(node).batch([
+            ("eth_getBlockByNumber", ["0x10", True], FullBlock),
+            ("eth_getTransactionReceipt", [TX], Receipt),
+            ("eth_blockNumber", []),
+            ("eth_call", [{"to": TOKEN, "data": "0x"}, "0x10"], Block),
+        ])
+        self.assertEqual(len(node.payloads), 1)
+        self.assertIs(node.decoders[0], decode_response)
+        self.assertIsInstance(header, FullBlock)
+        self.assertEqual(receipt.gas_used, 50_000)
+        self.assertEqual(head, hex(HEAD))  # untyped slot stays plain JSON
+        self.assertIsInstance(reverted, RpcError)
+
+    def test_untyped_calls_use_plain_decoding(self):
+        node = BytesNode()
+        rpc = client(node)
+        self.assertEqual(rpc.call("eth_getTransactionReceipt", [TX]), RECEIPT)
+        rpc.batch([("eth_blockNumber", []), ("eth_getTransactionByHash", [TX])])
+        self.assertEqual(node.decoders, [None, None])
+
+    def test_get_logs_is_typed(self):
+        logs = client(BytesNode()).get_logs({"address": TOKEN}, 0x10, 0x10)
+        self.assertEqual([(log.block_number, log.log_index) for log in logs], [(16, 7)])
+        self.assertIsInstance(logs[0], Log)
+
+    def test_cache_stores_wire_json(self):
+        cache = BlockPinnedCache(":memory:")
+        node = BytesNode()
+        rpc = client(node, cache)
+        receipt = rpc.call("eth_getTransactionReceipt", [TX], Receipt)
+        self.assertEqual(cache.get("eth_getTransactionReceipt", [TX]), (True, RECEIPT))
+        sent = len(node.payloads)
+        # Typed and plain callers are both served from the one entry
+        self.assertEqual(rpc.call("eth_getTransactionReceipt", [TX], Receipt), receipt)
+        self.assertEqual(rpc.call("eth_getTransactionReceipt", [TX]), RECEIPT)
+        self.assertEqual(rpc.batch([("eth_getTransactionReceipt", [TX], Receipt)]), [receipt])
+        self.assertEqual(len(node.payloads), sent)
+
+    def test_typed_and_plain_reads_never_share_a_flight(self):
+        flight = SingleFlight()
+        self.assertNotEqual(flight.key(URL, "eth_getTransactionByHash", [TX]),
+                            flight.key(URL, "eth_getTransactionByHash", [TX], Transaction))
+        self.assertNotEqual(flight.key(URL, "eth_getLogs", [{}], List[Log]),
+                            flight.key(URL, "eth_getLogs", [{}], Log))
+
+    def test_bad_result_is_transport_error(self):
+        node = BytesNode()
+        with self.assertRaises(TransportError):
+            client(node).call("eth_blockNumber", [], Receipt)
+
+
+if __name__ == "__main__":
+    unittest.main()
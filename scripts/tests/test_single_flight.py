@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+🧪 Single-flight coalescing and batch demultiplexing tests
+===========================================================
+
+Usage:
+    python3 -m unittest discover -s scripts/tests
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rpc_client import RpcClient, RpcError  # noqa: E402
+from single_flight import SingleFlight, is_latest_read  # noqa: E402
+
+URL = "http://node.invalid"
+ADDRESS = "0x" + "11" * 20
+OTHER = "0x" + "22" * 20
+
+
+def wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for callers to coalesce")
+        time.sleep(0.001)
+
+
+class GatedTransport:
+    """🚪 Fake transport that answers every request only once ``gate`` is set"""
+
+    def __init__(self, answers):
+        self.answers = answers  # method -> result, or an error dict
+        self.gate = threading.Event()
+        self.payloads = []
+        self._lock = threading.Lock()
+
+    def _answer(self, request):
+        answer = self.answers[request["method"]]
+        if isinstance(answer, dict) and "code" in answer:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": answer}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": answer}
+
+    def post(self, url, payload):
+        with self._lock:
+            self.payloads.append(payload)
+        self.gate.wait(5)
+        if isinstance(payload, list):
+            return [self._answer(request) for request in payload]
+        return self._answer(payload)
+
+    def methods(self):
+        return [[r["method"] for r in p] if isinstance(p, list) else p["method"] for p in self.payloads]
+
+
+def run_threads(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def run(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_callers_share_one_fetch(self):
+        flight = SingleFlight(latest_ttl=0)
+        gate = threading.Event()
+        fetches = []
+
+        def fetch():
+            fetches.append(1)
+            gate.wait(5)
+            return {"value": 42}
+
+        params = [ADDRESS, "0x10"]
+        threads, results, errors = run_threads(8, lambda: flight.call(URL, "eth_getBalance", params, fetch))
+        wait_until(lambda: flight.stats()["coalesced"] == 7)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(errors, [None] * 8)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.stats(), {"requests": 1, "coalesced": 7, "ttl_hits": 0})
+
+    def test_error_reaches_every_follower(self):
+        flight = SingleFlight(latest_ttl=0)
+        gate = threading.Event()
+
+        def fetch():
+            gate.wait(5)
+            raise RpcError("eth_call", {"code": 3, "message": "execution reverted"})
+
+        threads, results, errors = run_threads(4, lambda: flight.call(URL, "eth_call", [{}, "0x1"], fetch))
+        wait_until(lambda: flight.stats()["coalesced"] == 3)
+        gate.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(all(isinstance(error, RpcError) for error in errors))
+        self.assertTrue(all(error is errors[0] for error in errors))
+        # The failed flight is released, so the next caller asks again
+        self.assertEqual(flight.call(URL, "eth_call", [{}, "0x1"], lambda: "0x"), "0x")
+
+    def test_keys_separate_endpoints_and_params(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.key(URL, "eth_getBalance", [ADDRESS, "0x10"]),
+                         flight.key(URL, "eth_getBalance", [ADDRESS, "0x10"]))
+        self.assertNotEqual(flight.key(URL, "eth_getBalance", [ADDRESS, "0x10"]),
+                            flight.key(URL, "eth_getBalance", [OTHER, "0x10"]))
+        self.assertNotEqual(flight.key(URL, "eth_getBalance", [ADDRESS, "0x10"]),
+                            flight.key("http://other.invalid", "eth_getBalance", [ADDRESS, "0x10"]))
+        self.assertIsNone(flight.key(URL, "eth_sendRawTransaction", ["0x00"]))
+
+    def test_writes_are_never_shared(self):
+        flight = SingleFlight()
+        calls = []
+        for _ in range(3):
+            flight.call(URL, "eth_sendRawTransaction", ["0x00"], lambda: calls.append(1))
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(flight.stats()["requests"], 0)
+
+    def test_latest_reads_use_micro_cache(self):
+        flight = SingleFlight(latest_ttl=60)
+        counter = iter(range(100))
+        first = flight.call(URL, "eth_blockNumber", [], lambda: next(counter))
+        self.assertEqual(flight.call(URL, "eth_blockNumber", [], lambda: next(counter)), first)
+        self.assertEqual(flight.stats()["ttl_hits"], 1)
+        # Pinned reads are not kept
+        flight.call(URL, "eth_getBalance", [ADDRESS, "0x10"], lambda: next(counter))
+        self.assertNotEqual(flight.call(URL, "eth_getBalance", [ADDRESS, "0x10"], lambda: next(counter)), first)
+
+    def test_is_latest_read(self):
+        self.assertTrue(is_latest_read("eth_blockNumber", []))
+        self.assertTrue(is_latest_read("eth_getBalance", [ADDRESS]))
+        self.assertTrue(is_latest_read("eth_getBalance", [ADDRESS, "latest"]))
+        self.assertFalse(is_latest_read("eth_getBalance", [ADDRESS, "0x10"]))
+        self.assertFalse(is_latest_read("eth_getTransactionReceipt", ["0x" + "ab" * 32]))
+
+
+class BatchDemultiplexTest(unittest.TestCase):
+    def setUp(self):
+        self.flight = SingleFlight(latest_ttl=0)
+        self.transport = GatedTransport({
+            "eth_getBalance": "0x64",
+            "eth_getTransactionCount": "0x5",
+            "eth_call": {"code": 3, "message": "execution reverted"},
+        })
+        self.client = RpcClient(URL, transport=self.transport, flight=self.flight)
+
+    def test_batch_follows_call_in_flight(self):
+        balance = ("eth_getBalance", [ADDRESS, "0x10"])
+        nonce = ("eth_getTransactionCount", [ADDRESS, "0x10"])
+        threads, results, _ = run_threads(1, lambda: self.client.call(*balance))
+        wait_until(lambda: len(self.transport.payloads) == 1)
+
+        batch_threads, batch_results, batch_errors = run_threads(
+            1, lambda: self.client.batch([balance, nonce, balance]))
+        wait_until(lambda: len(self.transport.payloads) == 2)
+        self.transport.gate.set()
+        for thread in threads + batch_threads:
+            thread.join()
+
+        # The batch only sent the call nobody else had in flight
+        self.assertEqual(self.transport.methods(), ["eth_getBalance", "eth_getTransactionCount"])
+        self.assertEqual(batch_errors, [None])
+        self.assertEqual(batch_results[0], ["0x64", "0x5", "0x64"])
+        self.assertEqual(results[0], "0x64")
+
+    def test_calls_follow_batch_leader(self):
+        balance = ("eth_getBalance", [ADDRESS, "0x10"])
+        call = ("eth_call", [{"to": OTHER, "data": "0x"}, "0x10"])
+        batch_threads, batch_results, _ = run_threads(1, lambda: self.client.batch([call, balance]))
+        wait_until(lambda: len(self.transport.payloads) == 1)
+
+        threads, results, errors = run_threads(2, lambda: self.client.call(*balance))
+        failing, _, failing_errors = run_threads(1, lambda: self.client.call(*call))
+        wait_until(lambda: self.flight.stats()["coalesced"] == 3)
+        self.transport.gate.set()
+        for thread in batch_threads + threads + failing:
+            thread.join()
+
+        self.assertEqual(len(self.transport.payloads), 1)
+        self.assertIsInstance(batch_results[0][0], RpcError)
+        self.assertEqual(batch_results[0][1], "0x64")
+        self.assertEqual(results, ["0x64", "0x64"])
+        self.assertEqual(errors, [None, None])
+        # The batch slot's error is raised for a plain call() follower
+        self.assertIsInstance(failing_errors[0], RpcError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+🪙 Token registry with on-chain metadata discovery and a persistent cache
+==========================================================================
+
+Resolves any ERC-20 address to its symbol, decimals and name. Unknown
+addresses are looked up with ``symbol()``/``decimals()``/``name()``
+sub-calls packed into a single Multicall3 ``aggregate3`` per batch, and the
+results are written to a JSON file that is never invalidated (token
+metadata does not change). Every script shares the same file, so a token is
+fetched from the chain at most once per machine.
+
+The tokens the app trades on Polygon are seeded, so the common paths never
+touch the network. Addresses that are not ERC-20 contracts still get a
+label (a shortened address) and are remembered as unverified; only
+transport failures are left uncached so they are retried next time.
+
+Configuration:
+    ONELIMIT_TOKEN_CACHE   cache file (default ~/.cache/1limit/tokens.json)
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from amounts import format_units, to_decimal
+from multicall import Multicall3, decode_uint
+from rpc_client import RpcClient, RpcError, make_client
+from transport import TransportError
+
+DEFAULT_TOKEN_CACHE = os.environ.get(
+    "ONELIMIT_TOKEN_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "1limit", "tokens.json"),
+)
+
+SYMBOL_SELECTOR = bytes.fromhex("95d89b41")    # symbol()
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")  # decimals()
+NAME_SELECTOR = bytes.fromhex("06fdde03")      # name()
+
+# Decimals assumed for display when a contract does not report any
+FALLBACK_DECIMALS = 18
+
+
+class TokenInfo(NamedTuple):
+    """🪙 ERC-20 metadata (``verified`` is False when the contract did not answer)"""
+    address: str
+    symbol: str
+    decimals: int
+    name: str
+    verified: bool = True
+
+
+# Tokens used by the app on Polygon - resolved without any RPC call
+KNOWN_TOKENS = [
+    TokenInfo("0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270", "WMATIC", 18, "Wrapped Matic"),
+    TokenInfo("0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359", "USDC", 6, "USD Coin"),
+    TokenInfo("0xc2132D05D31c914a87C6611C10748AEb04B58e8F", "USDT", 6, "(PoS) Tether USD"),
+    TokenInfo("0x8f3Cf7ad23Cd3CaDbD9735AFf958023239c6A063", "DAI", 18, "(PoS) Dai Stablecoin"),
+]
+
+
+def short_address(address: str) -> str:
+    return f"{address[:6]}…{address[-4:]}"
+
+
+def decode_string(return_data: bytes) -> Optional[str]:
+    """🔤 Decode an ABI ``string`` return, or a ``bytes32`` one (MKR-style tokens)"""
+    if len(return_data) == 32:
+        text = return_data.rstrip(b"\0")
+    elif len(return_data) >= 64:
+        offset = int.from_bytes(return_data[:32], "big")
+        length = int.from_bytes(return_data[offset:offset + 32], "big")
+        text = return_data[offset + 32:offset + 32 + length]
+    else:
+        return None
+    try:
+        decoded = text.decode("utf-8").strip("\0").strip()
+    except UnicodeDecodeError:
+        return None
+    return decoded or None
+
+
+class TokenRegistry:
+    """🪙 Address → ``TokenInfo`` with batched discovery and a permanent disk cache"""
+
+    def __init__(self, rpc: Optional[RpcClient] = None, path: Optional[str] = DEFAULT_TOKEN_CACHE):
+        self._rpc = rpc
+        self.path = path
+        self._tokens: Dict[str, TokenInfo] = {token.address.lower(): token for token in KNOWN_TOKENS}
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def rpc(self) -> RpcClient:
+        if self._rpc is None:
+            self._rpc = make_client()
+        return self._rpc
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return  # a corrupt cache only costs a re-fetch
+        for entry in entries:
+            token = TokenInfo(**entry)
+            self._tokens.setdefault(token.address.lower(), token)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump([token._asdict() for token in self._tokens.values()], f, indent=1)
+        os.replace(tmp_path, self.path)  # atomic, so concurrent scripts never read half a file
+
+    def _fetch(self, addresses: List[str]) -> Dict[str, TokenInfo]:
+        multicall = Multicall3(self.rpc)
+        calls = []
+        for address in addresses:
+            calls += [(address, SYMBOL_SELECTOR), (address, DECIMALS_SELECTOR), (address, NAME_SELECTOR)]
+        results = multicall.aggregate3(calls)
+
+        found = {}
+        for i, address in enumerate(addresses):
+            (symbol_ok, symbol), (decimals_ok, decimals), (name_ok, name) = results[3 * i:3 * i + 3]
+            symbol = decode_string(symbol) if symbol_ok else None
+            decimals = decode_uint(decimals) if decimals_ok else None
+            name = decode_string(name) if name_ok else None
+            verified = symbol is not None and decimals is not None and decimals <= 77
+            found[address.lower()] = TokenInfo(
+                address=address,
+                symbol=symbol or short_address(address),
+                decimals=decimals if verified else FALLBACK_DECIMALS,
+                name=name or symbol or "Unknown token",
+                verified=verified,
+            )
+        return found
+
+    def resolve(self, addresses: Iterable[str]) -> Dict[str, TokenInfo]:
+        """🔍 Metadata for every address, fetching all unknown ones in one batch
+
+        Keys are lowercased addresses. Never raises: if the chain cannot be
+        reached, unknown tokens come back as unverified placeholders that
+        are not written to the cache.
+        """
+        addresses = list(dict.fromkeys(addresses))
+        with self._lock:
+            missing = [address for address in addresses if address.lower() not in self._tokens]
+            if missing:
+                try:
+                    self._tokens.update(self._fetch(missing))
+                    self._save()
+                except (RpcError, TransportError, OSError, ValueError) as e:
+                    print(f"⚠️ Token metadata lookup failed: {e}")
+            return {
+                address.lower(): self._tokens.get(address.lower()) or TokenInfo(
+                    address, short_address(address), FALLBACK_DECIMALS, "Unknown token", verified=False)
+                for address in addresses
+            }
+
+    def get(self, address: str) -> TokenInfo:
+        """🪙 Metadata for one address"""
+        return self.resolve([address])[address.lower()]
+
+    def cached(self, address: str) -> Optional[TokenInfo]:
+        """💾 Metadata for one address if already known, without touching the chain"""
+        return self._tokens.get(address.lower())
+
+    def by_symbol(self, symbol: str) -> Optional[TokenInfo]:
+        """🔎 Cached token with this symbol (seeded tokens win)"""
+        for token in self._tokens.values():
+            if token.symbol.upper() == symbol.upper():
+                return token
+        return None
+
+    def label(self, address: str) -> str:
+        """🏷️ ``SYMBOL (0x…)`` display label"""
+        return f"{self.get(address).symbol} ({address})"
+
+    def amount(self, address: str, raw: int):
+        """🎯 Exact ``Decimal`` amount of ``raw`` base units of this token"""
+        return to_decimal(raw, self.get(address).decimals)
+
+    def format_amount(self, address: str, raw: Optional[int], places: int = 6) -> str:
+        """🖨️ ``1.500000 USDC`` style string"""
+        token = self.get(address)
+        return f"{format_units(raw, token.decimals, places)} {token.symbol}"
+
+
+_default_registry: Optional[TokenRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_registry() -> TokenRegistry:
+    """🌍 Process-wide registry backed by ``DEFAULT_TOKEN_CACHE``"""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = TokenRegistry()
+        return _default_registry
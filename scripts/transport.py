@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+🔌 Shared pooled HTTP transport for all wallet tools
+=====================================================
+
+Every JSON-RPC request in the scripts goes through one process-wide
+keep-alive connection pool instead of opening a new TCP+TLS connection per
+``requests.post``. When ``httpx`` with HTTP/2 support is installed the pool
+speaks HTTP/2 (many requests multiplexed on one connection); otherwise it
+falls back to a pooled ``requests.Session``. Response bodies are parsed
+with ``msgspec`` when it is installed.
+
+The same pooled ``requests.Session`` backs the Web3 provider returned by
+``make_web3``, so code paths that still need web3 share connections with
+the raw JSON-RPC calls.
+
+Configuration (environment variables):
+    ONELIMIT_HTTP_POOL_SIZE        connections kept alive per host (default 32)
+    ONELIMIT_HTTP_CONNECT_TIMEOUT  seconds (default 5)
+    ONELIMIT_HTTP_READ_TIMEOUT     seconds (default 30)
+    ONELIMIT_HTTP2                 1 = require HTTP/2, 0 = disable, unset = auto
+    ONELIMIT_CASSETTE              record/replay JSON-RPC traffic (see cassette.py)
+
+Requirements:
+    pip install requests
+    pip install "httpx[http2]"   # optional, enables HTTP/2
+    pip install msgspec          # optional, faster response parsing
+"""
+
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Type
+
+# requests is imported on first use: it costs more than everything else a tool imports
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_POOL_SIZE = int(os.environ.get("ONELIMIT_HTTP_POOL_SIZE", "32"))
+DEFAULT_CONNECT_TIMEOUT = float(os.environ.get("ONELIMIT_HTTP_CONNECT_TIMEOUT", "5"))
+DEFAULT_READ_TIMEOUT = float(os.environ.get("ONELIMIT_HTTP_READ_TIMEOUT", "30"))
+
+DEFAULT_HEADERS = {
+    'Content-Type': 'application/json',
+    'User-Agent': '1Limit-Wallet-Tools/1.0',
+}
+
+
+class TransportError(OSError):
+    """🌐 Network failure or non-2xx HTTP response
+
+    ``status`` is None for connection-level failures; of those, ``timed_out``
+    marks the ones where the server accepted the request but did not answer
+    within the read timeout (as opposed to refused connections, DNS
+    failures or connect timeouts). ``retry_after`` is the parsed
+    Retry-After header in seconds, when the server sent one. Like the
+    ``requests`` exceptions it replaces it is an ``OSError``, so existing
+    ``except OSError`` handlers still see network failures.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None,
+                 retry_after: Optional[float] = None, url: Optional[str] = None, timed_out: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.url = url
+        self.timed_out = timed_out
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None  # HTTP-date form is rare on RPC providers
+
+
+@lru_cache(maxsize=None)
+def _json_decoder() -> Tuple[Callable[[bytes], Any], Tuple[Type[Exception], ...]]:
+    """``(decode, errors it raises for a malformed body)``"""
+    # msgspec keeps integers beyond 64 bits exact; orjson would silently turn them into floats
+    try:
+        import msgspec
+    except ImportError:
+        return json.loads, (ValueError,)
+    return msgspec.json.decode, (msgspec.DecodeError, ValueError)
+
+
+def loads(body: bytes) -> Any:
+    """📖 Parse a JSON response body (msgspec when installed); ValueError if malformed"""
+    decode, errors = _json_decoder()
+    try:
+        return decode(body)
+    except errors as e:
+        raise ValueError(str(e)) from e
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        import httpx  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def make_session(pool_size: int = DEFAULT_POOL_SIZE) -> "requests.Session":
+    """🔁 ``requests.Session`` with a keep-alive pool sized for concurrent sweeps"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # No adapter-level retries - throttling and failover are handled above the transport
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+class HttpTransport:
+    """🔌 POST JSON payloads over a pooled keep-alive (optionally HTTP/2) client"""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 http2: Optional[bool] = None):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        if http2 is None:
+            env = os.environ.get("ONELIMIT_HTTP2")
+            http2 = _http2_available() if env is None else env == "1"
+        self.http2 = http2
+
+        # The requests session always exists: it backs the Web3 provider too
+        self.session = make_session(pool_size)
+        self._client = None
+        if http2:
+            import httpx
+            self._client = httpx.Client(
+                http2=True,
+                headers=DEFAULT_HEADERS,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            )
+
+    def post(self, url: str, payload: Any, decode: Optional[Callable[[bytes], Any]] = None) -> Any:
+        """📮 POST ``payload`` as JSON and return the decoded JSON body
+
+        ``decode`` replaces ``loads`` for the response body (``RpcClient``
+        passes ``rpc_types.decode_response`` for typed results); it must
+        raise ValueError on a malformed body.
+        """
+        if self._client is not None:
+            return self._post_httpx(url, payload, decode)
+        return self._post_requests(url, payload, decode)
+
+    def _post_requests(self, url: str, payload: Any, decode: Optional[Callable[[bytes], Any]]) -> Any:
+        import requests
+
+        try:
+            response = self.session.post(url, json=payload,
+                                         timeout=(self.connect_timeout, self.read_timeout))
+        except requests.exceptions.RequestException as e:
+            raise TransportError(f"Network error: {e}", url=url,
+                                 timed_out=isinstance(e, requests.exceptions.ReadTimeout)) from e
+        return self._decode(url, response.status_code, response.headers, response.content, decode)
+
+    def _post_httpx(self, url: str, payload: Any, decode: Optional[Callable[[bytes], Any]]) -> Any:
+        import httpx
+        try:
+            response = self._client.post(url, content=json.dumps(payload).encode())
+        except httpx.HTTPError as e:
+            raise TransportError(f"Network error: {e}", url=url, timed_out=isinstance(e, httpx.ReadTimeout)) from e
+        return self._decode(url, response.status_code, response.headers, response.content, decode)
+
+    @staticmethod
+    def _decode(url: str, status: int, headers: Any, body: bytes,
+                decode: Optional[Callable[[bytes], Any]] = None) -> Any:
+        if status >= 400:
+            raise TransportError(
+                f"HTTP {status} from {url}",
+                status=status,
+                retry_after=_parse_retry_after(headers.get("Retry-After")),
+                url=url,
+            )
+        try:
+            return (decode or loads)(body)
+        except ValueError as e:
+            raise TransportError(f"Failed to parse RPC response: {e}", status=status, url=url) from e
+
+    def close(self) -> None:
+        self.session.close()
+        if self._client is not None:
+            self._client.close()
+
+
+_default_transport: Optional[HttpTransport] = None
+_default_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """🌍 Process-wide shared transport (created on first use)
+
+    With ``ONELIMIT_CASSETTE`` set this is a record/replay transport
+    instead (see cassette.py).
+    """
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            from cassette import from_env
+
+            _default_transport = from_env() or HttpTransport()
+        return _default_transport
+
+
+def make_web3(rpc_url: str, transport: Optional[HttpTransport] = None):
+    """🦊 Web3 instance whose HTTPProvider reuses the shared connection pool
+
+    web3 is imported here, not at module level, so tools that only speak raw
+    JSON-RPC never pay its import cost.
+    """
+    from web3 import Web3
+
+    transport = transport or get_transport()
+    request_kwargs: Dict[str, Any] = {"timeout": (transport.connect_timeout, transport.read_timeout)}
+    return Web3(Web3.HTTPProvider(rpc_url, request_kwargs=request_kwargs, session=transport.session))